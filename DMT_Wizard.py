@@ -1,4 +1,18 @@
-from dmt_wizard.app import run
+import sys
+
+# headless subcommands dispatch before the wizard (rich, InquirerPy, pandas) is imported
+HEADLESS = {
+    "batch": "dmt_wizard.batch",
+    "watch": "dmt_wizard.watch",
+    "serve": "dmt_wizard.serve",
+    "extract": "dmt_wizard.bundle",
+}
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] in HEADLESS:
+        from importlib import import_module
+
+        raise SystemExit(import_module(HEADLESS[sys.argv[1]]).main(sys.argv[2:]))
+    from dmt_wizard.app import run
+
+    run()
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+from .synth import generate_source, write_source
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(HERE, ".data")
+BASELINE_PATH = os.path.join(HERE, "baseline.json")
+
+PROFILES = {
+    "smoke": [("variant", 10_000, "csv"), ("attribute", 10_000, "csv"), ("variant", 10_000, "xlsx")],
+    "default": [
+        ("variant", 100_000, "csv"), ("attribute", 100_000, "csv"), ("variant", 100_000, "xlsx"),
+        ("variant", 1_000_000, "csv"), ("attribute", 1_000_000, "csv"),
+    ],
+    "large": [("variant", 10_000_000, "csv"), ("attribute", 10_000_000, "csv")],
+}
+CATEGORIES = [f"Products-Hoses-Line {i}" for i in range(20)]
+
+# relative slow-down that counts as a regression, and phases too short to compare reliably
+TIME_THRESHOLD = 0.20
+MEMORY_THRESHOLD = 0.20
+MIN_SECONDS = 0.05
+
+
+def case_id(kind: str, rows: int, fmt: str, engine: str = "pandas") -> str:
+    return f"{kind}-{rows}-{fmt}" + ("" if engine == "pandas" else f"-{engine}")
+
+
+def source_path(kind: str, rows: int, fmt: str, cardinality: Dict[str, int], seed: int) -> str:
+    card = "-".join(f"{k}{v}" for k, v in sorted(cardinality.items()))
+    name = f"{kind}_{rows}_s{seed}" + (f"_{card}" if card else "")
+    return os.path.join(DATA_DIR, f"{name}.{fmt}")
+
+
+def peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        return round(getattr(info, "peak_wset", info.rss) / 2**20, 1)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+
+def run_case(kind: str, rows: int, fmt: str, cardinality: Dict[str, int], seed: int, trace_memory: bool, engine: str = "pandas") -> dict:
+    """Time every phase of one build in this (fresh) process and report its peak memory."""
+    from dmt_wizard.builders import (
+        build_attribute_ud_tables,
+        build_category_tables,
+        build_part_table,
+        build_ud_tables_arrow,
+        build_variant_ud_tables,
+        child_part_nums,
+        part_source_arrow,
+    )
+    from dmt_wizard.io_utils import read_csv_arrow, read_excel_normalized, write_csv
+    from dmt_wizard.playlist import build_playlist_df
+    from dmt_wizard.source_cache import SourceCache
+
+    if trace_memory:
+        import tracemalloc
+
+        tracemalloc.start()
+
+    timings: Dict[str, float] = {}
+    memory: Dict[str, float] = {}
+
+    def phase(name: str, fn, *args):
+        if trace_memory:
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+        result = fn(*args)
+        timings[name] = round(time.perf_counter() - started, 4)
+        if trace_memory:
+            memory[name] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+        return result
+
+    path = source_path(kind, rows, fmt, cardinality, seed)
+    if engine == "arrow":
+        source = phase("read", read_csv_arrow if fmt == "csv" else SourceCache(sidecar=False).get_table, path)
+        tables = phase("build.ud", build_ud_tables_arrow, source, kind, {"Size": 1, "Color": 2} if kind == "variant" else None)
+        # Part and categories only need the first row of every part
+        df = phase("build.part_source", part_source_arrow, source, kind)
+    else:
+        df = phase("read", read_excel_normalized, path)
+        if kind == "variant":
+            tables = phase("build.ud", build_variant_ud_tables, df, {"Size": 1, "Color": 2})
+        else:
+            tables = phase("build.ud", build_attribute_ud_tables, df, None)
+
+    if kind == "variant":
+        tables["Part"] = phase("build.part", build_part_table, df, "PARENT-1", "SA", True, "Bench part", "BEN")
+        parts = child_part_nums(df)
+        cats = phase("build.categories", build_category_tables, "SAINC", "SA", CATEGORIES, parts)
+        tables["Categories_UD08"] = cats["UD08"]
+        tables["Categories_UD11"] = cats["UD11"]
+
+    out_dir = tempfile.mkdtemp(prefix="dmt_bench_")
+    try:
+        paths = {name: os.path.join(out_dir, f"bench_{name}.csv") for name in tables}
+
+        def write_all() -> None:
+            for name, table in tables.items():
+                write_csv(table, paths[name])
+
+        phase("write", write_all)
+        entries = [(p, "add") for p in paths.values()]
+        playlist = phase("playlist", build_playlist_df, entries, {"UD08", "UD09", "UD10", "UD11"})
+        phase("playlist.write", write_csv, playlist, os.path.join(out_dir, "bench_PLAYLIST.csv"))
+        out_bytes = sum(os.path.getsize(p) for p in paths.values())
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+    timings["total"] = round(sum(timings.values()), 4)
+    result = {
+        "case": case_id(kind, rows, fmt, engine),
+        "rows": rows,
+        "output_rows": {name: len(t) for name, t in tables.items()},
+        "output_bytes": out_bytes,
+        "seconds": timings,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    if trace_memory:
+        result["traced_peak_mb"] = memory
+    return result
+
+
+def ensure_sources(cases: List[Tuple[str, int, str]], cardinality: Dict[str, int], seed: int) -> None:
+    for kind, rows, fmt in cases:
+        path = source_path(kind, rows, fmt, cardinality, seed)
+        if not os.path.exists(path):
+            print(f"Generating {os.path.relpath(path)} ...", flush=True)
+            write_source(generate_source(kind, rows, cardinality, seed), path)
+
+
+def run_suite(
+    cases: List[Tuple[str, int, str]],
+    cardinality: Dict[str, int] | None = None,
+    seed: int = 0,
+    repeat: int = 1,
+    trace_memory: bool = False,
+    engine: str = "pandas",
+) -> Dict[str, dict]:
+    cardinality = cardinality or {}
+    ensure_sources(cases, cardinality, seed)
+    results: Dict[str, dict] = {}
+    for kind, rows, fmt in cases:
+        runs = []
+        for _ in range(repeat):
+            # a fresh process per run so peak memory and import state belong to this case alone
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                runs.append(pool.submit(run_case, kind, rows, fmt, cardinality, seed, trace_memory, engine).result())
+        best = runs[0]
+        best["seconds"] = {name: min(r["seconds"][name] for r in runs) for name in best["seconds"]}
+        results[best["case"]] = best
+    return results
+
+
+def compare(
+    results: Dict[str, dict],
+    baseline: Dict[str, dict],
+    time_threshold: float = TIME_THRESHOLD,
+    memory_threshold: float = MEMORY_THRESHOLD,
+) -> List[str]:
+    """Human-readable regressions of ``results`` against ``baseline`` (empty when none)."""
+    problems: List[str] = []
+    for case, res in results.items():
+        base = baseline.get(case)
+        if not base:
+            continue
+        for name, secs in res["seconds"].items():
+            old = base.get("seconds", {}).get(name)
+            if old is None or max(old, secs) < MIN_SECONDS:
+                continue
+            if secs > old * (1 + time_threshold):
+                problems.append(f"{case} {name}: {secs:.3f}s vs {old:.3f}s (+{secs / old - 1:.0%})")
+        new_mem, old_mem = res.get("peak_rss_mb"), base.get("peak_rss_mb")
+        if new_mem and old_mem and new_mem > old_mem * (1 + memory_threshold):
+            problems.append(f"{case} peak memory: {new_mem:.0f} MB vs {old_mem:.0f} MB (+{new_mem / old_mem - 1:.0%})")
+    return problems
+
+
+def print_results(results: Dict[str, dict], baseline: Dict[str, dict]) -> None:
+    from rich.console import Console
+    from rich.table import Table
+
+    phases: List[str] = []
+    for res in results.values():
+        phases.extend(p for p in res["seconds"] if p not in phases)
+
+    table = Table(title="DMT benchmarks (seconds)")
+    table.add_column("Case", style="cyan", no_wrap=True)
+    for name in phases:
+        table.add_column(name, justify="right")
+    table.add_column("Peak MB", justify="right")
+    for case, res in results.items():
+        base = baseline.get(case, {})
+        cells = []
+        for name in phases:
+            secs = res["seconds"].get(name)
+            old = base.get("seconds", {}).get(name)
+            cell = "" if secs is None else f"{secs:.3f}"
+            if secs is not None and old:
+                cell += f" ({secs / old - 1:+.0%})"
+            cells.append(cell)
+        table.add_row(case, *cells, "" if res["peak_rss_mb"] is None else f"{res['peak_rss_mb']:.0f}")
+    Console().print(table)
+
+
+def parse_cardinality(text: str | None) -> Dict[str, int]:
+    if not text:
+        return {}
+    card = {}
+    for item in text.split(","):
+        key, _, value = item.partition("=")
+        if not value.strip().isdigit():
+            raise ValueError(f"Bad cardinality '{item}'. Expected name=count, e.g. families=500.")
+        card[key.strip()] = int(value)
+    return card
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the DMT builders on synthetic sources.")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="smoke")
+    parser.add_argument("--case", action="append", default=[], help="extra case as kind:rows:format, e.g. variant:250000:csv")
+    parser.add_argument("--cardinality", default=None, help="distinct values per key level, e.g. families=500,parts=20000")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="runs per case; the fastest time per phase is kept")
+    parser.add_argument("--engine", choices=["pandas", "arrow"], default="pandas", help="build engine; arrow cases are stored as <case>-arrow")
+    parser.add_argument("--trace-memory", action="store_true", help="also record the traced Python peak per phase (slower)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="per-machine baseline file (not shipped; create it with --save-baseline)")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--time-threshold", type=float, default=TIME_THRESHOLD)
+    parser.add_argument("--memory-threshold", type=float, default=MEMORY_THRESHOLD)
+    parser.add_argument("--output", default=None, help="write the results as JSON")
+    args = parser.parse_args(argv)
+
+    cases = list(PROFILES[args.profile])
+    for spec in args.case:
+        kind, rows, fmt = spec.split(":")
+        cases.append((kind, int(rows), fmt))
+
+    results = run_suite(cases, parse_cardinality(args.cardinality), args.seed, args.repeat, args.trace_memory, args.engine)
+
+    baseline: Dict[str, dict] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as fh:
+            baseline = json.load(fh).get("cases", {})
+    print_results(results, baseline)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cases": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    if args.save_baseline:
+        # merge so a smoke run does not drop the numbers of larger profiles
+        merged = dict(baseline)
+        merged.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as fh:
+            json.dump(dict(report, cases=merged), fh, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print(f"No baseline at {args.baseline}; run the reference commit with --save-baseline on this machine to store one.")
+        return 0
+    problems = compare(results, baseline, args.time_threshold, args.memory_threshold)
+    for line in problems:
+        print(f"REGRESSION {line}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
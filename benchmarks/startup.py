@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import List
+
+# time to import the wizard up to the mode prompt, in a fresh interpreter
+STARTUP_BUDGET_S = 0.5
+BUDGET_ENV = "DMT_STARTUP_BUDGET"
+# none of these may load before a mode needs them
+DEFERRED_MODULES = ["pandas", "numpy", "pyarrow", "openpyxl", "dmt_wizard.builders", "dmt_wizard.source_cache"]
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import dmt_wizard.app
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (DEFERRED_MODULES,)
+
+
+def measure(runs: int = 5) -> dict:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    samples: List[float] = []
+    loaded: List[str] = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", PROBE], cwd=root, capture_output=True, text=True, check=True)
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        samples.append(result["seconds"])
+        loaded = sorted(set(loaded) | set(result["loaded"]))
+    return {"median_s": round(statistics.median(samples), 4), "max_s": round(max(samples), 4), "loaded": loaded}
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Check the wizard's import time against a budget.")
+    parser.add_argument("--budget", type=float, default=float(os.environ.get(BUDGET_ENV, STARTUP_BUDGET_S)), help="seconds (median of the runs)")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    result = measure(args.runs)
+    print(f"Startup import: median {result['median_s']:.3f}s, max {result['max_s']:.3f}s (budget {args.budget:.3f}s)")
+    failed = False
+    if result["loaded"]:
+        print(f"FAIL heavy modules loaded at startup: {', '.join(result['loaded'])}")
+        failed = True
+    if result["median_s"] > args.budget:
+        print("FAIL startup is over budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import os
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+
+XLSX_MAX_ROWS = 1_048_575  # one row is taken by the header
+
+# distinct values per key level; anything not given scales with the row count
+VARIANT_CARDINALITY = {"families": None, "options": 6, "parts": None, "values": 400}
+ATTRIBUTE_CARDINALITY = {"attributes": 50, "values": 2_000, "parts": None}
+
+OPTION_NAMES = ["Size", "Color", "Length", "Thread", "Pressure", "Material", "Finish", "Connection"]
+SIZE_VALUES = ['1/8"', '1/4"', '3/8"', '1/2"', '3/4"', '1"', "10mm", "12mm", "16mm", "20mm"]
+
+
+def default_cardinality(kind: str, rows: int) -> Dict[str, int]:
+    if kind == "variant":
+        card = dict(VARIANT_CARDINALITY)
+        card["families"] = max(1, rows // 200)
+        card["parts"] = max(1, rows // 3)
+    elif kind == "attribute":
+        card = dict(ATTRIBUTE_CARDINALITY)
+        card["parts"] = max(1, rows // 5)
+    else:
+        raise ValueError(f"Unknown source kind '{kind}'. Expected 'variant' or 'attribute'.")
+    return card
+
+
+def _labels(prefix: str, n: int) -> np.ndarray:
+    return np.array([f"{prefix}{i:06d}" for i in range(n)], dtype=object)
+
+
+def generate_source(kind: str, rows: int, cardinality: Dict[str, int] | None = None, seed: int = 0) -> pd.DataFrame:
+    """Synthetic UD11-shaped source (Company, Key1..Key5) with realistic key nesting.
+
+    Variant: Key2 = parent family, Key3 = option name, Key4 = child part (each
+    part belongs to one family), Key5 = option value. Attribute: Key2 =
+    attribute name, Key3 = attribute value, Key4 = part, Key5 blank.
+    """
+    card = default_cardinality(kind, rows)
+    card.update(cardinality or {})
+    rng = np.random.default_rng(seed)
+
+    if kind == "variant":
+        part = rng.integers(0, card["parts"], rows)
+        family = part % card["families"]
+        option = rng.integers(0, card["options"], rows)
+        value = rng.integers(0, card["values"], rows)
+        families = _labels("FAM-", card["families"])
+        options = np.array([OPTION_NAMES[i % len(OPTION_NAMES)] + ("" if i < len(OPTION_NAMES) else f" {i}") for i in range(card["options"])], dtype=object)
+        # mix in the fractional/metric sizes the UD09 natural sort has to handle
+        values = np.array([SIZE_VALUES[i] if i < len(SIZE_VALUES) else f"V{i:05d}" for i in range(card["values"])], dtype=object)
+        parts = np.array([f"{f}-{p:07d}" for f, p in zip(families[np.arange(card["parts"]) % card["families"]], range(card["parts"]))], dtype=object)
+        data = {
+            "Company": "SAINC",
+            "Key1": "Variant",
+            "Key2": families[family],
+            "Key3": options[option],
+            "Key4": parts[part],
+            "Key5": values[value],
+        }
+    elif kind == "attribute":
+        attr = rng.integers(0, card["attributes"], rows)
+        value = rng.integers(0, card["values"], rows)
+        part = rng.integers(0, card["parts"], rows)
+        data = {
+            "Company": "SAINC",
+            "Key1": "Attribute",
+            "Key2": _labels("ATTR-", card["attributes"])[attr],
+            "Key3": _labels("VAL-", card["values"])[value],
+            "Key4": _labels("PART-", card["parts"])[part],
+            "Key5": "",
+        }
+    else:
+        raise ValueError(f"Unknown source kind '{kind}'. Expected 'variant' or 'attribute'.")
+    return pd.DataFrame(data, columns=["Company", "Key1", "Key2", "Key3", "Key4", "Key5"])
+
+
+def write_source(df: pd.DataFrame, path: str) -> str:
+    from dmt_wizard.io_utils import write_csv
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        write_csv(df, path)
+    elif ext == ".xlsx":
+        if len(df) > XLSX_MAX_ROWS:
+            raise ValueError(f"XLSX sources are limited to {XLSX_MAX_ROWS:,} rows.")
+        df.to_excel(path, index=False, engine="openpyxl")
+    else:
+        raise ValueError(f"Unsupported source format '{ext}'. Expected .csv or .xlsx.")
+    return path
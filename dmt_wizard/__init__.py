@@ -1,5 +1,14 @@
-from .app import run
+# exported lazily: the wizard (rich, InquirerPy) loads only for ``run``, the prompt-free API only for ``build``
+_EXPORTS = {"run": ".app", "build": ".api", "BuildResult": ".api"}
 
-__all__ = ["run"]
+__all__ = ["run", "build", "BuildResult"]
 
 
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import os
+from typing import IO, TYPE_CHECKING, Dict, List, Set, Tuple, Union
+
+from .io_utils import (
+    detect_type_from_df,
+    encode_csv,
+    get_stem_and_dir,
+    normalize_frame,
+    read_buffer_normalized,
+    sheet_stem,
+    split_shards,
+    table_of,
+    write_csv,
+)
+from .playlist import build_playlist_df, build_playlist_name
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    Source = Union[pd.DataFrame, bytes, bytearray, memoryview, IO[bytes], str, os.PathLike]
+
+
+# written keys whose file name differs from the key
+FILE_NAMES = {"UD08_Categories": "Categories_UD08", "UD11_Categories": "Categories_UD11"}
+API_OPERATIONS = ("add", "delete")
+
+
+def load_source(source: Source, sheet: str | None = None) -> pd.DataFrame:
+    """A source as the normalized UD11 frame: a DataFrame, CSV/.xlsx contents (bytes or a binary file object) or a path."""
+    import pandas as pd
+
+    if isinstance(source, pd.DataFrame):
+        return normalize_frame(source)
+    if isinstance(source, (str, os.PathLike)):
+        from .source_cache import read_source
+
+        # the session cache's frame is shared; results must not alias it
+        return read_source(os.fspath(source), sheet).copy()
+    data = source.read() if hasattr(source, "read") else bytes(source)
+    return read_buffer_normalized(data, sheet)
+
+
+class BuildResult:
+    """The tables of one in-memory build and its playlist, with disk as an optional sink.
+
+    ``tables`` holds whole (unsharded) frames in output order, keyed like the
+    files ``process_single`` writes: ``UD11``, ``Variant_UD09``, ``Part``,
+    ``UD08_Categories``. Paths in ``outputs``, ``playlist`` and ``csv_files``
+    are relative to the folder the playlist sits in, unless ``base_dir`` is given.
+    """
+
+    def __init__(
+        self,
+        stem: str,
+        operation: str,
+        import_type: str,
+        include_tables: Set[str],
+        tables: Dict[str, pd.DataFrame],
+        playlist_name: str,
+        shard_rows: int | None = None,
+        validation: pd.DataFrame | None = None,
+    ) -> None:
+        self.stem = stem
+        self.operation = operation
+        self.import_type = import_type
+        self.include_tables = include_tables
+        self.tables = tables
+        self.playlist_name = playlist_name
+        self.shard_rows = shard_rows
+        self.validation = validation
+
+    @property
+    def output_folder(self) -> str:
+        return f"{self.stem}_OUTPUT"
+
+    @property
+    def playlist_file(self) -> str:
+        return f"{self.playlist_name}_PLAYLIST.csv"
+
+    def outputs(self, base_dir: str = "") -> Dict[str, Tuple[str, pd.DataFrame]]:
+        """``{key: (path, frame)}`` for every file of the build, shards split out as ``UD11_0001``, ..."""
+        out_dir = os.path.join(base_dir, self.output_folder)
+        files: Dict[str, Tuple[str, pd.DataFrame]] = {}
+        for key, df in self.tables.items():
+            path = os.path.join(out_dir, f"{self.stem}_{FILE_NAMES.get(key, key)}.csv")
+            shards = split_shards(df, path, self.shard_rows)
+            for i, (shard_file, df_shard) in enumerate(shards):
+                files[key if len(shards) == 1 else f"{key}_{i + 1:04d}"] = (shard_file, df_shard)
+        return files
+
+    def playlist(self, base_dir: str = "") -> pd.DataFrame:
+        entries = [(path, self.operation) for path, _df in self.outputs(base_dir).values()]
+        return build_playlist_df(entries, self.include_tables)
+
+    def csv(self, key: str) -> bytes:
+        """One table as the bytes its CSV file would hold."""
+        return encode_csv(self.tables[key])
+
+    def csv_files(self, base_dir: str = "") -> Dict[str, bytes]:
+        """``{path: CSV bytes}`` for every output file and the playlist, byte-identical to a run on disk."""
+        files = {path: encode_csv(df) for path, df in self.outputs(base_dir).values()}
+        files[os.path.join(base_dir, self.playlist_file)] = encode_csv(self.playlist(base_dir))
+        return files
+
+    def write(self, base_dir: str) -> Tuple[str, str]:
+        """Write the same folder and playlist as ``run_operation(output_base=base_dir)``; returns (output folder, playlist path)."""
+        out_dir = os.path.join(base_dir, self.output_folder)
+        os.makedirs(out_dir, exist_ok=True)
+        for path, df in self.outputs(base_dir).values():
+            write_csv(df, path)
+        playlist_path = os.path.join(base_dir, self.playlist_file)
+        write_csv(self.playlist(base_dir), playlist_path)
+        return out_dir, playlist_path
+
+
+def build(source: Source, options: Dict | None = None, name: str = "source", sheet: str | None = None) -> BuildResult:
+    """Build one source in memory, without prompts and without touching disk.
+
+    ``options`` takes the fields of a batch manifest job: ``operation``
+    (``add`` or ``delete``), ``type``, ``tables``, ``ud09_sort``,
+    ``sort_store``, ``validation``, ``part``, ``categories`` and
+    ``shard_rows``. ``name`` is the source file name the outputs are named
+    after. In ``stop`` validation mode a source with errors raises
+    :class:`ValidationError` carrying the issues; otherwise they are on
+    ``result.validation``.
+    """
+    from .batch import DEFAULT_TABLES, normalize_job
+    from .builders import build_category_tables, build_part_table, build_ud_tables, category_part_nums
+    from .validation import ValidationError, summarize_issues, validate_frame
+
+    options = options or {}
+    operation = options.get("operation", "add")
+    if operation not in API_OPERATIONS:
+        raise ValueError(f"In-memory builds take one source: operation must be 'add' or 'delete', not '{operation}'.")
+    job = normalize_job({**options, "files": [name]}, 0, "")
+    if job["stream"] or job["sheets"]:
+        raise ValueError("In-memory builds do not stream or split sheets; pass one sheet with sheet=.")
+
+    df11 = load_source(source, sheet)
+    import_type = detect_type_from_df(df11) if job["type"] == "auto" else job["type"]
+    include_tables = set(job["tables"] or DEFAULT_TABLES[import_type])
+
+    issues = None
+    if job["validation"] != "off":
+        issues = validate_frame(df11, import_type)
+        if job["validation"] == "stop" and (issues["Severity"] == "error").any():
+            counts = ", ".join(f"{count} {rule}" for rule, severity, count in summarize_issues(issues) if severity == "error")
+            raise ValidationError(f"Validation failed ({name}: {counts}).", issues=issues)
+
+    ud09_sort = None
+    if operation != "delete":
+        ud09_sort = job["ud09_sort"]
+        if job["sort_store"]:
+            from .sort_store import stored_sort_map
+
+            ud09_sort = stored_sort_map(df11, import_type, job["ud09_sort"], job["sort_store"])
+
+    dfs, part_src = build_ud_tables(df11, import_type, ud09_sort)
+    tables = {key: df for key, df in dfs.items() if table_of(key) == "UD11" or table_of(key) in include_tables}
+
+    if job["part_enabled"] and import_type in ("variant", "mixed"):
+        tables["Part"] = build_part_table(part_src, job["variant_parent"], job["website"], job["is_new"], job["part_desc"], job["prod_code"])
+
+    cat_opts = job["cat_opts"] or {}
+    cat_site = cat_opts.get("website", "").strip()
+    cat_list: List[str] = cat_opts.get("categories", [])
+    if import_type in ("variant", "mixed") and cat_site and cat_list:
+        company = df11["Company"].iloc[0] if not df11.empty else "SAINC"
+        parts = category_part_nums(part_src, job["variant_parent"] or cat_opts.get("parent_part", ""))
+        cat_tables = build_category_tables(company, cat_site, cat_list, parts)
+        if cat_opts.get("is_new"):
+            tables["UD08_Categories"] = cat_tables["UD08"]
+        tables["UD11_Categories"] = cat_tables["UD11"]
+
+    stem = sheet_stem(get_stem_and_dir(name)[0], sheet)
+    return BuildResult(
+        stem, operation, import_type, include_tables, tables,
+        build_playlist_name(operation, [name]), shard_rows=job["shard_rows"], validation=issues,
+    )
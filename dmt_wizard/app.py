@@ -2,39 +2,54 @@ from __future__ import annotations
 
 import os
 import sys
-from typing import List, Tuple, Dict, Set
+from contextlib import nullcontext
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, List, Tuple, Dict, Set
 import time
 
-import pandas as pd
-
 from .io_utils import (
     pick_excel_file,
     pick_output_folder,
-    read_excel_normalized,
     ensure_output_dir,
     write_csv,
+    get_writer_pool,
+    split_shards,
+    ShardedAppender,
+    DEFAULT_SHARD_ROWS,
+    iter_source_chunks,
+    detect_type_from_df,
+    encode_csv,
+    list_sheets,
+    STREAM_CHUNK_ROWS,
+    UD11_COLUMNS,
     get_stem_and_dir,
+    resolve_engine,
     sanitize_filename,
+    sheet_stem,
+    table_of,
 )
-from .builders import (
-    build_variant_ud_tables,
-    build_attribute_ud_tables,
-    build_part_table,
-    build_category_ud08,
-    build_category_ud11_for_parent,
-    build_single_pdp_part,
-)
-from .playlist import build_playlist_df, build_playlist_name
+from .metrics import RunReport
+from .playlist import build_playlist_columns, build_playlist_df, build_playlist_name
+from .bundle import ZipBundle, bundle_enabled
+from .bundle import bundle_dest as resolve_bundle_dest
+from .records import category_rows, encode_rows_csv, pdp_part_rows, write_rows_csv
+
+# pandas, numpy and the builders are imported inside the Standard Mode functions that use them,
+# so the mode prompt and New PDP Mode start without them
+if TYPE_CHECKING:
+    import pandas as pd
+    from rich.progress import Progress
 
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
-from rich.progress import Progress
 from InquirerPy import inquirer
 
 
 console = Console()
 
+STREAM_THRESHOLD_BYTES = 200 * 1024 * 1024
+
 
 def prompt_mode() -> str:
     choice = inquirer.select(
@@ -48,14 +63,43 @@ def prompt_mode() -> str:
     return choice
 
 
-def detect_type_from_df(df11: pd.DataFrame) -> str:
-    key1_series = df11["Key1"].dropna().astype(str)
-    if key1_series.empty:
-        return "variant"
-    first = key1_series.iloc[0].strip().lower()
-    if first.startswith("attr"):
-        return "attribute"
-    return "variant"
+def load_detect_frame(path: str, stream: bool, sheets: List[str] | None = None) -> pd.DataFrame:
+    import pandas as pd
+
+    from .source_cache import read_source
+
+    if sheets:
+        # all selected sheets together; key columns only
+        return pd.concat([_sheet_detect_frame(path, stream, sheet) for sheet in sheets], ignore_index=True)
+    if not stream:
+        return read_source(path)
+    return _sheet_detect_frame(path, stream, None)
+
+
+# key rows of streamed sources by (path, size, mtime) and sheet: a large source is scanned for detection once per session
+_stream_detect_frames: Dict[tuple, pd.DataFrame] = {}
+
+
+def _sheet_detect_frame(path: str, stream: bool, sheet: str | None) -> pd.DataFrame:
+    import pandas as pd
+
+    from .source_cache import read_source, source_key
+
+    if not stream:
+        return read_source(path, sheet)[["Company", "Key1", "Key2", "Key3"]]
+    key = (source_key(path), sheet)
+    if key not in _stream_detect_frames:
+        # unique key rows only (first-seen order), enough for type detection and UD09 prompts
+        parts = [
+            chunk[["Company", "Key1", "Key2", "Key3"]].drop_duplicates()
+            for chunk in iter_source_chunks(path, sheet=sheet)
+        ]
+        if parts:
+            frame = pd.concat(parts, ignore_index=True).drop_duplicates().reset_index(drop=True)
+        else:
+            frame = pd.DataFrame(columns=["Company", "Key1", "Key2", "Key3"])
+        _stream_detect_frames[key] = frame
+    return _stream_detect_frames[key]
 
 
 def prompt_operation() -> str:
@@ -65,18 +109,51 @@ def prompt_operation() -> str:
             {"name": "Add only", "value": "add"},
             {"name": "Delete only", "value": "delete"},
             {"name": "Delete & Add", "value": "both"},
+            {"name": "Delta (previous vs current file)", "value": "delta"},
         ],
         default="add",
     ).execute()
     return choice
 
 
+def prompt_sheets(path: str) -> List[str] | None:
+    """Sheets to build as separate sources, or None for the usual first-sheet build."""
+    if os.path.splitext(path)[1].lower() not in (".xlsx", ".xls"):
+        return None
+    try:
+        names = list_sheets(path)
+    except Exception:
+        return None
+    if len(names) < 2:
+        return None
+    choice = inquirer.select(
+        message=f"This workbook has {len(names)} sheets. Build:",
+        choices=[
+            {"name": "First sheet only", "value": "first"},
+            {"name": "Every sheet, each as its own source", "value": "all"},
+            {"name": "Selected sheets, each as its own source", "value": "pick"},
+        ],
+        default="first",
+    ).execute()
+    if choice == "first":
+        return None
+    if choice == "all":
+        return names
+    return inquirer.checkbox(
+        message="Sheets to build:",
+        choices=[{"name": name, "value": name, "enabled": True} for name in names],
+        validate=lambda picked: len(picked) >= 1,
+        invalid_message="Select at least one sheet",
+    ).execute()
+
+
 def prompt_type(detected: str) -> str:
     choice = inquirer.select(
         message=f"Detected type: {detected.capitalize()}. Confirm or override:",
         choices=[
             {"name": "Variant", "value": "variant"},
             {"name": "Attribute", "value": "attribute"},
+            {"name": "Mixed (variant and attribute rows, split by Key1)", "value": "mixed"},
         ],
         default=detected,
     ).execute()
@@ -114,29 +191,39 @@ def prompt_part_details() -> Tuple[str, bool, str, str, str]:
     return variant_parent, is_new, part_desc, prod_code, website
 
 
-def prompt_variant_ud09_sort(keys3: List[str]) -> Dict[str, int]:
-    unique_vals = sorted({k for k in keys3 if k is not None and str(k).strip() != ""})
-    if not unique_vals:
-        return {}
+UD09_PREVIEW_ROWS = 12
+
 
-    console.print(Panel.fit("Configure UD09 sort order (Number01) for dropdown values.", border_style="cyan"))
+def _show_ud09_order(mapping: Dict[str, int], title: str = "UD09 values") -> None:
+    ordered = sorted(mapping.items(), key=lambda kv: kv[1])
+    tbl = Table(show_lines=False)
+    tbl.add_column("Number01", style="white", justify="right")
+    tbl.add_column("Value", style="cyan", no_wrap=True)
+    head = ordered if len(ordered) <= UD09_PREVIEW_ROWS else ordered[: UD09_PREVIEW_ROWS - 2]
+    for value, number in head:
+        tbl.add_row(str(number), value)
+    if len(head) < len(ordered):
+        tbl.add_row("…", f"{len(ordered) - len(head) - 1} more")
+        tbl.add_row(str(ordered[-1][1]), ordered[-1][0])
+    console.print(Panel.fit(tbl, title=title, border_style="blue"))
+
+
+def _prompt_ud09_each(unique_vals: List[str]) -> Dict[str, int]:
+    # the value list is printed once; each prompt only adds its own line
+    tbl = Table(show_lines=False)
+    tbl.add_column("#", style="white", justify="right")
+    tbl.add_column("Value", style="cyan", no_wrap=True)
+    for i, v in enumerate(unique_vals, 1):
+        tbl.add_row(str(i), v)
+    console.print(Panel.fit(tbl, title="UD09 values", border_style="blue"))
 
     mapping: Dict[str, int] = {}
-    
-    def render_status() -> None:
-        tbl = Table(show_lines=False)
-        tbl.add_column("Value", style="cyan", no_wrap=True)
-        tbl.add_column("Number01", style="white")
-        for v in unique_vals:
-            assigned = mapping.get(v)
-            tbl.add_row(v, "" if assigned is None else str(assigned))
-        console.print(Panel.fit(tbl, title="UD09 values", border_style="blue"))
-
-    for val in unique_vals:
+    total = len(unique_vals)
+    for i, val in enumerate(unique_vals, 1):
         try:
-            render_status()
             order_str = inquirer.text(
-                message=f"Order for '{val}':",
+                message=f"({i}/{total}) Order for '{val}':",
+                default=str(i),
                 validate=lambda r: r.isdigit() and int(r) >= 1,
                 invalid_message="Enter a positive integer",
             ).execute()
@@ -147,39 +234,158 @@ def prompt_variant_ud09_sort(keys3: List[str]) -> Dict[str, int]:
     return mapping
 
 
-def prompt_attribute_ud09_sort(keys2: List[str]) -> Dict[str, int]:
-    unique_vals = sorted({k for k in keys2 if k is not None and str(k).strip() != ""})
+def _interactive_terminal() -> bool:
+    return sys.stdin.isatty() and sys.stdout.isatty()
+
+
+def prompt_ud09_sort(values: List[str], label: str = "dropdown", known: Dict[str, int] | None = None) -> Dict[str, int]:
+    from .sorting import order_to_map, parse_order_text, read_order_file, sort_values
+
+    unique_vals = sorted({k for k in values if k is not None and str(k).strip() != ""})
     if not unique_vals:
         return {}
 
-    console.print(Panel.fit("Configure UD09 sort order (Number01) for attribute dropdown values.", border_style="cyan"))
+    known = {v: n for v, n in (known or {}).items() if v in set(unique_vals)}
+    pending = [v for v in unique_vals if v not in known]
+    if known:
+        _show_ud09_order(known, title="Saved UD09 order")
+        if not pending:
+            console.print(f"All {len(unique_vals)} {label} values have a saved order.", style="green")
+            if not inquirer.confirm(message="Change the saved order?", default=False).execute():
+                return known
+            known, pending = {}, unique_vals
+        else:
+            console.print(f"{len(known)} of {len(unique_vals)} {label} values have a saved order; set the order for the {len(pending)} new value(s).", style="cyan")
+    else:
+        console.print(Panel.fit(f"Configure UD09 sort order (Number01) for {len(unique_vals)} {label} values.", border_style="cyan"))
 
-    mapping: Dict[str, int] = {}
-    
-    def render_status() -> None:
-        tbl = Table(show_lines=False)
-        tbl.add_column("Value", style="cyan", no_wrap=True)
-        tbl.add_column("Number01", style="white")
-        for v in unique_vals:
-            assigned = mapping.get(v)
-            tbl.add_row(v, "" if assigned is None else str(assigned))
-        console.print(Panel.fit(tbl, title="UD09 values", border_style="blue"))
-
-    for val in unique_vals:
-        try:
-            render_status()
-            order_str = inquirer.text(
-                message=f"Order for '{val}':",
-                validate=lambda r: r.isdigit() and int(r) >= 1,
-                invalid_message="Enter a positive integer",
-            ).execute()
-            mapping[val] = int(order_str)
-        except Exception:
-            # fallback sequential if user escapes
-            mapping[val] = len(mapping) + 1
+    choices = [
+        {"name": "Automatic - natural order (A2 before A10)", "value": "natural"},
+        {"name": "Automatic - by size (1/4\", 3/8\", 10mm, 1\" ...)", "value": "numeric"},
+        {"name": "Paste an order (one value per line, or value + Number01 columns)", "value": "paste"},
+        {"name": "Load an order from a .txt/.csv file", "value": "file"},
+    ]
+    if _interactive_terminal():
+        choices.append({"name": "Arrange in the list editor", "value": "editor"})
+    choices.append({"name": "Enter Number01 for each value", "value": "each"})
+    method = inquirer.select(message="How should the UD09 order be set?", choices=choices, default="natural").execute()
+
+    if method == "each":
+        mapping = _prompt_ud09_each(pending)
+    elif method in ("paste", "file"):
+        if method == "paste":
+            text = inquirer.text(message="Paste values in order (Esc then Enter to finish):", multiline=True).execute()
+            mapping, unknown = parse_order_text(text, pending)
+        else:
+            path = inquirer.filepath(
+                message="Order file (.txt or .csv):",
+                validate=lambda p: os.path.isfile(p.strip().strip('"')),
+                invalid_message="File not found",
+            ).execute().strip().strip('"')
+            mapping, unknown = read_order_file(path, pending)
+        if unknown:
+            shown = ", ".join(unknown[:10]) + (" …" if len(unknown) > 10 else "")
+            console.print(f"Ignored {len(unknown)} line(s) that match no {'new ' if known else ''}value: {shown}", style="yellow")
+        missing = len(pending) - len(mapping)
+        if missing:
+            console.print(f"{missing} value(s) not listed will be numbered after the listed ones.", style="yellow")
+    else:
+        mapping = order_to_map(sort_values(pending, "numeric" if method == "numeric" else "natural"))
+
+    if known:
+        # new values go after the saved ones
+        offset = max(known.values())
+        mapping = {**known, **{v: offset + n for v, n in mapping.items()}}
+    if method == "each":
+        return mapping
+
+    ordered = sorted(mapping, key=mapping.get)
+    if method != "editor":
+        _show_ud09_order(mapping)
+        if not _interactive_terminal() or not inquirer.confirm(message="Adjust this order in the list editor?", default=False).execute():
+            return mapping
+
+    from .sort_editor import edit_order
+
+    # listed values first in their order, then the rest as the builders would number them
+    start = ordered + [v for v in unique_vals if v not in mapping]
+    edited = edit_order(start, title=f"UD09 sort order - {label} values")
+    if edited is None:
+        console.print("Editor cancelled; keeping the previous order.", style="yellow")
+        return mapping
+    mapping = order_to_map(edited)
+    _show_ud09_order(mapping)
     return mapping
 
 
+def prompt_variant_ud09_sort(keys3: List[str], known: Dict[str, int] | None = None) -> Dict[str, int]:
+    return prompt_ud09_sort(keys3, "dropdown", known)
+
+
+def prompt_attribute_ud09_sort(keys2: List[str], known: Dict[str, int] | None = None) -> Dict[str, int]:
+    return prompt_ud09_sort(keys2, "attribute dropdown", known)
+
+
+def prompt_mixed_ud09_sort(df11: pd.DataFrame, known: Dict[str, Dict[str, int]] | None = None) -> Dict[str, Dict[str, int]]:
+    from .builders import split_by_type
+
+    # one order per partition: the same text can be a variant Key3 and an attribute Key2
+    parts = split_by_type(df11)
+    known = known or {}
+    return {
+        "variant": prompt_variant_ud09_sort(parts["variant"]["Key3"].dropna().astype(str).tolist(), known.get("variant")),
+        "attribute": prompt_attribute_ud09_sort(parts["attribute"]["Key2"].dropna().astype(str).tolist(), known.get("attribute")),
+    }
+
+
+def load_saved_ud09_sort(df11: pd.DataFrame, import_type: str) -> Tuple[list, Dict[str, int]]:
+    from .sort_store import known_sort_map, ud09_keys
+
+    keys = ud09_keys(df11, import_type)
+    try:
+        return keys, known_sort_map(keys, import_type)
+    except Exception as exc:
+        # the store is a convenience; an unreadable one must not block the run
+        console.print(f"Could not read saved UD09 orders: {exc}", style="yellow")
+        return keys, {}
+
+
+def save_ud09_sort(keys: list, import_type: str, ud09_sort_map: Dict[str, int] | None) -> None:
+    from .sort_store import remember_sort_map
+
+    try:
+        remember_sort_map(keys, import_type, ud09_sort_map)
+    except Exception as exc:
+        console.print(f"Could not save the UD09 order for next time: {exc}", style="yellow")
+
+
+def review_validation(results: Dict[str, Tuple[pd.DataFrame, str | None]]) -> bool:
+    """Show pre-flight validation findings; False if the user stops on errors."""
+    from .validation import summarize_issues
+
+    flagged = {path: found for path, found in results.items() if found[1]}
+    if not flagged:
+        console.print("Validation passed: no key problems found.", style="green")
+        return True
+
+    tbl = Table(show_lines=False)
+    tbl.add_column("File", style="cyan")
+    tbl.add_column("Check", style="white")
+    tbl.add_column("Severity", style="white")
+    tbl.add_column("Rows", style="white", justify="right")
+    has_errors = False
+    for path, (issues, _report) in flagged.items():
+        for rule, severity, count in summarize_issues(issues):
+            has_errors = has_errors or severity == "error"
+            tbl.add_row(os.path.basename(path), rule, f"[red]{severity}[/red]" if severity == "error" else f"[yellow]{severity}[/yellow]", f"{count:,}")
+    console.print(Panel.fit(tbl, title="Validation", border_style="red" if has_errors else "yellow"))
+    for _issues, report in flagged.values():
+        console.print(f"Row-level report: {report}", style="dim")
+    if not has_errors:
+        return True
+    return inquirer.confirm(message="The DMT import is likely to fail on these rows. Continue anyway?", default=False).execute()
+
+
 def show_summary(
     operation: str,
     files: List[str],
@@ -195,6 +401,8 @@ def show_summary(
     cat_site: str,
     cat_list: List[str],
     cat_is_new: bool,
+    shard_rows: int | None = None,
+    sheets: List[str] | None = None,
 ) -> bool:
     table = Table(title="Summary", show_lines=False)
     table.add_column("Field", style="cyan", no_wrap=True)
@@ -202,9 +410,13 @@ def show_summary(
 
     table.add_row("Operation", operation)
     table.add_row("File(s)", "\n".join(files))
+    if sheets:
+        table.add_row("Sheets", f"{len(sheets)}: {', '.join(sheets)}" if len(sheets) <= 5 else f"{len(sheets)} sheets ({sheets[0]} … {sheets[-1]})")
     table.add_row("Type", import_type)
     table.add_row("Include Tables", ", ".join(sorted(include_tables)))
-    if import_type == "variant":
+    if shard_rows:
+        table.add_row("Rows per file", f"{shard_rows:,}")
+    if import_type in ("variant", "mixed"):
         table.add_row("Create Part?", "Yes" if part_enabled else "No")
         if part_enabled:
             table.add_row("Variant Parent", variant_parent)
@@ -225,11 +437,20 @@ def show_summary(
     return inquirer.confirm(message="Proceed?", default=True).execute()
 
 
+def report_path_for(playlist_path: str) -> str:
+    root = playlist_path[: -len("_PLAYLIST.csv")] if playlist_path.endswith("_PLAYLIST.csv") else os.path.splitext(playlist_path)[0]
+    return f"{root}_REPORT.json"
+
+
 def celebrate_success(output_dir: str | None, playlist_path: str) -> None:
-    console.print(Panel.fit(
-        f"🎉 Success!\n\nOutput folder:\n- {output_dir}\nPlaylist:\n- {playlist_path}",
-        border_style="green",
-    ))
+    if playlist_path.endswith(".zip"):
+        # the folders, playlist and report are all inside the bundle
+        body = f"Bundle:\n- {playlist_path}\nExtract with:\n- python DMT_Wizard.py extract \"{playlist_path}\""
+    else:
+        report_path = report_path_for(playlist_path)
+        report_line = f"\nRun report:\n- {report_path}" if os.path.exists(report_path) else ""
+        body = f"Output folder:\n- {output_dir}\nPlaylist:\n- {playlist_path}{report_line}"
+    console.print(Panel.fit(f"🎉 Success!\n\n{body}", border_style="green"))
     # Big orange warning reminder
     warning_text = (
         "⚠ WARNING! Before importing, replace any 'COPY NEEDED' values in Categories_UD08 and Part!"
@@ -253,68 +474,485 @@ def process_single(
     ud09_sort_map: Dict[str, int] | None,
     cat_opts: Dict[str, str] | None,
     prod_code: str,
+    stream: bool = False,
+    chunksize: int = STREAM_CHUNK_ROWS,
+    output_base: str | None = None,
+    show_progress: bool = True,
+    progress: Progress | None = None,
+    shard_rows: int | None = None,
+    report: RunReport | None = None,
+    sheet: str | None = None,
+    engine: str | None = None,
+    bundle: ZipBundle | None = None,
+    stem_prefix: str = "",
 ) -> Tuple[str, Dict[str, str]]:
-    df11 = read_excel_normalized(excel_path)
+    from .build_cache import BuildCache
+    from .builders import (
+        MIXED_PREFIXES,
+        build_ud_tables,
+        build_ud_tables_arrow,
+        part_source,
+        part_source_arrow,
+        split_by_type,
+        build_part_table,
+        build_category_tables,
+        category_part_nums,
+        StreamingTableBuilder,
+    )
+    from .sort_store import partition_sort_map
+    from .source_cache import read_source, read_source_table
+    from rich.progress import Progress
+
     stem, base_dir = get_stem_and_dir(excel_path)
-    out_dir = ensure_output_dir(base_dir, f"{stem}_OUTPUT")
+    stem = stem_prefix + sheet_stem(stem, sheet)
+    # with a bundle the folder only exists inside the zip
+    out_dir = os.path.join(output_base or base_dir, f"{stem}_OUTPUT") if bundle is not None else ensure_output_dir(output_base or base_dir, f"{stem}_OUTPUT")
 
     written: Dict[str, str] = {}
+    pending: List[Future] = []
+    writer_pool = get_writer_pool()
+    report = report if report is not None else RunReport()
+
+    cat_opts = cat_opts or {}
+    cat_site = cat_opts.get("website", "").strip()
+    cat_list = cat_opts.get("categories", [])
+    cat_is_new = cat_opts.get("is_new", False)
+    part_wanted = import_type in ("variant", "mixed") and create_part
+    cats_wanted = import_type in ("variant", "mixed") and bool(cat_site and cat_list)
+
+    # each group of tables is skipped when its source and options hash match the output folder's manifest
+    with report.phase("cache", run=stem) as rec:
+        cache = BuildCache(out_dir, stem, excel_path, sheet, enabled=False if bundle is not None else None)
+        common = {"type": import_type, "stream": stream, "shard_rows": shard_rows}
+        cached = {"ud": cache.fresh("ud", {**common, "ud09_sort": ud09_sort_map}, lambda name: table_of(name) == "UD11" or table_of(name) in include_tables)}
+        if part_wanted:
+            cached["part"] = cache.fresh("part", {**common, "parent": variant_parent, "website": website, "is_new": is_new, "description": part_desc, "prod_code": prod_code})
+        if cats_wanted:
+            cached["categories"] = cache.fresh("categories", {**common, "parent": variant_parent, **cat_opts})
+        rec["fresh"] = [group for group, paths in cached.items() if paths is not None]
+    if all(paths is not None for paths in cached.values()):
+        for paths in cached.values():
+            written.update(paths)
+        cache.save(written)
+        return stem, written
+    if stream:
+        # the stream is also what yields the Part source, so it always runs
+        cached["ud"] = None
+    if cached["ud"] is not None:
+        written.update(cached["ud"])
+
+    # a caller running several builds at once passes one shared Progress
+    owns_progress = progress is None
+    if owns_progress:
+        progress = Progress(disable=not show_progress)
+        progress.start()
+    # the bar counts rows: source rows read, source rows built, then the rows of every file written
+    task = progress.add_task(f"{stem}: reading", total=None)
+
+    def timed_write(key: str, df_out: pd.DataFrame, path: str, group: str, table: str) -> None:
+        with report.phase("write", run=stem, table=key, rows=len(df_out)) as rec:
+            if bundle is not None:
+                rec["bytes"] = bundle.write(df_out, path)
+                return
+            rec["bytes"], rewritten = cache.write(df_out, path, key, group, table)
+            if not rewritten:
+                rec["unchanged"] = True
+
+    def submit_write(group: str, key: str, df_out: pd.DataFrame, path: str) -> None:
+        # the bar advances as writers finish, in any order
+        shards = split_shards(df_out, path, shard_rows)
+        for i, (shard_file, df_shard) in enumerate(shards):
+            shard_key = key if len(shards) == 1 else f"{key}_{i + 1:04d}"
+            written[shard_key] = shard_file
+            rows = len(df_shard)
+            progress.update(task, total=progress.tasks[task].total + rows)
+            fut = writer_pool.submit(timed_write, shard_key, df_shard, shard_file, group, key)
+            fut.add_done_callback(lambda _f, rows=rows: progress.update(task, advance=rows))
+            pending.append(fut)
 
-    with Progress() as progress:
-        task = progress.add_task("Building tables", total=5)
-
-        # UD11
-        df11_out = df11.copy()
-        progress.update(task, advance=1)
-
-        if import_type == "variant":
-            dfs = build_variant_ud_tables(df11_out, ud09_sort_map)
+    try:
+        if stream:
+            # UD11 goes straight to disk chunk by chunk; only unique key rows stay in memory
+            # (a mixed source keeps one builder and one UD11 file per partition); files start out
+            # hidden so the cache can leave an unchanged UD11 in place (in a local scratch folder for a bundle)
+            prefixes = MIXED_PREFIXES if import_type == "mixed" else {import_type: ""}
+            builders = {kind: StreamingTableBuilder(kind, partition_sort_map(ud09_sort_map, kind)) for kind in prefixes}
+            spool_dir = bundle.scratch if bundle is not None else out_dir
+            ud11_outs = {kind: ShardedAppender(os.path.join(spool_dir, f".{stem}_{prefix}UD11.csv"), shard_rows) for kind, prefix in prefixes.items()}
+            n_rows = 0
+            with report.phase("stream", run=stem, table="UD11", source_bytes=os.path.getsize(excel_path)) as rec:
+                for chunk in iter_source_chunks(excel_path, chunksize, sheet):
+                    parts = split_by_type(chunk) if import_type == "mixed" else {import_type: chunk}
+                    for kind, part in parts.items():
+                        if len(part) or len(parts) == 1:
+                            ud11_outs[kind].append(builders[kind].feed(part))
+                    n_rows += len(chunk)
+                    progress.update(task, completed=n_rows, description=f"{stem}: streaming ({n_rows:,} rows)")
+                if import_type == "mixed":
+                    # a partition with no rows writes nothing
+                    prefixes = {kind: prefix for kind, prefix in prefixes.items() if builders[kind].rows}
+                ud11_paths = {kind: ud11_outs[kind].close(UD11_COLUMNS) for kind in prefixes}
+                rec["rows"] = n_rows
+                rec["bytes"] = sum(os.path.getsize(path) for paths in ud11_paths.values() for path in paths)
+            for kind, paths in ud11_paths.items():
+                for i, tmp in enumerate(paths):
+                    key = f"{prefixes[kind]}UD11" if len(paths) == 1 else f"{prefixes[kind]}UD11_{i + 1:04d}"
+                    written[key] = os.path.join(out_dir, os.path.basename(tmp)[1:])
+                    if bundle is not None:
+                        bundle.add_file(tmp, written[key])
+                    else:
+                        cache.commit(tmp, written[key], key, "ud", f"{prefixes[kind]}UD11")
+            progress.update(task, total=2 * n_rows, completed=n_rows, description=f"{stem}: building")
+            with report.phase("build.ud", run=stem, rows=n_rows) as rec:
+                dfs = {f"{prefixes[kind]}{name}": df_tbl for kind in prefixes for name, df_tbl in builders[kind].finish().items()}
+                rec["tables"] = {name: len(df_tbl) for name, df_tbl in dfs.items()}
+            cache.built("ud", [f"{prefix}UD11" for prefix in prefixes.values()] + list(dfs))
+            main = builders["attribute" if import_type == "attribute" else "variant"]
+            part_src = main.part_source()
+            company_val = next((b.first_company for b in builders.values() if b.first_company), "") or "SAINC"
+        elif resolve_engine(engine) == "arrow":
+            # the source stays an Arrow table of text from read to write
+            with report.phase("read", run=stem, source_bytes=os.path.getsize(excel_path)) as rec:
+                table = read_source_table(excel_path, sheet)
+                rec["rows"] = n_rows = table.num_rows
+            progress.update(task, total=2 * n_rows, completed=n_rows, description=f"{stem}: building")
+            dfs = {}
+            if cached["ud"] is None:
+                with report.phase("build.ud", run=stem, rows=n_rows) as rec:
+                    dfs = build_ud_tables_arrow(table, import_type, ud09_sort_map)
+                    rec["tables"] = {name: len(df_tbl) for name, df_tbl in dfs.items()}
+                cache.built("ud", dfs)
+            part_src = part_source_arrow(table, import_type)
+            company_val = table.column("Company")[0].as_py() if n_rows else "SAINC"
         else:
-            dfs = build_attribute_ud_tables(df11_out, ud09_sort_map)
-        progress.update(task, advance=2)
+            # UD11
+            with report.phase("read", run=stem, source_bytes=os.path.getsize(excel_path)) as rec:
+                df11 = read_source(excel_path, sheet)
+                df11_out = df11.copy()
+                rec["rows"] = n_rows = len(df11_out)
+            progress.update(task, total=2 * n_rows, completed=n_rows, description=f"{stem}: building")
+
+            if cached["ud"] is None:
+                with report.phase("build.ud", run=stem, rows=n_rows) as rec:
+                    dfs, part_src = build_ud_tables(df11_out, import_type, ud09_sort_map)
+                    rec["tables"] = {name: len(df_tbl) for name, df_tbl in dfs.items()}
+                cache.built("ud", dfs)
+            else:
+                dfs, part_src = {}, part_source(df11_out, import_type)
+            company_val = df11_out["Company"].iloc[0] if not df11_out.empty else "SAINC"
+        progress.update(task, advance=n_rows, description=f"{stem}: writing")
 
         # Write selected tables
         for tbl_name, df_tbl in dfs.items():
-            if tbl_name == "UD11" or tbl_name in include_tables:
-                csv_path = os.path.join(out_dir, f"{stem}_{tbl_name}.csv")
-                write_csv(df_tbl, csv_path)
-                written[tbl_name] = csv_path
-        progress.update(task, advance=1)
+            if table_of(tbl_name) == "UD11" or table_of(tbl_name) in include_tables:
+                submit_write("ud", tbl_name, df_tbl, os.path.join(out_dir, f"{stem}_{tbl_name}.csv"))
 
         # Part (variant + requested, only for add runs, handled by caller)
-        if import_type == "variant" and create_part:
-            df_part = build_part_table(df11_out, variant_parent, website, is_new, part_desc, prod_code)
-            csv_path = os.path.join(out_dir, f"{stem}_Part.csv")
-            write_csv(df_part, csv_path)
-            written["Part"] = csv_path
-        progress.update(task, advance=1)
-
-    # Category files (outside progress so prompts are clean)
-    if import_type == "variant" and cat_opts:
-        cat_site = cat_opts.get("website", "").strip()
-        cat_list = cat_opts.get("categories", [])
-        cat_is_new = cat_opts.get("is_new", False)
-        if cat_site and cat_list:
-            company_val = df11_out["Company"].iloc[0] if not df11_out.empty else "SAINC"
+        if part_wanted and cached["part"] is not None:
+            written.update(cached["part"])
+        elif part_wanted:
+            with report.phase("build.part", run=stem) as rec:
+                df_part = build_part_table(part_src, variant_parent, website, is_new, part_desc, prod_code)
+                rec["rows"] = len(df_part)
+            submit_write("part", "Part", df_part, os.path.join(out_dir, f"{stem}_Part.csv"))
+            cache.built("part", ["Part"])
+
+        # Category files
+        if cats_wanted and cached["categories"] is not None:
+            written.update(cached["categories"])
+        elif cats_wanted:
+            # every category is assigned to the parent (if any) and to every child part
+            with report.phase("build.categories", run=stem) as rec:
+                parts = category_part_nums(part_src, variant_parent or cat_opts.get("parent_part", ""))
+                cat_tables = build_category_tables(company_val, cat_site, cat_list, parts)
+                rec["rows"] = len(cat_tables["UD08"]) + len(cat_tables["UD11"])
+
             # UD08 category definition (only for new categories)
             if cat_is_new:
-                df_cat08_list = [build_category_ud08(company_val, cat_site, cat_str) for cat_str in cat_list]
-                df_cat08 = pd.concat(df_cat08_list, ignore_index=True)
-                path08 = os.path.join(out_dir, f"{stem}_Categories_UD08.csv")
-                write_csv(df_cat08, path08)
-                written["UD08_Categories"] = path08
+                submit_write("categories", "UD08_Categories", cat_tables["UD08"], os.path.join(out_dir, f"{stem}_Categories_UD08.csv"))
 
             # UD11 assignment (always created when working with categories)
-            parent_part = variant_parent if variant_parent else inquirer.text(message="Parent Part ID for category:").execute().strip()
-            df_cat11_list = [build_category_ud11_for_parent(company_val, parent_part, cat_site, cat_str) for cat_str in cat_list]
-            df_cat11 = pd.concat(df_cat11_list, ignore_index=True)
-            path11 = os.path.join(out_dir, f"{stem}_Categories_UD11.csv")
-            write_csv(df_cat11, path11)
-            written["UD11_Categories"] = path11
+            submit_write("categories", "UD11_Categories", cat_tables["UD11"], os.path.join(out_dir, f"{stem}_Categories_UD11.csv"))
+            cache.built("categories", ["UD08_Categories", "UD11_Categories"] if cat_is_new else ["UD11_Categories"])
+
+        # surface the first write error, if any
+        for fut in pending:
+            fut.result()
+        cache.save(written)
+        progress.update(task, description=f"{stem}: done")
+    finally:
+        for fut in pending:
+            fut.cancel()
+        wait(pending)
+        if owns_progress:
+            progress.stop()
 
     return stem, written
 
 
+def both_outputs_collide(files: List[str], output_base: str | None = None) -> bool:
+    """Whether the DELETE and ADD files of a "both" run would write into the same output folder."""
+    folders = [os.path.normcase(os.path.abspath(os.path.join(output_base or base_dir, stem))) for stem, base_dir in map(get_stem_and_dir, files[:2])]
+    return folders[0] == folders[1]
+
+
+def process_delta(
+    prev_path: str,
+    curr_path: str,
+    import_type: str,
+    include_tables: Set[str],
+    ud09_sort_map: Dict[str, int] | None,
+    output_base: str | None = None,
+    show_progress: bool = True,
+    shard_rows: int | None = None,
+    report: RunReport | None = None,
+    bundle: ZipBundle | None = None,
+) -> Tuple[Dict[str, str], Dict[str, str]]:
+    from .delta import build_delta
+    from .source_cache import read_source
+    from rich.progress import Progress
+
+    stem, base_dir = get_stem_and_dir(curr_path)
+    out_dir = os.path.join(output_base or base_dir, f"{stem}_DELTA_OUTPUT") if bundle is not None else ensure_output_dir(output_base or base_dir, f"{stem}_DELTA_OUTPUT")
+
+    report = report if report is not None else RunReport()
+
+    with Progress(disable=not show_progress) as progress:
+        task = progress.add_task(f"{stem}: reading", total=None)
+        with report.phase("read", run=stem, source_bytes=os.path.getsize(prev_path) + os.path.getsize(curr_path)) as rec:
+            prev_df = read_source(prev_path)
+            curr_df = read_source(curr_path)
+            rec["rows"] = n_rows = len(prev_df) + len(curr_df)
+        progress.update(task, total=2 * n_rows, completed=n_rows, description=f"{stem}: diffing")
+        with report.phase("build.delta", run=stem, rows=n_rows) as rec:
+            delta = build_delta(prev_df, curr_df, import_type, ud09_sort_map)
+            rec["tables"] = {f"{op}.{name}": len(df_tbl) for op, dfs in delta.items() for name, df_tbl in dfs.items()}
+        progress.update(task, advance=n_rows, description=f"{stem}: writing")
+
+        def timed_write(key: str, df_out: pd.DataFrame, path: str) -> None:
+            with report.phase("write", run=stem, table=key, rows=len(df_out)) as rec:
+                if bundle is not None:
+                    rec["bytes"] = bundle.write(df_out, path)
+                    return
+                write_csv(df_out, path)
+                rec["bytes"] = os.path.getsize(path)
+
+        written: Dict[str, Dict[str, str]] = {"delete": {}, "add": {}}
+        futures: List[Future] = []
+        writer_pool = get_writer_pool()
+        for op, prefix in (("delete", "DEL"), ("add", "ADD")):
+            for tbl_name, df_tbl in delta[op].items():
+                # an empty table would only cost an idle DMT import
+                if df_tbl.empty or (table_of(tbl_name) != "UD11" and table_of(tbl_name) not in include_tables):
+                    continue
+                shards = split_shards(df_tbl, os.path.join(out_dir, f"{prefix}_{stem}_{tbl_name}.csv"), shard_rows)
+                for i, (path, df_shard) in enumerate(shards):
+                    key = tbl_name if len(shards) == 1 else f"{tbl_name}_{i + 1:04d}"
+                    written[op][key] = path
+                    progress.update(task, total=progress.tasks[task].total + len(df_shard))
+                    fut = writer_pool.submit(timed_write, f"{prefix}_{key}", df_shard, path)
+                    fut.add_done_callback(lambda _f, rows=len(df_shard): progress.update(task, advance=rows))
+                    futures.append(fut)
+        for fut in futures:
+            fut.result()
+        progress.update(task, description=f"{stem}: done")
+
+    return written["delete"], written["add"]
+
+
+def _build_sheet(args: tuple) -> Tuple[str, Dict[str, str], List[Dict], float]:
+    # one sheet in a worker process, without a progress display; its phases go back to the parent's report
+    excel_path, sheet, import_type, include_tables, ud09_sort_map, stream, output_base, shard_rows, engine, bundle = args
+    report = RunReport()
+    _stem, written = process_single(
+        excel_path, import_type, include_tables, False, "", "", False, "", ud09_sort_map, None, "",
+        stream=stream, output_base=output_base, show_progress=False, shard_rows=shard_rows, report=report, sheet=sheet, engine=engine, bundle=bundle,
+    )
+    return sheet, written, report.phases, report.started_wall
+
+
+def process_sheets(
+    excel_path: str,
+    sheets: List[str],
+    import_type: str,
+    include_tables: Set[str],
+    ud09_sort_map: Dict[str, int] | None,
+    stream: bool = False,
+    output_base: str | None = None,
+    show_progress: bool = True,
+    shard_rows: int | None = None,
+    report: RunReport | None = None,
+    workers: int | None = None,
+    engine: str | None = None,
+    bundle: ZipBundle | None = None,
+) -> Dict[str, Dict[str, str]]:
+    """Build every listed sheet of a workbook as its own source, in parallel worker processes.
+
+    Each sheet gets its own ``<stem>_<sheet>_OUTPUT`` folder. Returns
+    ``{sheet: written}`` in the order the sheets were given. With a bundle the
+    sheets are built one after another in this process, which owns the zip.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    from rich.progress import Progress
+
+    stem = get_stem_and_dir(excel_path)[0]
+    jobs = [(excel_path, sheet, import_type, include_tables, ud09_sort_map, stream, output_base, shard_rows, engine, bundle) for sheet in sheets]
+    workers = 1 if bundle is not None else min(len(jobs), workers or os.cpu_count() or 1)
+    results: Dict[str, Dict[str, str]] = {}
+    with Progress(disable=not show_progress) as progress:
+        task = progress.add_task(f"{stem}: building {len(jobs)} sheets", total=len(jobs))
+
+        def collect(result: tuple) -> None:
+            sheet, written, phases, started_wall = result
+            results[sheet] = written
+            if report is not None:
+                report.merge(phases, started_wall)
+            progress.advance(task)
+
+        if workers == 1:
+            for job in jobs:
+                collect(_build_sheet(job))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for fut in as_completed([pool.submit(_build_sheet, job) for job in jobs]):
+                    collect(fut.result())
+    return {sheet: results[sheet] for sheet in sheets}
+
+
+def run_operation(
+    operation: str,
+    files: List[str],
+    import_type: str,
+    include_tables: Set[str],
+    part_enabled: bool,
+    variant_parent: str,
+    website: str,
+    is_new: bool,
+    part_desc: str,
+    prod_code: str,
+    ud09_sort_map: Dict[str, int] | None,
+    cat_opts: Dict[str, str] | None,
+    stream: bool = False,
+    output_base: str | None = None,
+    show_progress: bool = True,
+    shard_rows: int | None = None,
+    sheets: List[str] | None = None,
+    workers: int | None = None,
+    engine: str | None = None,
+    bundle: bool | None = None,
+    bundle_dest: str | None = None,
+) -> Tuple[str | None, str]:
+    """Build ``files`` and write the playlist; returns (output folder, playlist path).
+
+    With ``bundle`` (default: ``DMT_BUNDLE``) every table, the playlist and the
+    run report go into one ``<playlist name>.zip`` next to where the playlist
+    would be, and the playlist path returned is the zip's.
+    """
+    from rich.progress import Progress
+
+    from .build_cache import write_if_changed
+
+    engine = resolve_engine(engine)
+    playlist_stem = build_playlist_name(operation, files)
+
+    playlist_entries: List[Tuple[str, str]] = []  # (filepath, op)
+    playlist_dir = None
+    report = RunReport(operation=operation, files=list(files), import_type=import_type, tables=sorted(include_tables))
+    if sheets:
+        report.info["sheets"] = list(sheets)
+    if engine != "pandas":
+        report.info["engine"] = engine
+
+    archive = None
+    if bundle_enabled(bundle):
+        # the playlist's folder: the output base, else the (current) source's folder
+        root = output_base or os.path.dirname(files[1] if operation == "delta" else files[0])
+        archive = ZipBundle(os.path.join(root, f"{playlist_stem}.zip"), root, resolve_bundle_dest(bundle_dest))
+        report.info["bundle"] = archive.path
+
+    with archive if archive is not None else nullcontext():
+        # Execute runs
+        if sheets:
+            # every sheet is its own source; Part and categories need a single parent, so they are not built here
+            if operation not in ("add", "delete"):
+                raise ValueError("Sheets can only be built with the Add or Delete operation.")
+            by_sheet = process_sheets(files[0], sheets, import_type, include_tables, ud09_sort_map, stream=stream, output_base=output_base, show_progress=show_progress, shard_rows=shard_rows, report=report, workers=workers, engine=engine, bundle=archive)
+            playlist_dir = output_base or os.path.dirname(files[0])
+            for written in by_sheet.values():
+                for path in written.values():
+                    playlist_entries.append((path, operation))
+        elif operation == "add":
+            stem, written = process_single(files[0], import_type, include_tables, part_enabled, variant_parent, website, is_new, part_desc, ud09_sort_map, cat_opts, prod_code, stream=stream, output_base=output_base, show_progress=show_progress, shard_rows=shard_rows, report=report, engine=engine, bundle=archive)
+            playlist_dir = os.path.dirname(list(written.values())[0]) if written else os.path.dirname(files[0])
+            for path in written.values():
+                playlist_entries.append((path, "add"))
+        elif operation == "delete":
+            stem, written = process_single(files[0], import_type, include_tables, False, variant_parent, website, False, "", ud09_sort_map, cat_opts, "", stream=stream, output_base=output_base, show_progress=show_progress, shard_rows=shard_rows, report=report, engine=engine, bundle=archive)
+            playlist_dir = os.path.dirname(list(written.values())[0]) if written else os.path.dirname(files[0])
+            for path in written.values():
+                playlist_entries.append((path, "delete"))
+        elif operation == "delta":
+            # files = [previous snapshot, current snapshot]
+            del_written, add_written = process_delta(files[0], files[1], import_type, include_tables, ud09_sort_map, output_base=output_base, show_progress=show_progress, shard_rows=shard_rows, report=report, bundle=archive)
+            delta_base = output_base or os.path.dirname(files[1])
+            delta_folder = f"{get_stem_and_dir(files[1])[0]}_DELTA_OUTPUT"
+            playlist_dir = os.path.join(delta_base, delta_folder) if archive is not None else ensure_output_dir(delta_base, delta_folder)
+            for path in del_written.values():
+                playlist_entries.append((path, "delete"))
+            for path in add_written.values():
+                playlist_entries.append((path, "add"))
+        else:  # both
+            # two files with one name (or one file twice) would build into one output folder;
+            # each side then gets its own DEL_/ADD_ folder and file names, as a delta's files do
+            shared = both_outputs_collide(files, output_base)
+            del_prefix, add_prefix = ("DEL_", "ADD_") if shared else ("", "")
+            # the DELETE and ADD builds share no state, so run them side by side under one progress display
+            with Progress(disable=not show_progress) as progress, ThreadPoolExecutor(max_workers=2) as runs:
+                # delete run (Part only on add)
+                del_future = runs.submit(process_single, files[0], import_type, include_tables, False, variant_parent, website, False, "", ud09_sort_map, cat_opts, "", stream=stream, output_base=output_base, progress=progress, shard_rows=shard_rows, report=report, engine=engine, bundle=archive, stem_prefix=del_prefix)
+                add_future = runs.submit(process_single, files[1], import_type, include_tables, part_enabled, variant_parent, website, is_new, part_desc, ud09_sort_map, cat_opts, prod_code, stream=stream, output_base=output_base, progress=progress, shard_rows=shard_rows, report=report, engine=engine, bundle=archive, stem_prefix=add_prefix)
+                del_stem, del_written = del_future.result()
+                add_stem, add_written = add_future.result()
+            playlist_dir = os.path.dirname(list(del_written.values())[0]) if del_written else os.path.dirname(files[0])
+            for path in del_written.values():
+                playlist_entries.append((path, "delete"))
+            for path in add_written.values():
+                playlist_entries.append((path, "add"))
+
+        # Build playlist
+        if archive is not None:
+            # Source paths point into the archive, or to where it will be extracted
+            playlist_entries = [(archive.source_path(path), op) for path, op in playlist_entries]
+        include_for_playlist = include_tables.copy()
+        df_playlist = build_playlist_df(playlist_entries, include_for_playlist)
+        if sheets:
+            # one playlist for the workbook, next to the per-sheet output folders
+            playlist_path = os.path.join(playlist_dir, f"{playlist_stem}_PLAYLIST.csv")
+        else:
+            playlist_path = os.path.join(os.path.dirname(playlist_dir), f"{playlist_stem}_PLAYLIST.csv") if playlist_dir else os.path.join(os.path.dirname(files[0]), f"{playlist_stem}_PLAYLIST.csv")
+        with report.phase("playlist.write", rows=len(df_playlist)) as rec:
+            if archive is not None:
+                rec["bytes"] = archive.add_bytes(playlist_path, encode_csv(df_playlist))
+            else:
+                # an unchanged playlist keeps its mtime, like the tables it lists
+                if not write_if_changed(df_playlist, playlist_path):
+                    rec["unchanged"] = True
+                rec["bytes"] = os.path.getsize(playlist_path)
+
+        # machine-readable timings next to the playlist, for collecting run statistics centrally
+        report.info["playlist"] = playlist_path
+        if archive is not None:
+            archive.add_bytes(report_path_for(playlist_path), report.to_json().encode("utf-8"))
+        else:
+            report.write(report_path_for(playlist_path))
+
+    if archive is not None:
+        return playlist_dir, archive.path
+
+    return playlist_dir, playlist_path
+
+
 def run_new_pdp_mode() -> None:
     console.print(Panel.fit("New PDP Mode", border_style="magenta"))
     
@@ -382,7 +1020,6 @@ def run_new_pdp_mode() -> None:
         console.print("Cancelled.", style="yellow")
         return
     
-    import os
     console.print(Panel.fit("Select output folder", border_style="yellow"))
     output_base = pick_output_folder(title="Select output folder")
     if not output_base:
@@ -390,42 +1027,64 @@ def run_new_pdp_mode() -> None:
         return
     
     part_id_safe = sanitize_filename(part_id)
-    out_dir = ensure_output_dir(output_base, f"{part_id_safe}_OUTPUT")
+    archive = None
+    if bundle_enabled():
+        archive = ZipBundle(os.path.join(output_base, f"ADD_{part_id_safe}.zip"), output_base, resolve_bundle_dest())
+        out_dir = os.path.join(output_base, f"{part_id_safe}_OUTPUT")
+    else:
+        out_dir = ensure_output_dir(output_base, f"{part_id_safe}_OUTPUT")
     written: Dict[str, str] = {}
-    
-    company = "SAINC"
-    df_part = build_single_pdp_part(company, part_id, is_new, part_desc, prod_code, website)
-    part_path = os.path.join(out_dir, f"{part_id_safe}_Part.csv")
-    write_csv(df_part, part_path)
-    written["Part"] = part_path
-    
-    if cat_opts:
-        cat_site = cat_opts.get("website", "").strip()
-        cat_list = cat_opts.get("categories", [])
-        cat_is_new = cat_opts.get("is_new", False)
-        if cat_site and cat_list:
-            if cat_is_new:
-                df_cat08_list = [build_category_ud08(company, cat_site, cat_str) for cat_str in cat_list]
-                df_cat08 = pd.concat(df_cat08_list, ignore_index=True)
-                path08 = os.path.join(out_dir, f"{part_id_safe}_Categories_UD08.csv")
-                write_csv(df_cat08, path08)
-                written["UD08_Categories"] = path08
-            
-            df_cat11_list = [build_category_ud11_for_parent(company, part_id, cat_site, cat_str) for cat_str in cat_list]
-            df_cat11 = pd.concat(df_cat11_list, ignore_index=True)
-            path11 = os.path.join(out_dir, f"{part_id_safe}_Categories_UD11.csv")
-            write_csv(df_cat11, path11)
-            written["UD11_Categories"] = path11
-    
-    playlist_entries: List[Tuple[str, str]] = []
-    for path in written.values():
-        playlist_entries.append((path, "add"))
-    
-    df_playlist = build_playlist_df(playlist_entries, set())
-    playlist_path = os.path.join(os.path.dirname(out_dir), f"ADD_{part_id_safe}_PLAYLIST.csv")
-    df_playlist.to_csv(playlist_path, index=False, encoding='utf-8-sig')
-    
-    celebrate_success(out_dir, playlist_path)
+    report = RunReport(operation="add", mode="new_pdp", part=part_id)
+    if archive is not None:
+        report.info["bundle"] = archive.path
+
+    def emit(rows: Tuple[List[str], List[list]], path: str, table: str) -> None:
+        name = "playlist.write" if table == "playlist" else "write"
+        with report.phase(name, run=part_id_safe, table=table, rows=len(rows[1])) as rec:
+            if archive is not None:
+                rec["bytes"] = archive.add_bytes(path, encode_rows_csv(*rows))
+            else:
+                write_rows_csv(*rows, path)
+                rec["bytes"] = os.path.getsize(path)
+
+    with archive if archive is not None else nullcontext():
+        # a handful of rows: plain csv rows (same bytes as the DataFrame path) keep this mode free of pandas
+        company = "SAINC"
+        part_path = os.path.join(out_dir, f"{part_id_safe}_Part.csv")
+        emit(pdp_part_rows(company, part_id, is_new, part_desc, prod_code, website), part_path, "Part")
+        written["Part"] = part_path
+
+        if cat_opts:
+            cat_site = cat_opts.get("website", "").strip()
+            cat_list = cat_opts.get("categories", [])
+            cat_is_new = cat_opts.get("is_new", False)
+            if cat_site and cat_list:
+                cat_tables = category_rows(company, cat_site, cat_list, [part_id])
+                if cat_is_new:
+                    path08 = os.path.join(out_dir, f"{part_id_safe}_Categories_UD08.csv")
+                    emit(cat_tables["UD08"], path08, "UD08_Categories")
+                    written["UD08_Categories"] = path08
+
+                path11 = os.path.join(out_dir, f"{part_id_safe}_Categories_UD11.csv")
+                emit(cat_tables["UD11"], path11, "UD11_Categories")
+                written["UD11_Categories"] = path11
+
+        playlist_entries: List[Tuple[str, str]] = []
+        for path in written.values():
+            playlist_entries.append((archive.source_path(path) if archive is not None else path, "add"))
+
+        playlist_cols, _ = build_playlist_columns(playlist_entries, set())
+        playlist_path = os.path.join(os.path.dirname(out_dir), f"ADD_{part_id_safe}_PLAYLIST.csv")
+        emit((list(playlist_cols), list(zip(*playlist_cols.values()))), playlist_path, "playlist")
+
+        # the same run report as Standard Mode, next to the playlist (or in the bundle)
+        report.info["playlist"] = playlist_path
+        if archive is not None:
+            archive.add_bytes(report_path_for(playlist_path), report.to_json().encode("utf-8"))
+        else:
+            report.write(report_path_for(playlist_path))
+
+    celebrate_success(out_dir, archive.path if archive is not None else playlist_path)
 
 
 def run() -> None:
@@ -444,16 +1103,15 @@ def run() -> None:
         console.print("No file selected. Exiting.", style="red")
         return
 
-    # Detect & confirm type using first file
-    try:
-        df11_detect = read_excel_normalized(first_path)
-        detected = detect_type_from_df(df11_detect)
-    except Exception:
-        detected = "variant"
-    import_type = prompt_type(detected)
+    stream = False
+    if os.path.getsize(first_path) >= STREAM_THRESHOLD_BYTES:
+        stream = inquirer.confirm(message="Large source file. Use low-memory streaming mode?", default=True).execute()
 
     # Operation selection (after file so context exists)
     operation = prompt_operation()
+    sheets = prompt_sheets(first_path) if operation in ("add", "delete") else None
+    if sheets:
+        console.print("Each sheet is built in its own worker process; Part and category files are not created for multi-sheet builds.", style="cyan")
 
     # Files list (may be expanded if 'both')
     files: List[str] = [first_path]
@@ -482,14 +1140,55 @@ def run() -> None:
                 return
             files = [del_path, first_path]
 
-    # Recompute df11_detect if needed (for 'both' we always base on first file)
+    elif operation == "delta":
+        first_role = inquirer.select(
+            message="How should the selected file be used?",
+            choices=[
+                {"name": "Use as PREVIOUS snapshot", "value": "previous"},
+                {"name": "Use as CURRENT snapshot", "value": "current"},
+            ],
+            default="current",
+        ).execute()
+        other = "CURRENT" if first_role == "previous" else "PREVIOUS"
+        console.print(Panel.fit(f"Select the {other} Excel file", border_style="yellow"))
+        other_path = pick_excel_file(title=f"Select {other} Excel file")
+        if not other_path:
+            console.print("No file selected. Exiting.", style="red")
+            return
+        files = [first_path, other_path] if first_role == "previous" else [other_path, first_path]
+        # the diff needs both snapshots in memory
+        stream = False
+
+    # Detect & confirm type once every file is known, from the add side (the only file, the ADD file of
+    # "both", the current snapshot of "delta"): its UD09 values are prompted for and saved to the sort store,
+    # the same records batch.stored_ud09_sort saves
     try:
-        df11_detect = read_excel_normalized(files[0])
+        df11_detect = load_detect_frame(files[-1], stream, sheets)
+        detected = detect_type_from_df(df11_detect)
     except Exception:
-        pass
+        detected = "variant"
+    import_type = prompt_type(detected)
+
+    from .validation import check_sources
+
+    with console.status("Validating source keys..."):
+        validation = check_sources(files, import_type, mode="warn", stream=stream, sheets=sheets)
+    if not review_validation(validation):
+        console.print("Cancelled.", style="yellow")
+        return
 
     include_tables = prompt_tables(import_type)
 
+    shard_rows = None
+    if stream or len(df11_detect) > DEFAULT_SHARD_ROWS:
+        shard_input = inquirer.text(
+            message="Rows per output file (blank = one file per table):",
+            default=str(DEFAULT_SHARD_ROWS),
+            validate=lambda v: not v.strip() or (v.strip().isdigit() and int(v) > 0),
+            invalid_message="Enter a positive whole number or leave blank",
+        ).execute().strip()
+        shard_rows = int(shard_input) if shard_input else None
+
     part_enabled = False
     variant_parent = ""
     website = ""
@@ -498,17 +1197,22 @@ def run() -> None:
     prod_code = ""
     cat_opts: Dict[str, str] | None = None
     ud09_sort_map = None
+    sort_keys = None
     
     if operation != "delete":
-        if import_type == "variant":
+        if import_type in ("variant", "mixed"):
             # Select UD09 sort order BEFORE other prompts
-            ud09_sort_map = prompt_variant_ud09_sort(df11_detect["Key3"].dropna().astype(str).tolist())
+            sort_keys, saved_sort = load_saved_ud09_sort(df11_detect, import_type)
+            if import_type == "mixed":
+                ud09_sort_map = prompt_mixed_ud09_sort(df11_detect, saved_sort)
+            else:
+                ud09_sort_map = prompt_variant_ud09_sort(df11_detect["Key3"].dropna().astype(str).tolist(), saved_sort)
             # Part first so we have the parent ID
-            part_enabled = inquirer.confirm(message="Create Part file?", default=True).execute()
+            part_enabled = operation != "delta" and not sheets and inquirer.confirm(message="Create Part file?", default=True).execute()
             if part_enabled:
                 variant_parent, is_new, part_desc, prod_code, website = prompt_part_details()
             # Category step (optional) – now we can use the parent
-            if inquirer.confirm(message="Work with categories?", default=True).execute():
+            if operation != "delta" and not sheets and inquirer.confirm(message="Work with categories?", default=True).execute():
                 cat_type = inquirer.select(
                     message="Category type:",
                     choices=[
@@ -524,9 +1228,12 @@ def run() -> None:
                 ).execute().strip()
                 cat_list = [cat.strip() for cat in cat_input.split("\n") if cat.strip()]
                 cat_opts = {"website": cat_site, "categories": cat_list, "is_new": cat_type == "new"}
+                if not variant_parent:
+                    cat_opts["parent_part"] = inquirer.text(message="Parent Part ID for category (blank = child parts only):").execute().strip()
         else:
             # Select UD09 sort order for attributes
-            ud09_sort_map = prompt_attribute_ud09_sort(df11_detect["Key2"].dropna().astype(str).tolist())
+            sort_keys, saved_sort = load_saved_ud09_sort(df11_detect, import_type)
+            ud09_sort_map = prompt_attribute_ud09_sort(df11_detect["Key2"].dropna().astype(str).tolist(), saved_sort)
 
     # Prepare category flags for summary
     cat_enabled = bool(cat_opts)
@@ -534,41 +1241,16 @@ def run() -> None:
     cat_list = cat_opts.get("categories", []) if cat_enabled else []
     cat_is_new = cat_opts.get("is_new", False) if cat_enabled else False
 
-    if not show_summary(operation, files, import_type, include_tables, part_enabled, variant_parent, website, is_new, part_desc, prod_code, cat_enabled, cat_site, cat_list, cat_is_new):
+    if not show_summary(operation, files, import_type, include_tables, part_enabled, variant_parent, website, is_new, part_desc, prod_code, cat_enabled, cat_site, cat_list, cat_is_new, shard_rows, sheets):
         console.print("Cancelled.", style="yellow")
         return
+    if sort_keys is not None:
+        save_ud09_sort(sort_keys, import_type, ud09_sort_map)
 
-    playlist_entries: List[Tuple[str, str]] = []  # (filepath, op)
-    playlist_dir = None
-
-    # Execute runs
-    if operation == "add":
-        stem, written = process_single(files[0], import_type, include_tables, part_enabled, variant_parent, website, is_new, part_desc, ud09_sort_map, cat_opts, prod_code)
-        playlist_dir = os.path.dirname(list(written.values())[0]) if written else os.path.dirname(files[0])
-        for path in written.values():
-            playlist_entries.append((path, "add"))
-    elif operation == "delete":
-        stem, written = process_single(files[0], import_type, include_tables, False, variant_parent, website, False, "", ud09_sort_map, cat_opts, "")
-        playlist_dir = os.path.dirname(list(written.values())[0]) if written else os.path.dirname(files[0])
-        for path in written.values():
-            playlist_entries.append((path, "delete"))
-    else:  # both
-        # delete first
-        del_stem, del_written = process_single(files[0], import_type, include_tables, False, variant_parent, website, False, "", ud09_sort_map, cat_opts, "")
-        # add second (Part only on add)
-        add_stem, add_written = process_single(files[1], import_type, include_tables, part_enabled, variant_parent, website, is_new, part_desc, ud09_sort_map, cat_opts, prod_code)
-        playlist_dir = os.path.dirname(list(del_written.values())[0]) if del_written else os.path.dirname(files[0])
-        for path in del_written.values():
-            playlist_entries.append((path, "delete"))
-        for path in add_written.values():
-            playlist_entries.append((path, "add"))
-
-    # Build playlist
-    playlist_stem = build_playlist_name(operation, files)
-    include_for_playlist = include_tables.copy()
-    df_playlist = build_playlist_df(playlist_entries, include_for_playlist)
-    playlist_path = os.path.join(os.path.dirname(playlist_dir), f"{playlist_stem}_PLAYLIST.csv") if playlist_dir else os.path.join(os.path.dirname(files[0]), f"{playlist_stem}_PLAYLIST.csv")
-    df_playlist.to_csv(playlist_path, index=False, encoding='utf-8-sig')
+    playlist_dir, playlist_path = run_operation(
+        operation, files, import_type, include_tables, part_enabled, variant_parent, website,
+        is_new, part_desc, prod_code, ud09_sort_map, cat_opts, stream=stream, shard_rows=shard_rows, sheets=sheets,
+    )
 
     celebrate_success(playlist_dir, playlist_path)
 
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Tuple
+
+from .io_utils import ENGINES, list_sheets, resolve_engine, write_csv
+from .sort_store import VALUE_COLS, default_store_path
+from .validation import VALIDATION_MODES, ValidationError, check_sources
+
+
+OPERATIONS = {"add", "delete", "both", "delta"}
+TYPES = {"auto", "variant", "attribute", "mixed"}
+DEFAULT_TABLES = {
+    "variant": ["UD08", "UD09", "UD10", "UD11"],
+    "attribute": ["UD09", "UD10", "UD11"],
+    "mixed": ["UD08", "UD09", "UD10", "UD11"],
+}
+
+
+def load_manifest(path: str) -> dict:
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, "r", encoding="utf-8") as fh:
+        if ext in (".yml", ".yaml"):
+            try:
+                import yaml
+            except Exception:
+                raise ValueError("PyYAML is required for YAML manifests (pip install pyyaml).")
+            data = yaml.safe_load(fh)
+        else:
+            data = json.load(fh)
+    if isinstance(data, list):
+        data = {"jobs": data}
+    if not isinstance(data, dict) or not isinstance(data.get("jobs"), list):
+        raise ValueError("Manifest must contain a 'jobs' list.")
+    return data
+
+
+def normalize_job(job: dict, index: int, base_dir: str, output_dir: str | None = None) -> dict:
+    """Fill in defaults for one manifest job and resolve its paths."""
+    files = job.get("files") or ([job["file"]] if job.get("file") else [])
+    files = [f if os.path.isabs(f) else os.path.join(base_dir, f) for f in files]
+    operation = job.get("operation", "add")
+    import_type = job.get("type", "auto")
+    name = job.get("name") or (os.path.splitext(os.path.basename(files[0]))[0] if files else f"job{index + 1}")
+
+    if job.get("validation", "warn") not in VALIDATION_MODES:
+        raise ValueError(f"Job '{name}': unknown validation mode '{job['validation']}'.")
+    if operation not in OPERATIONS:
+        raise ValueError(f"Job '{name}': unknown operation '{operation}'.")
+    if import_type not in TYPES:
+        raise ValueError(f"Job '{name}': unknown type '{import_type}'.")
+    engine = job.get("engine")
+    if engine is not None and engine not in ENGINES:
+        raise ValueError(f"Job '{name}': unknown engine '{engine}'.")
+    if engine == "arrow" and job.get("stream"):
+        raise ValueError(f"Job '{name}': engine 'arrow' and stream cannot be combined.")
+    needed = 2 if operation in ("both", "delta") else 1
+    if len(files) != needed:
+        raise ValueError(f"Job '{name}': operation '{operation}' needs {needed} file(s).")
+
+    part = job.get("part") or {}
+    categories = job.get("categories") or {}
+    # "all" or a list of sheet names: each sheet builds as its own source
+    sheets = job.get("sheets") or None
+    if sheets is not None:
+        if sheets != "all" and not (isinstance(sheets, list) and all(isinstance(s, str) for s in sheets)):
+            raise ValueError(f"Job '{name}': sheets must be \"all\" or a list of sheet names.")
+        if operation not in ("add", "delete"):
+            raise ValueError(f"Job '{name}': sheets can only be built with operation 'add' or 'delete'.")
+        if part or categories:
+            raise ValueError(f"Job '{name}': part and categories cannot be combined with sheets.")
+    cat_opts = None
+    if categories and operation in ("add", "both"):
+        cat_opts = {
+            "website": categories.get("website", ""),
+            "categories": list(categories.get("list", [])),
+            "is_new": bool(categories.get("is_new", False)),
+        }
+        if categories.get("parent_part"):
+            cat_opts["parent_part"] = categories["parent_part"]
+
+    # true = the shared store in the user's profile, a string = that SQLite file
+    sort_store = job.get("sort_store")
+    if sort_store is True:
+        sort_store = default_store_path()
+    elif sort_store and not os.path.isabs(sort_store):
+        sort_store = os.path.join(base_dir, sort_store)
+
+    # a mixed job can order each partition on its own: {"variant": {...}, "attribute": {...}}
+    ud09_sort = job.get("ud09_sort") or {}
+    if ud09_sort and all(isinstance(order, dict) for order in ud09_sort.values()):
+        if set(ud09_sort) - set(VALUE_COLS):
+            raise ValueError(f"Job '{name}': ud09_sort partitions must be 'variant' and/or 'attribute'.")
+        ud09_sort = {kind: {str(k): int(v) for k, v in order.items()} for kind, order in ud09_sort.items()}
+    else:
+        ud09_sort = {str(k): int(v) for k, v in ud09_sort.items()}
+
+    job_output = job.get("output_dir") or output_dir
+    if job_output and not os.path.isabs(job_output):
+        job_output = os.path.join(base_dir, job_output)
+
+    return {
+        "name": name,
+        "files": files,
+        "operation": operation,
+        "type": import_type,
+        "tables": job.get("tables"),
+        "ud09_sort": ud09_sort,
+        "sort_store": sort_store or None,
+        "part_enabled": bool(part) and operation in ("add", "both"),
+        "variant_parent": part.get("parent", ""),
+        "is_new": bool(part.get("is_new", False)),
+        "part_desc": part.get("description", ""),
+        "prod_code": part.get("prod_code", ""),
+        "website": part.get("website", "SA"),
+        "cat_opts": cat_opts,
+        "stream": bool(job.get("stream", False)),
+        "engine": engine,
+        "sheets": sheets,
+        "sheet_workers": int(job["sheet_workers"]) if job.get("sheet_workers") else None,
+        "validation": job.get("validation", "warn"),
+        "shard_rows": int(job["shard_rows"]) if job.get("shard_rows") else None,
+        "output_dir": job_output,
+        # None leaves it to DMT_BUNDLE
+        "bundle": bool(job["bundle"]) if job.get("bundle") is not None else None,
+        "bundle_dest": job.get("bundle_dest") or None,
+    }
+
+
+def stored_ud09_sort(job: dict, import_type: str, sheets: List[str] | None = None) -> Dict[str, int]:
+    """The job's ``ud09_sort`` on top of the orders its sort store already knows; explicit entries are saved back."""
+    from .app import load_detect_frame
+    from .sort_store import stored_sort_map
+
+    # UD09 is built from the add side: the only file, the add file of "both", the current file of "delta"
+    return stored_sort_map(load_detect_frame(job["files"][-1], job["stream"], sheets), import_type, job["ud09_sort"], job["sort_store"])
+
+
+def run_job(job: dict) -> dict:
+    # deferred so importing batch stays light; each worker imports the app on its first job
+    import pandas as pd
+
+    from .app import detect_type_from_df, run_operation
+    from .source_cache import read_source, read_source_table
+
+    started = time.perf_counter()
+    row = {
+        "Job": job["name"],
+        "Status": "ok",
+        "Operation": job["operation"],
+        "Type": job["type"],
+        "Files": ";".join(job["files"]),
+        "Playlist": "",
+        "Outputs": "",
+        "Validation": "",
+        "Seconds": 0.0,
+        "Error": "",
+    }
+    try:
+        sheets = list_sheets(job["files"][0]) if job["sheets"] == "all" else job["sheets"]
+        import_type = job["type"]
+        if import_type == "auto":
+            # detected on the add side, like the UD09 sort (the current snapshot of a delta), over every
+            # selected sheet as the wizard does: variant sheets next to an attribute sheet build as mixed
+            if resolve_engine(job["engine"]) == "arrow":
+                # only Key1 leaves Arrow
+                detect = [read_source_table(job["files"][-1], sheet).select(["Key1"]).to_pandas() for sheet in sheets or [None]]
+            else:
+                detect = [read_source(job["files"][-1], sheet)[["Key1"]] for sheet in sheets or [None]]
+            import_type = detect_type_from_df(pd.concat(detect, ignore_index=True))
+            row["Type"] = import_type
+        tables = set(job["tables"] or DEFAULT_TABLES[import_type])
+        try:
+            validation = check_sources(job["files"], import_type, job["validation"], job["stream"], job["output_dir"], sheets, job["sheet_workers"])
+        except ValidationError as exc:
+            row["Validation"] = ";".join(exc.report_paths)
+            raise
+        row["Validation"] = ";".join(report for _issues, report in validation.values() if report)
+        ud09_sort = job["ud09_sort"]
+        if job["sort_store"] and job["operation"] != "delete":
+            ud09_sort = stored_ud09_sort(job, import_type, sheets)
+        playlist_dir, playlist_path = run_operation(
+            job["operation"], job["files"], import_type, tables,
+            job["part_enabled"] and import_type in ("variant", "mixed"), job["variant_parent"], job["website"],
+            job["is_new"], job["part_desc"], job["prod_code"],
+            ud09_sort if job["operation"] != "delete" else None,
+            job["cat_opts"], stream=job["stream"], output_base=job["output_dir"], show_progress=False,
+            shard_rows=job["shard_rows"], sheets=sheets, workers=job["sheet_workers"], engine=job["engine"],
+            bundle=job["bundle"], bundle_dest=job["bundle_dest"],
+        )
+        row["Playlist"] = playlist_path
+        row["Outputs"] = playlist_dir or ""
+    except Exception as exc:
+        row["Status"] = "failed"
+        row["Error"] = f"{type(exc).__name__}: {exc}"
+    row["Seconds"] = round(time.perf_counter() - started, 3)
+    return row
+
+
+def run_manifest(path: str, workers: int | None = None, summary_path: str | None = None) -> Tuple[str, List[dict]]:
+    import pandas as pd
+
+    manifest = load_manifest(path)
+    base_dir = os.path.dirname(os.path.abspath(path))
+    output_dir = manifest.get("output_dir")
+    if output_dir and not os.path.isabs(output_dir):
+        output_dir = os.path.join(base_dir, output_dir)
+    jobs = [normalize_job(job, i, base_dir, output_dir) for i, job in enumerate(manifest["jobs"])]
+    workers = workers or manifest.get("workers") or os.cpu_count() or 1
+
+    results: Dict[int, dict] = {}
+    if workers <= 1 or len(jobs) <= 1:
+        for i, job in enumerate(jobs):
+            results[i] = run_job(job)
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            futures = {pool.submit(run_job, job): i for i, job in enumerate(jobs)}
+            for fut in as_completed(futures):
+                results[futures[fut]] = fut.result()
+
+    # keep manifest order in the summary regardless of completion order
+    rows: List[dict] = [results[i] for i in range(len(jobs))]
+    if summary_path is None:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        summary_path = os.path.join(output_dir or base_dir, f"{stem}_SUMMARY.csv")
+    os.makedirs(os.path.dirname(summary_path) or ".", exist_ok=True)
+    write_csv(pd.DataFrame(rows, columns=list(rows[0].keys()) if rows else None), summary_path)
+    return summary_path, rows
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run DMT builds headlessly from a job manifest.")
+    parser.add_argument("manifest", help="JSON or YAML manifest with a 'jobs' list")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: CPU count)")
+    parser.add_argument("--summary", default=None, help="summary CSV path (default: <manifest>_SUMMARY.csv)")
+    args = parser.parse_args(argv)
+
+    summary_path, rows = run_manifest(args.manifest, args.workers, args.summary)
+    failed = sum(1 for row in rows if row["Status"] != "ok")
+    print(f"{len(rows)} job(s), {failed} failed. Summary: {summary_path}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
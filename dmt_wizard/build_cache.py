@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Tuple
+
+from .io_utils import write_csv
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+BUILD_CACHE_ENV = "DMT_BUILD_CACHE"
+# part of every options hash: bump whenever the builders' output for the same inputs changes
+MANIFEST_VERSION = 1
+HASH_BLOCK = 1 << 20
+
+
+def cache_enabled() -> bool:
+    return os.environ.get(BUILD_CACHE_ENV, "").strip().lower() not in ("0", "off", "false", "no")
+
+
+def manifest_path(out_dir: str, stem: str) -> str:
+    return os.path.join(out_dir, f"{stem}_MANIFEST.json")
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(HASH_BLOCK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def temp_path(path: str) -> str:
+    # per process: two batch jobs that share an output folder must not replace each other's half-written files
+    return f"{path}.{os.getpid()}.tmp"
+
+
+def options_digest(options: Dict) -> str:
+    text = json.dumps(options, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _replace_if_changed(tmp: str, path: str, same: Callable[[], bool]) -> bool:
+    try:
+        if same():
+            os.remove(tmp)
+            return False
+        os.replace(tmp, path)
+        return True
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def write_if_changed(df: pd.DataFrame, path: str) -> bool:
+    """Write ``df`` unless ``path`` already holds exactly those bytes; True when the file was (re)written."""
+    tmp = temp_path(path)
+    write_csv(df, tmp)
+    return _replace_if_changed(
+        tmp, path,
+        lambda: os.path.exists(path) and os.path.getsize(path) == os.path.getsize(tmp) and file_digest(path) == file_digest(tmp),
+    )
+
+
+class BuildCache:
+    """Content-addressed manifest of one output folder, kept as ``<stem>_MANIFEST.json``.
+
+    It records the SHA-256 of the source file, a hash of the options each group
+    of tables (``ud``, ``part``, ``categories``) was built with and the SHA-256
+    of every file written. A group whose hash is unchanged and whose files are
+    still intact is not rebuilt; a rebuilt file with the recorded bytes is not
+    rewritten, so its mtime stays put. Disabled, it writes straight through.
+    """
+
+    def __init__(self, out_dir: str, stem: str, source_path: str, sheet: str | None = None, enabled: bool | None = None) -> None:
+        self.out_dir = out_dir
+        self.path = manifest_path(out_dir, stem)
+        self.enabled = cache_enabled() if enabled is None else enabled
+        self.groups: Dict[str, Dict] = {}
+        self.outputs: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._old = self._load() if self.enabled else {}
+        self._old_files = {entry["file"]: entry for entry in self._old.get("outputs", {}).values()}
+        self.source = self._source(source_path, sheet) if self.enabled else {}
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) and data.get("version") == MANIFEST_VERSION else {}
+
+    def _source(self, path: str, sheet: str | None) -> Dict:
+        # an untouched source (same path, size and mtime) keeps its recorded hash instead of being read again
+        st = os.stat(path)
+        entry = {"path": os.path.abspath(path), "sheet": sheet, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        old = self._old.get("source", {})
+        same = all(old.get(k) == entry[k] for k in ("path", "size", "mtime_ns")) and old.get("sha256")
+        entry["sha256"] = old["sha256"] if same else file_digest(path)
+        return entry
+
+    def _intact(self, entry: Dict) -> bool:
+        path = os.path.join(self.out_dir, entry["file"])
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        if st.st_size != entry["size"]:
+            return False
+        if st.st_mtime_ns == entry["mtime_ns"]:
+            return True
+        # touched or copied: only the bytes count
+        if file_digest(path) != entry["sha256"]:
+            return False
+        entry["mtime_ns"] = st.st_mtime_ns
+        return True
+
+    def fresh(self, group: str, options: Dict, want: Callable[[str], bool] = lambda name: True) -> Dict[str, str] | None:
+        """``{key: path}`` of the group's files when its source and options are unchanged and they are intact, else None."""
+        digest = options_digest({"version": MANIFEST_VERSION, "source": self.source.get("sha256"), "sheet": self.source.get("sheet"), **options})
+        self.groups[group] = {"options": digest, "built": []}
+        old = self._old.get("groups", {}).get(group)
+        if not self.enabled or not old or old.get("options") != digest:
+            return None
+        tables = {name for name in old.get("built", []) if want(name)}
+        entries = {key: dict(e) for key, e in self._old.get("outputs", {}).items() if e.get("group") == group and e.get("table") in tables}
+        if {e["table"] for e in entries.values()} != tables or not all(self._intact(e) for e in entries.values()):
+            return None
+        self.groups[group]["built"] = list(old["built"])
+        with self._lock:
+            self.outputs.update(entries)
+        return {key: os.path.join(self.out_dir, e["file"]) for key, e in entries.items()}
+
+    def built(self, group: str, names: Iterable[str]) -> None:
+        self.groups[group]["built"] = list(names)
+
+    def write(self, df: pd.DataFrame, path: str, key: str, group: str, table: str) -> Tuple[int, bool]:
+        """Write one output; returns (bytes, rewritten). Safe to call from writer threads."""
+        if not self.enabled:
+            write_csv(df, path)
+            return os.path.getsize(path), True
+        tmp = temp_path(path)
+        write_csv(df, tmp)
+        return os.path.getsize(tmp), self.commit(tmp, path, key, group, table)
+
+    def commit(self, tmp: str, path: str, key: str, group: str, table: str) -> bool:
+        """Move a finished ``tmp`` file to ``path`` unless ``path`` already has the same bytes; True when replaced."""
+        if not self.enabled:
+            os.replace(tmp, path)
+            return True
+        digest = file_digest(tmp)
+        old = self._old_files.get(os.path.basename(path))
+        rewritten = _replace_if_changed(tmp, path, lambda: bool(old) and old["sha256"] == digest and self._intact(dict(old)))
+        st = os.stat(path)
+        entry = {"file": os.path.basename(path), "group": group, "table": table, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+        with self._lock:
+            self.outputs[key] = entry
+        return rewritten
+
+    def save(self, written: Dict[str, str]) -> None:
+        """Store the manifest for this run's files, in ``written`` order."""
+        if not self.enabled:
+            return
+        data = {
+            "version": MANIFEST_VERSION,
+            "source": self.source,
+            "groups": self.groups,
+            "outputs": {key: self.outputs[key] for key in written if key in self.outputs},
+        }
+        text = json.dumps(data, indent=2)
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                if fh.read() == text:
+                    return
+        except OSError:
+            pass
+        tmp = temp_path(self.path)
+        with open(tmp, "w", encoding="utf-8") as fh:
+            fh.write(text)
+        os.replace(tmp, self.path)
@@ -1,73 +1,187 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
 
+from .io_utils import ATTRIBUTE_KEY1_PREFIX, attribute_rows
+from .records import CATEGORY_LAST_SEGMENT, CATEGORY_SEPARATOR_RUN, CATEGORY_UD08_COLS, CATEGORY_UD11_COLS, pdp_part_rows
+from .sort_store import partition_sort_map
 
-def _ensure_str(df: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
-    out = df.copy()
-    for c in cols:
-        out[c] = out[c].fillna("").astype(str)
-    return out
 
+def _factorize_str(series: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """Integer codes plus string labels, equivalent to ``series.fillna("").astype(str)``."""
+    if not (pd.api.types.is_string_dtype(series) or pd.api.types.is_integer_dtype(series) or pd.api.types.is_bool_dtype(series)):
+        # floats/mixed objects: equal-hashing values (1 vs 1.0) must keep their own str() form
+        series = series.fillna("").astype(str)
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    labels = np.append(np.asarray(pd.Index(uniques).astype(str), dtype=object), "")
+    codes = np.where(codes < 0, len(labels) - 1, codes)
+    # NaN and "" (or 1 and "1") become the same label, so merge their codes
+    label_codes, label_uniques = pd.factorize(labels)
+    return label_codes[codes], np.asarray(label_uniques, dtype=object)
 
-def build_variant_ud_tables(df11: pd.DataFrame, ud09_sort_map: dict[str, int] | None = None) -> dict[str, pd.DataFrame]:
-    df11 = _ensure_str(df11, ["Company", "Key1", "Key2", "Key3", "Key4", "Key5"])
 
-    ud11 = df11[["Company", "Key1", "Key2", "Key3", "Key4", "Key5"]].copy()
+def _dense_codes(combined: np.ndarray, space: int) -> tuple[np.ndarray, int]:
+    # hash-free factorize for a small key space: direct-address table, renumbered by first appearance
+    n = len(combined)
+    first = np.full(space, n, dtype=np.intp)
+    first[combined[::-1]] = np.arange(n - 1, -1, -1, dtype=np.intp)
+    present = np.flatnonzero(first < n)
+    present = present[np.argsort(first[present], kind="stable")]
+    rank = np.empty(space, dtype=np.intp)
+    rank[present] = np.arange(len(present), dtype=np.intp)
+    return rank[combined], len(present)
 
-    ud10 = df11[["Company", "Key1", "Key2", "Key3", "Key5"]].copy()
-    ud10 = ud10.rename(columns={"Key5": "Key4"})
-    ud10["Key5"] = ""
-    ud10 = ud10.drop_duplicates(subset=["Company", "Key1", "Key2", "Key3", "Key4"]).reset_index(drop=True)
-    ud10 = ud10[["Company", "Key1", "Key2", "Key3", "Key4", "Key5"]]
 
-    ud09 = ud10[["Company", "Key1", "Key2", "Key3"]].copy()
-    ud09["Key4"] = ""
-    ud09["Key5"] = ""
-    ud09 = ud09.drop_duplicates(subset=["Company", "Key1", "Key2", "Key3"]).reset_index(drop=True)
-    # Number01 sort order for dropdowns
+class KeyDeriver:
+    """Factorizes key columns once and derives the unique key set for each UD level.
+
+    Each level's rows are the first occurrence of every distinct key tuple, in
+    source order, which is exactly what ``drop_duplicates`` on the stringified
+    columns returns. Columns are factorized on first use and prefix levels are
+    cached, so UD08 -> UD09 -> UD10 only ever combines one new column at a time.
+    """
+
+    def __init__(self, df11: pd.DataFrame) -> None:
+        self.df = df11
+        self.size = len(df11)
+        self._codes: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self._levels: dict[tuple[str, ...], tuple[np.ndarray, int]] = {}
+
+    def _column_codes(self, col: str) -> tuple[np.ndarray, np.ndarray]:
+        if col not in self._codes:
+            self._codes[col] = _factorize_str(self.df[col])
+        return self._codes[col]
+
+    def _level_codes(self, cols: tuple[str, ...]) -> tuple[np.ndarray, int]:
+        if cols in self._levels:
+            return self._levels[cols]
+        child, labels = self._column_codes(cols[-1])
+        if len(cols) == 1:
+            # renumber by first appearance; the blank label may sit last or be unused
+            result = _dense_codes(child, len(labels))
+        else:
+            parent, parent_n = self._level_codes(cols[:-1])
+            child_n = len(labels)
+            space = parent_n * child_n
+            if space <= 4 * self.size + 1_000_000:
+                result = _dense_codes(parent.astype(np.int64) * child_n + child, space)
+            else:
+                if space < 2 ** 62:
+                    combined = parent.astype(np.int64) * child_n + child
+                else:
+                    combined = pd.MultiIndex.from_arrays([parent, child]).to_flat_index()
+                codes, uniques = pd.factorize(combined)
+                result = (codes, len(uniques))
+        self._levels[cols] = result
+        return result
+
+    def group_codes(self, cols: list[str]) -> tuple[np.ndarray, int]:
+        # dense per-row code of the key tuple (numbered by first appearance) and the group count
+        return self._level_codes(tuple(cols))
+
+    def unique_rows(self, cols: list[str]) -> np.ndarray:
+        # factorize numbers groups in order of first appearance, so first indices come out sorted;
+        # scattering row numbers in reverse leaves each group's smallest row (O(n), no sort)
+        codes, n = self._level_codes(tuple(cols))
+        first = np.empty(n, dtype=np.intp)
+        first[codes[::-1]] = np.arange(self.size - 1, -1, -1, dtype=np.intp)
+        return first
+
+    def values(self, col: str, rows: np.ndarray) -> np.ndarray:
+        codes, labels = self._column_codes(col)
+        return labels.take(codes[rows])
+
+    def frame(self, cols: dict[str, str], rows: np.ndarray) -> pd.DataFrame:
+        # cols maps output column -> source column; object dtype skips per-value string inference
+        return pd.DataFrame({out: self.values(src, rows) for out, src in cols.items()}, dtype=object)
+
+    def full_frame(self, cols: list[str]) -> pd.DataFrame:
+        out = {}
+        for c in cols:
+            series = self.df[c]
+            if pd.api.types.is_string_dtype(series) and series.dtype != object:
+                # native string columns only need their blanks filled
+                out[c] = series.fillna("").reset_index(drop=True)
+            else:
+                codes, labels = self._column_codes(c)
+                out[c] = pd.Series(labels.take(codes), dtype=object)
+        return pd.DataFrame(out)
+
+
+def _assign_number01(ud09: pd.DataFrame, value_col: str, ud09_sort_map: dict[str, int] | None, start: int = 0) -> pd.DataFrame:
+    # Number01 sort order for dropdowns; unmapped values count on from ``start`` at least
     if ud09_sort_map:
-        ud09["Number01"] = ud09["Key3"].map(ud09_sort_map)
+        ud09["Number01"] = ud09[value_col].map(ud09_sort_map)
     # assign default order for any missing/unmapped values
     if "Number01" not in ud09.columns:
-        ud09["Number01"] = range(1, len(ud09) + 1)
+        ud09["Number01"] = range(start + 1, start + len(ud09) + 1)
     else:
-        # fill any NaNs with sequential order after mapped max
-        max_mapped = int(pd.to_numeric(ud09["Number01"], errors="coerce").fillna(0).max())
+        # fill any NaNs with sequential order after mapped max (an empty table has nothing to fill)
+        mapped = pd.to_numeric(ud09["Number01"], errors="coerce").fillna(0)
+        max_mapped = max(int(mapped.max()) if len(mapped) else 0, start)
         missing_mask = ud09["Number01"].isna()
         if missing_mask.any():
             fill_vals = list(range(max_mapped + 1, max_mapped + 1 + missing_mask.sum()))
             ud09.loc[missing_mask, "Number01"] = fill_vals
     # ensure integer dtype
     ud09["Number01"] = pd.to_numeric(ud09["Number01"], errors="coerce").fillna(0).astype(int)
+    return ud09
+
+
+def renumber_ud09(ud09: pd.DataFrame, import_type: str, ud09_sort_map: dict[str, int] | None, start: int = 0) -> pd.DataFrame:
+    """A variant or attribute UD09 table with Number01 assigned afresh; unmapped values count on from ``start``."""
+    value_col = "Key3" if import_type == "variant" else "Key2"
+    return _assign_number01(ud09.drop(columns=["Number01"], errors="ignore"), value_col, ud09_sort_map, start)
+
+
+UD11_COLS = ["Company", "Key1", "Key2", "Key3", "Key4", "Key5"]
+
+
+def build_variant_ud_tables(df11: pd.DataFrame, ud09_sort_map: dict[str, int] | None = None) -> dict[str, pd.DataFrame]:
+    keys = KeyDeriver(df11)
+
+    ud11 = keys.full_frame(UD11_COLS)
+
+    # UD10: unique by Key5 (renamed to Key4) under its UD09 parent
+    rows = keys.unique_rows(["Company", "Key1", "Key2", "Key3", "Key5"])
+    ud10 = keys.frame({"Company": "Company", "Key1": "Key1", "Key2": "Key2", "Key3": "Key3", "Key4": "Key5"}, rows)
+    ud10["Key5"] = ""
+
+    rows = keys.unique_rows(["Company", "Key1", "Key2", "Key3"])
+    ud09 = keys.frame({"Company": "Company", "Key1": "Key1", "Key2": "Key2", "Key3": "Key3"}, rows)
+    ud09["Key4"] = ""
+    ud09["Key5"] = ""
+    ud09 = _assign_number01(ud09, "Key3", ud09_sort_map)
     ud09 = ud09[["Company", "Key1", "Key2", "Key3", "Key4", "Key5", "Number01"]]
 
-    ud08 = ud09[["Company", "Key1", "Key2"]].copy()
+    rows = keys.unique_rows(["Company", "Key1", "Key2"])
+    ud08 = keys.frame({"Company": "Company", "Key1": "Key1", "Key2": "Key2"}, rows)
     ud08["Key3"] = ""
     ud08["Key4"] = ""
     ud08["Key5"] = ""
     ud08["Character01"] = ud08["Key2"]
     ud08["Checkbox01"] = True
-    ud08 = ud08.drop_duplicates(subset=["Company", "Key1", "Key2"]).reset_index(drop=True)
-    ud08 = ud08[["Company", "Key1", "Key2", "Key3", "Key4", "Key5", "Character01", "Checkbox01"]]
 
     return {"UD11": ud11, "UD10": ud10, "UD09": ud09, "UD08": ud08}
 
 
 def build_attribute_ud_tables(df11: pd.DataFrame, ud09_sort_map: dict[str, int] | None = None) -> dict[str, pd.DataFrame]:
-    df11 = _ensure_str(df11, ["Company", "Key1", "Key2", "Key3", "Key4", "Key5"])
+    keys = KeyDeriver(df11)
 
-    ud11 = df11[["Company", "Key1", "Key2", "Key3", "Key4", "Key5"]].copy()
+    ud11 = keys.full_frame(UD11_COLS)
 
-    ud10 = df11[["Company", "Key1", "Key2", "Key3"]].copy()
+    rows = keys.unique_rows(["Company", "Key1", "Key2", "Key3"])
+    ud10 = keys.frame({"Company": "Company", "Key1": "Key1", "Key2": "Key2", "Key3": "Key3"}, rows)
     ud10["Key4"] = ""
     ud10["Key5"] = ""
     ud10["Character01"] = ud10["Key3"]
     ud10["Checkbox01"] = True
-    ud10 = ud10.drop_duplicates(subset=["Company", "Key1", "Key2", "Key3"]).reset_index(drop=True)
-    ud10 = ud10[["Company", "Key1", "Key2", "Key3", "Key4", "Key5", "Character01", "Checkbox01"]]
 
-    ud09 = df11[["Company", "Key1", "Key2"]].copy()
+    rows = keys.unique_rows(["Company", "Key1", "Key2"])
+    ud09 = keys.frame({"Company": "Company", "Key1": "Key1", "Key2": "Key2"}, rows)
     ud09["Key3"] = ""
     ud09["Key4"] = ""
     ud09["Key5"] = ""
@@ -77,22 +191,7 @@ def build_attribute_ud_tables(df11: pd.DataFrame, ud09_sort_map: dict[str, int]
     ud09["Checkbox03"] = True
     ud09["Checkbox04"] = True
     ud09["Checkbox05"] = True
-    ud09 = ud09.drop_duplicates(subset=["Company", "Key1", "Key2"]).reset_index(drop=True)
-    # Number01 sort order for dropdowns
-    if ud09_sort_map:
-        ud09["Number01"] = ud09["Key2"].map(ud09_sort_map)
-    # assign default order for any missing/unmapped values
-    if "Number01" not in ud09.columns:
-        ud09["Number01"] = range(1, len(ud09) + 1)
-    else:
-        # fill any NaNs with sequential order after mapped max
-        max_mapped = int(pd.to_numeric(ud09["Number01"], errors="coerce").fillna(0).max())
-        missing_mask = ud09["Number01"].isna()
-        if missing_mask.any():
-            fill_vals = list(range(max_mapped + 1, max_mapped + 1 + missing_mask.sum()))
-            ud09.loc[missing_mask, "Number01"] = fill_vals
-    # ensure integer dtype
-    ud09["Number01"] = pd.to_numeric(ud09["Number01"], errors="coerce").fillna(0).astype(int)
+    ud09 = _assign_number01(ud09, "Key2", ud09_sort_map)
     ud09 = ud09[[
         "Company", "Key1", "Key2", "Key3", "Key4", "Key5",
         "Character01", "Checkbox01", "Checkbox02", "Checkbox03", "Checkbox04", "Checkbox05", "Number01",
@@ -101,14 +200,263 @@ def build_attribute_ud_tables(df11: pd.DataFrame, ud09_sort_map: dict[str, int]
     return {"UD11": ud11, "UD10": ud10, "UD09": ud09}
 
 
+# output name prefix of each partition of a mixed source: <stem>_Variant_UD08.csv, <stem>_Attribute_UD09.csv, ...
+MIXED_PREFIXES = {"variant": "Variant_", "attribute": "Attribute_"}
+
+
+def split_by_type(df11: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """Variant and attribute rows of a source, each in source order."""
+    attr = attribute_rows(df11["Key1"])
+    return {
+        "variant": df11.loc[~attr].reset_index(drop=True),
+        "attribute": df11.loc[attr].reset_index(drop=True),
+    }
+
+
+def build_mixed_ud_tables(parts: dict[str, pd.DataFrame], ud09_sort_map: dict[str, int] | None = None) -> dict[str, pd.DataFrame]:
+    """UD tables of every non-empty partition from ``split_by_type``, built side by side.
+
+    Table names carry the partition prefix (``Variant_UD11``, ``Attribute_UD09``)
+    so both sets can share one output folder. Each partition is numbered from
+    its own order (``sort_store.partition_sort_map``).
+    """
+    build = {"variant": build_variant_ud_tables, "attribute": build_attribute_ud_tables}
+    with ThreadPoolExecutor(max_workers=len(MIXED_PREFIXES)) as pool:
+        futures = {kind: pool.submit(build[kind], df, partition_sort_map(ud09_sort_map, kind)) for kind, df in parts.items() if not df.empty}
+    out: dict[str, pd.DataFrame] = {}
+    for kind, fut in futures.items():
+        for name, tbl in fut.result().items():
+            out[f"{MIXED_PREFIXES[kind]}{name}"] = tbl
+    return out
+
+
+def build_ud_tables(df11: pd.DataFrame, import_type: str, ud09_sort_map: dict[str, int] | None = None) -> tuple[dict[str, pd.DataFrame], pd.DataFrame]:
+    """UD tables of a source of any type, plus the rows its Part and categories are built from."""
+    if import_type == "mixed":
+        parts = split_by_type(df11)
+        return build_mixed_ud_tables(parts, ud09_sort_map), parts["variant"]
+    build = build_variant_ud_tables if import_type == "variant" else build_attribute_ud_tables
+    return build(df11, ud09_sort_map), df11
+
+
+def part_source(df11: pd.DataFrame, import_type: str) -> pd.DataFrame:
+    # Part and categories belong to the variant rows
+    return split_by_type(df11)["variant"] if import_type == "mixed" else df11
+
+
+def _key_codes(table, cols: list[str] = UD11_COLS):
+    # integer codes per key column: grouping on them is about twice as fast as grouping on the strings
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    return pa.table({col: pc.dictionary_encode(table.column(col).combine_chunks()).indices for col in cols})
+
+
+def _first_rows(codes, cols: list[str]) -> np.ndarray:
+    # row number of the first occurrence of every distinct key tuple, ascending (= drop_duplicates order)
+    import pyarrow as pa
+
+    indexed = codes.select(cols).append_column("_row", pa.array(np.arange(codes.num_rows, dtype=np.int64)))
+    first = indexed.group_by(cols, use_threads=False).aggregate([("_row", "min")])
+    return np.sort(first.column("_row_min").to_numpy())
+
+
+def _arrow_frame(table, cols: dict[str, str], rows: np.ndarray, blank: tuple[str, ...] = (), extra: dict | None = None) -> dict:
+    # cols maps output column -> source column, like KeyDeriver.frame; blank columns are "", extra are constants or source columns
+    import pyarrow as pa
+
+    picked = table.take(pa.array(rows))
+    n = picked.num_rows
+    out = {out_col: picked.column(src) for out_col, src in cols.items()}
+    for col in blank:
+        out[col] = pa.nulls(n, pa.string()).fill_null("")
+    for col, value in (extra or {}).items():
+        out[col] = pa.nulls(n, pa.bool_()).fill_null(value) if isinstance(value, bool) else picked.column(value)
+    return out
+
+
+def _arrow_number01(values, ud09_sort_map: dict[str, int] | None):
+    # same numbering as _assign_number01: mapped values keep theirs, the rest count on from the largest, in order
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    n = len(values)
+    if not ud09_sort_map:
+        return pa.array(np.arange(1, n + 1, dtype=np.int64))
+    keys = pa.array(list(ud09_sort_map), pa.string())
+    numbers = pd.to_numeric(pd.Series(list(ud09_sort_map.values()), dtype=object), errors="coerce").fillna(0).to_numpy(dtype=float)
+    found = pc.fill_null(pc.index_in(values, value_set=keys), -1).to_numpy()
+    missing = found < 0
+    out = numbers[np.where(missing, 0, found)]
+    if missing.any():
+        top = max(int(out[~missing].max()) if (~missing).any() else 0, 0)
+        out[missing] = top + np.arange(1, missing.sum() + 1)
+    return pa.array(out.astype(np.int64))
+
+
+def _arrow_attribute_rows(table):
+    import pyarrow.compute as pc
+
+    return pc.starts_with(pc.utf8_lower(pc.utf8_trim_whitespace(table.column("Key1"))), ATTRIBUTE_KEY1_PREFIX)
+
+
+def build_ud_tables_arrow(table, import_type: str, ud09_sort_map: dict[str, int] | None = None) -> dict:
+    """``engine="arrow"`` counterpart of the UD builders: the same tables as pyarrow Tables.
+
+    ``table`` holds the six key columns as text (``io_utils.text_column``), so
+    grouping compares exactly the strings the pandas builders compare; every
+    projection is a group-by plus a ``take``, and no row becomes a Python object.
+    A ``mixed`` source is split by Key1 and both partitions build side by side.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if import_type == "mixed":
+        attr = _arrow_attribute_rows(table)
+        parts = {"variant": table.filter(pc.invert(attr)), "attribute": table.filter(attr)}
+        with ThreadPoolExecutor(max_workers=len(MIXED_PREFIXES)) as pool:
+            futures = {kind: pool.submit(build_ud_tables_arrow, part, kind, partition_sort_map(ud09_sort_map, kind)) for kind, part in parts.items() if part.num_rows}
+        return {f"{MIXED_PREFIXES[kind]}{name}": tbl for kind, fut in futures.items() for name, tbl in fut.result().items()}
+
+    out = {"UD11": table.select(UD11_COLS)}
+    key = {c: c for c in UD11_COLS}
+    codes = _key_codes(table)
+    if import_type == "variant":
+        rows = _first_rows(codes, ["Company", "Key1", "Key2", "Key3", "Key5"])
+        out["UD10"] = pa.table(_arrow_frame(table, {"Company": "Company", "Key1": "Key1", "Key2": "Key2", "Key3": "Key3", "Key4": "Key5"}, rows, ("Key5",)))
+
+        rows = _first_rows(codes, ["Company", "Key1", "Key2", "Key3"])
+        ud09 = _arrow_frame(table, {c: key[c] for c in UD11_COLS[:4]}, rows, ("Key4", "Key5"))
+        ud09["Number01"] = _arrow_number01(ud09["Key3"], ud09_sort_map)
+        out["UD09"] = pa.table(ud09)
+
+        rows = _first_rows(codes, ["Company", "Key1", "Key2"])
+        out["UD08"] = pa.table(_arrow_frame(table, {c: key[c] for c in UD11_COLS[:3]}, rows, ("Key3", "Key4", "Key5"), {"Character01": "Key2", "Checkbox01": True}))
+        return out
+
+    rows = _first_rows(codes, ["Company", "Key1", "Key2", "Key3"])
+    out["UD10"] = pa.table(_arrow_frame(table, {c: key[c] for c in UD11_COLS[:4]}, rows, ("Key4", "Key5"), {"Character01": "Key3", "Checkbox01": True}))
+
+    rows = _first_rows(codes, ["Company", "Key1", "Key2"])
+    checks = {f"Checkbox0{i}": True for i in range(1, 6)}
+    ud09 = _arrow_frame(table, {c: key[c] for c in UD11_COLS[:3]}, rows, ("Key3", "Key4", "Key5"), {"Character01": "Key2", **checks})
+    ud09["Number01"] = _arrow_number01(ud09["Key2"], ud09_sort_map)
+    out["UD09"] = pa.table(ud09)
+    return out
+
+
+def part_source_arrow(table, import_type: str) -> pd.DataFrame:
+    """The rows ``build_part_table`` and ``child_part_nums`` look at, as a small pandas frame.
+
+    Only the first row of every (Company, Key4) plus row 0 (the parent's Key2)
+    are taken, so both give the same result as on the whole source.
+    """
+    import pyarrow.compute as pc
+
+    if import_type == "mixed":
+        table = table.filter(pc.invert(_arrow_attribute_rows(table)))
+    if not table.num_rows:
+        return pd.DataFrame(columns=["Company", "Key2", "Key4"])
+    rows = np.union1d(_first_rows(_key_codes(table, ["Company", "Key4"]), ["Company", "Key4"]), [0])
+    return table.select(["Company", "Key2", "Key4"]).take(rows).to_pandas()
+
+
+class StreamingTableBuilder:
+    """Builds the UD tables from a stream of source chunks.
+
+    ``feed`` returns each chunk's UD11 rows so the caller can write them straight
+    out; the derived tables only ever hold unique key rows, so memory is bounded
+    by chunk size plus key cardinality rather than by file size.
+    """
+
+    KEY_COLS = ["Company", "Key1", "Key2", "Key3", "Key4", "Key5"]
+
+    def __init__(self, import_type: str, ud09_sort_map: dict[str, int] | None = None) -> None:
+        self.import_type = import_type
+        self.ud09_sort_map = ud09_sort_map
+        self.rows = 0
+        self.first_company = ""
+        self._derived: dict[str, pd.DataFrame] = {}
+        self._part_src: pd.DataFrame | None = None
+
+    def feed(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        if self.import_type == "variant":
+            dfs = build_variant_ud_tables(chunk)
+        else:
+            dfs = build_attribute_ud_tables(chunk)
+        ud11 = dfs.pop("UD11")
+        if self.rows == 0 and not ud11.empty:
+            self.first_company = ud11["Company"].iloc[0]
+        self.rows += len(ud11)
+
+        dfs["UD09"] = dfs["UD09"].drop(columns=["Number01"])
+        for name, tbl in dfs.items():
+            prev = self._derived.get(name)
+            merged = tbl if prev is None else pd.concat([prev, tbl], ignore_index=True)
+            self._derived[name] = merged.drop_duplicates(subset=self.KEY_COLS).reset_index(drop=True)
+
+        part_src = ud11[["Company", "Key2", "Key4"]].drop_duplicates()
+        if self._part_src is not None:
+            part_src = pd.concat([self._part_src, part_src], ignore_index=True).drop_duplicates()
+        self._part_src = part_src.reset_index(drop=True)
+        return ud11
+
+    def finish(self) -> dict[str, pd.DataFrame]:
+        if not self._derived:
+            empty = pd.DataFrame(columns=self.KEY_COLS)
+            if self.import_type == "variant":
+                dfs = build_variant_ud_tables(empty, self.ud09_sort_map)
+            else:
+                dfs = build_attribute_ud_tables(empty, self.ud09_sort_map)
+            dfs.pop("UD11")
+            return dfs
+        out = dict(self._derived)
+        value_col = "Key3" if self.import_type == "variant" else "Key2"
+        out["UD09"] = _assign_number01(out["UD09"].copy(), value_col, self.ud09_sort_map)
+        return out
+
+    def part_source(self) -> pd.DataFrame:
+        # unique (Company, Key2, Key4) rows in first-seen order; enough for build_part_table
+        if self._part_src is None:
+            return pd.DataFrame(columns=["Company", "Key2", "Key4"])
+        return self._part_src
+
+
+PART_BASE_COLS = [
+    "Company", "PartNum",
+    "Character05", "Character06", "Character08",
+    "Checkbox11", "Character10", "Character11", "Character12", "Character13",
+]
+PART_NEW_COLS = ["PartDescription", "ClassID", "ProdCode", "UserChar1"]
+
+
 def build_part_table(df11: pd.DataFrame, variant_parent: str, website: str, is_new: bool, part_desc: str, prod_code: str) -> pd.DataFrame:
-    df11 = _ensure_str(df11, ["Company", "Key2", "Key4"])  # only the needed columns
+    keys = KeyDeriver(df11)
 
-    rows = []
+    # child rows: first occurrence of each (Company, Key4), blank part numbers dropped
+    rows = keys.unique_rows(["Company", "Key4"])
+    part_nums = keys.values("Key4", rows)
+    rows = rows[part_nums != ""]
+    part_nums = part_nums[part_nums != ""]
 
+    child = {
+        "Company": keys.values("Company", rows),
+        "PartNum": part_nums,
+        "Character05": part_nums,
+        "Character06": "",
+        "Character08": "",
+        "Checkbox11": True,
+        "Character10": keys.values("Key2", rows),
+        "Character11": variant_parent,
+        "Character12": "show",
+        "Character13": website,
+    }
+    parent = None
     if is_new:
-        first_key2 = df11["Key2"].iloc[0] if not df11.empty else ""
-        rows.append({
+        # New part defaults (children)
+        child.update({"PartDescription": part_desc, "ClassID": "FG", "ProdCode": prod_code, "UserChar1": "Introduction"})
+        first_key2 = keys.values("Key2", np.zeros(1, dtype=np.intp))[0] if keys.size else ""
+        parent = {
             "Company": "SAINC",
             "PartNum": variant_parent,
             "Character05": variant_parent,
@@ -124,108 +472,82 @@ def build_part_table(df11: pd.DataFrame, variant_parent: str, website: str, is_n
             "ClassID": "FG",
             "ProdCode": prod_code,
             "UserChar1": "Introduction",
-        })
-
-    child = df11[["Company", "Key2", "Key4"]].rename(columns={"Key4": "PartNum"}).copy()
-    child = child[child["PartNum"].astype(str) != ""]
-    child = child.drop_duplicates(subset=["Company", "PartNum"]).reset_index(drop=True)
-    if not child.empty:
-        child["Character05"] = child["PartNum"]
-        child["Character06"] = ""
-        child["Character08"] = ""
-        child["Checkbox11"] = True
-        child["Character10"] = child["Key2"]
-        child["Character11"] = variant_parent
-        child["Character12"] = "show"
-        child["Character13"] = website
-        if is_new:
-            # New part defaults (children)
-            child["PartDescription"] = part_desc
-            child["ClassID"] = "FG"
-            child["ProdCode"] = prod_code
-            child["UserChar1"] = "Introduction"
-        child = child[[
-            "Company", "PartNum",
-            # Optional new part block (will be added later if requested)
-            "Character05", "Character06", "Character08",
-            "Checkbox11", "Character10", "Character11", "Character12", "Character13",
-            *(["PartDescription", "ClassID", "ProdCode", "UserChar1"] if is_new else []),
-        ]]
-        rows.extend(child.to_dict(orient="records"))
-
-    base_cols = [
-        "Company", "PartNum",
-        "Character05", "Character06", "Character08",
-        "Checkbox11", "Character10", "Character11", "Character12", "Character13",
-    ]
-    extra_cols = ["PartDescription", "ClassID", "ProdCode", "UserChar1"] if is_new else []
-    all_cols = base_cols + extra_cols
-    df_part = pd.DataFrame(rows, columns=all_cols)
-    return df_part
+        }
 
+    all_cols = PART_BASE_COLS + (PART_NEW_COLS if is_new else [])
+    data = {}
+    for col in all_cols:
+        dtype = bool if col == "Checkbox11" else object
+        values = child[col]
+        if not isinstance(values, np.ndarray):
+            values = np.full(len(rows), values, dtype=dtype)
+        if parent is not None:
+            values = np.concatenate([np.array([parent[col]], dtype=dtype), values])
+        data[col] = pd.Series(values, dtype=dtype)
+    return pd.DataFrame(data, columns=all_cols)
 
-def build_category_ud08(company: str, website: str, category_string: str) -> pd.DataFrame:
-    parent = "-".join([seg for seg in str(category_string).split("-") if seg][: -1]) if "-" in str(category_string) else ""
-    df = pd.DataFrame([
-        {
-            "Company": company or "SAINC",
-            "Key1": "Category",
-            "Key2": website,
-            "Key3": category_string,
-            "Key4": parent,
-            "Key5": "",
-            "Character01": "COPY NEEDED",
-            "Character04": "COPY NEEDED",
-        }
-    ])
-    return df[["Company", "Key1", "Key2", "Key3", "Key4", "Key5", "Character01", "Character04"]]
 
+def category_parent_paths(categories: pd.Series) -> pd.Series:
+    # records.category_parent_path's patterns, column-wise
+    normalized = categories.astype(str).str.replace(CATEGORY_SEPARATOR_RUN, "-", regex=True).str.strip("-")
+    return normalized.str.replace(CATEGORY_LAST_SEGMENT, "", regex=True)
 
-def build_category_ud11_for_parent(company: str, parent_part_num: str, website: str, category_string: str) -> pd.DataFrame:
-    if not company:
-        company = "SAINC"
-    data = [{
-        "Company": company,
+
+def child_part_nums(df11: pd.DataFrame) -> np.ndarray:
+    keys = KeyDeriver(df11)
+    part_nums = keys.values("Key4", keys.unique_rows(["Key4"]))
+    return part_nums[part_nums != ""]
+
+
+def category_part_nums(df11: pd.DataFrame, parent_part: str = "") -> np.ndarray:
+    """Parts every category is assigned to: the parent (if any) first, then every child part."""
+    parts = child_part_nums(df11)
+    if parent_part:
+        parts = np.concatenate([np.array([parent_part], dtype=object), parts[parts != parent_part]])
+    return parts
+
+
+def build_category_tables(company: str, website: str, categories: list[str], part_nums: list[str] | np.ndarray) -> dict[str, pd.DataFrame]:
+    """UD08 definitions for every category plus the categories x parts UD11 assignment matrix.
+
+    UD11 rows are grouped by category, in the order given, with every part under each one.
+    """
+    company = company or "SAINC"
+    cats = pd.Series(list(categories), dtype=object)
+    parts = np.asarray(part_nums, dtype=object)
+
+    ud08 = pd.DataFrame({
+        "Company": pd.Series(np.full(len(cats), company, dtype=object), dtype=object),
+        "Key1": "Category",
+        "Key2": website,
+        "Key3": cats,
+        "Key4": category_parent_paths(cats).astype(object),
+        "Key5": "",
+        "Character01": "COPY NEEDED",
+        "Character04": "COPY NEEDED",
+    }, columns=CATEGORY_UD08_COLS)
+
+    n = len(cats) * len(parts)
+    ud11 = pd.DataFrame({
+        "Company": pd.Series(np.full(n, company, dtype=object), dtype=object),
         "Key1": "Category",
         "Key2": website,
-        "Key3": category_string,
-        "Key4": parent_part_num,
+        "Key3": pd.Series(np.repeat(cats.to_numpy(dtype=object), len(parts)), dtype=object),
+        "Key4": pd.Series(np.tile(parts, len(cats)), dtype=object),
         "Key5": "",
-    }]
-    return pd.DataFrame(data, columns=["Company", "Key1", "Key2", "Key3", "Key4", "Key5"])
+    }, columns=CATEGORY_UD11_COLS)
 
+    return {"UD08": ud08, "UD11": ud11}
 
-def build_single_pdp_part(company: str, part_id: str, is_new: bool, part_desc: str, prod_code: str, website: str) -> pd.DataFrame:
-    if not company:
-        company = "SAINC"
-    
-    row = {
-        "Company": company,
-        "PartNum": part_id,
-        "Character05": part_id,
-        "Character06": "",
-        "Character08": "",
-        "Checkbox11": True,
-        "Character10": "",
-        "Character11": "",
-        "Character12": "show",
-        "Character13": website,
-    }
-    
-    if is_new:
-        row["PartDescription"] = part_desc
-        row["ClassID"] = "FG"
-        row["ProdCode"] = prod_code
-        row["UserChar1"] = "Introduction"
-    
-    base_cols = [
-        "Company", "PartNum",
-        "Character05", "Character06", "Character08",
-        "Checkbox11", "Character10", "Character11", "Character12", "Character13",
-    ]
-    extra_cols = ["PartDescription", "ClassID", "ProdCode", "UserChar1"] if is_new else []
-    all_cols = base_cols + extra_cols
-    
-    return pd.DataFrame([row], columns=all_cols)
+
+def build_category_ud08(company: str, website: str, category_string: str) -> pd.DataFrame:
+    return build_category_tables(company, website, [category_string], [])["UD08"]
 
 
+def build_category_ud11_for_parent(company: str, parent_part_num: str, website: str, category_string: str) -> pd.DataFrame:
+    return build_category_tables(company, website, [category_string], [parent_part_num])["UD11"]
+
+
+def build_single_pdp_part(company: str, part_id: str, is_new: bool, part_desc: str, prod_code: str, website: str) -> pd.DataFrame:
+    cols, rows = pdp_part_rows(company, part_id, is_new, part_desc, prod_code, website)
+    return pd.DataFrame(rows, columns=cols)
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import os
+import shutil
+import tempfile
+import threading
+import zipfile
+from typing import TYPE_CHECKING, List
+
+from .records import write_rows_csv
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+BUNDLE_ENV = "DMT_BUNDLE"
+BUNDLE_DEST_ENV = "DMT_BUNDLE_DEST"
+PLAYLIST_SUFFIX = "_PLAYLIST.csv"
+
+
+def bundle_enabled(bundle: bool | None = None) -> bool:
+    if bundle is not None:
+        return bundle
+    return os.environ.get(BUNDLE_ENV, "").strip().lower() in ("1", "on", "true", "yes", "zip")
+
+
+def bundle_dest(dest: str | None = None) -> str | None:
+    return dest or os.environ.get(BUNDLE_DEST_ENV) or None
+
+
+class ZipBundle:
+    """Every output of a run written into one zip archive, in one pass.
+
+    Files are added as they finish, under their path relative to ``root`` (the
+    folder the playlist would go to), so the destination sees a single file
+    create instead of one per table. Playlist ``Source`` paths point into the
+    archive (relative to its root) or, with ``dest``, to where it will be
+    extracted. Streamed tables are spooled in a local scratch folder first.
+    Use as a context manager: the archive appears on success and is discarded
+    on error.
+    """
+
+    def __init__(self, path: str, root: str, dest: str | None = None) -> None:
+        self.path = path
+        self.root = root or os.curdir
+        self.dest = dest
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._tmp = f"{path}.tmp"
+        self._zip = zipfile.ZipFile(self._tmp, "w", zipfile.ZIP_DEFLATED)
+        self._lock = threading.Lock()
+        self.scratch = tempfile.mkdtemp(prefix="dmt_bundle_")
+
+    def __enter__(self) -> ZipBundle:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def arcname(self, path: str) -> str:
+        return os.path.relpath(path, self.root).replace(os.sep, "/")
+
+    def source_path(self, path: str) -> str:
+        """Where a file will be found by DMT: inside the extracted folder, or relative to the archive root."""
+        rel = os.path.relpath(path, self.root)
+        return os.path.join(self.dest, rel) if self.dest else rel
+
+    def add_bytes(self, path: str, data: bytes) -> int:
+        with self._lock:
+            self._zip.writestr(self.arcname(path), data)
+        return len(data)
+
+    def add_file(self, local_path: str, path: str) -> int:
+        """Move a finished local file into the archive as ``path``."""
+        size = os.path.getsize(local_path)
+        with self._lock:
+            self._zip.write(local_path, self.arcname(path))
+        os.remove(local_path)
+        return size
+
+    def write(self, df: pd.DataFrame, path: str) -> int:
+        from .io_utils import encode_csv
+
+        return self.add_bytes(path, encode_csv(df))
+
+    def close(self) -> None:
+        self._zip.close()
+        os.replace(self._tmp, self.path)
+        shutil.rmtree(self.scratch, ignore_errors=True)
+
+    def abort(self) -> None:
+        self._zip.close()
+        if os.path.exists(self._tmp):
+            os.remove(self._tmp)
+        shutil.rmtree(self.scratch, ignore_errors=True)
+
+
+def extract_bundle(path: str, dest: str | None = None) -> List[str]:
+    """Unpack a bundle into ``dest`` (default: the archive's folder); returns the playlist paths.
+
+    Relative playlist ``Source`` paths are rewritten to the extracted files;
+    absolute ones (a bundle built for this ``dest``) are left as they are.
+    """
+    # absolute, so the rewritten Source paths do not depend on the caller's working folder
+    dest = os.path.abspath(dest) if dest else os.path.dirname(os.path.abspath(path))
+    playlists = []
+    with zipfile.ZipFile(path) as zf:
+        for info in zf.infolist():
+            target = os.path.realpath(os.path.join(dest, info.filename))
+            if not target.startswith(os.path.realpath(dest) + os.sep):
+                raise ValueError(f"{path}: entry '{info.filename}' would extract outside {dest}.")
+        zf.extractall(dest)
+        names = [name for name in zf.namelist() if "/" not in name and name.endswith(PLAYLIST_SUFFIX)]
+    for name in names:
+        playlist = os.path.join(dest, name)
+        with open(playlist, "r", encoding="utf-8-sig", newline="") as fh:
+            rows = list(csv.reader(io.StringIO(fh.read())))
+        if not rows:
+            continue
+        source = rows[0].index("Source")
+        for row in rows[1:]:
+            if not os.path.isabs(row[source]):
+                row[source] = os.path.join(dest, row[source])
+        write_rows_csv(rows[0], rows[1:], playlist)
+        playlists.append(playlist)
+    return playlists
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Extract a DMT zip bundle and point its playlist at the extracted files.")
+    parser.add_argument("bundle", help="zip written with DMT_BUNDLE=1 or a job's bundle option")
+    parser.add_argument("--dest", default=None, help="folder to extract into (default: the bundle's folder)")
+    args = parser.parse_args(argv)
+
+    for playlist in extract_bundle(args.bundle, args.dest):
+        print(playlist)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
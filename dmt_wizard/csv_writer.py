@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import csv
+import functools
+import io
+import os
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from .io_utils import is_arrow_table
+
+
+CSV_BACKEND_ENV = "DMT_CSV_BACKEND"
+BACKENDS = ("auto", "arrow", "pandas")
+ARROW_CHUNK_ROWS = 500_000
+UTF8_BOM = b"\xef\xbb\xbf"
+
+_quote_chars: str | None = None
+
+
+def _needs_quote_chars() -> str:
+    # ask the csv module (which DataFrame.to_csv uses) which characters force quoting,
+    # since line-terminator handling differs between platforms and Python versions
+    global _quote_chars
+    if _quote_chars is None:
+        chars = ""
+        for ch in ',"\r\n':
+            buf = io.StringIO()
+            csv.writer(buf, lineterminator=os.linesep).writerow([f"a{ch}b", "x"])
+            if buf.getvalue().startswith('"'):
+                chars += ch
+        _quote_chars = chars
+    return _quote_chars
+
+
+def _quote_name(name: str) -> str:
+    if any(ch in name for ch in _needs_quote_chars()):
+        return '"' + name.replace('"', '""') + '"'
+    return name
+
+
+def _arrow_available() -> bool:
+    try:
+        import pyarrow.compute  # noqa: F401
+    except Exception:
+        return False
+    return True
+
+
+def arrow_supported(df: pd.DataFrame) -> bool:
+    """True when every column is text, integer or plain bool, i.e. formatting we reproduce exactly."""
+    if df.shape[1] < 2 or not all(isinstance(c, str) for c in df.columns):
+        # to_csv quotes empty fields in single-column files; leave that to pandas
+        return False
+    for _, s in df.items():
+        if isinstance(s.dtype, np.dtype) and s.dtype.kind in "biu":
+            continue
+        if pd.api.types.is_string_dtype(s.dtype) and pd.api.types.infer_dtype(s, skipna=True) in ("string", "empty"):
+            continue
+        return False
+    return True
+
+
+def resolve_backend(df: pd.DataFrame, backend: str | None = None) -> str:
+    backend = backend or os.environ.get(CSV_BACKEND_ENV, "auto")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown CSV backend '{backend}'. Expected one of: {', '.join(BACKENDS)}.")
+    if backend == "pandas":
+        return "pandas"
+    if _arrow_available() and arrow_supported(df):
+        return "arrow"
+    if backend == "arrow":
+        raise ValueError("The arrow CSV backend needs pyarrow and text/integer/bool columns.")
+    return "pandas"
+
+
+def _encode_column(s: pd.Series):
+    import pyarrow as pa
+
+    if s.dtype == bool or s.dtype.kind in "iu":
+        return _encode_array(pa.array(s.to_numpy()))
+    return _encode_array(pa.array(s, from_pandas=True))
+
+
+def _encode_array(arr):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if isinstance(arr, pa.ChunkedArray):
+        arr = arr.combine_chunks()
+    if pa.types.is_boolean(arr.type):
+        return pc.if_else(arr, "True", "False").cast(pa.large_string())
+    if pa.types.is_integer(arr.type):
+        return pc.cast(arr, pa.large_string())
+
+    arr = pc.fill_null(arr.cast(pa.large_string()), "")
+    # one plain substring scan per special character is several times faster than a regex class
+    needs_quote = functools.reduce(pc.or_, [pc.match_substring(arr, ch) for ch in _needs_quote_chars()])
+    if not pc.any(needs_quote).as_py():
+        return arr
+    quote = pa.scalar('"', pa.large_string())
+    quoted = pc.binary_join_element_wise(quote, pc.replace_substring(arr, '"', '""'), quote, pa.scalar("", pa.large_string()))
+    return pc.if_else(needs_quote, quoted, arr)
+
+
+def iter_arrow_csv(df: pd.DataFrame, header: bool = True, chunk_rows: int = ARROW_CHUNK_ROWS) -> Iterator[memoryview | bytes]:
+    """Encode a frame as CSV bytes with Arrow compute kernels, byte-identical to ``to_csv(index=False)``.
+
+    Each chunk's rows are assembled column-wise and handed out as one slice of
+    Arrow's contiguous string buffer, so no per-row Python objects are created.
+    ``df`` may also be a pyarrow Table (``engine="arrow"``), written as is.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    table = is_arrow_table(df)
+    eol = os.linesep
+    if header:
+        names = df.column_names if table else df.columns
+        yield (",".join(_quote_name(c) for c in names) + eol).encode("utf-8")
+
+    for start in range(0, len(df), chunk_rows):
+        if table:
+            cols = [_encode_array(arr) for arr in df.slice(start, chunk_rows).columns]
+        else:
+            cols = [_encode_column(s) for _, s in df.iloc[start:start + chunk_rows].items()]
+        rows = pc.binary_join_element_wise(*cols, pa.scalar(",", pa.large_string()))
+        # joining (row, "") with the line terminator appends it to every row
+        lines = pc.binary_join_element_wise(rows, pa.scalar("", pa.large_string()), pa.scalar(eol, pa.large_string()))
+        offsets = np.frombuffer(lines.buffers()[1], dtype=np.int64)
+        begin = int(offsets[lines.offset])
+        end = int(offsets[lines.offset + len(lines)])
+        yield memoryview(lines.buffers()[2])[begin:end]
+
+
+def write_csv_arrow(df: pd.DataFrame, path: str, header: bool = True, append: bool = False) -> None:
+    with open(path, "ab" if append else "wb") as fh:
+        if not append:
+            fh.write(UTF8_BOM)
+        for block in iter_arrow_csv(df, header=header):
+            fh.write(block)
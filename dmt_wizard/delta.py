@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .builders import MIXED_PREFIXES, KeyDeriver, UD11_COLS, build_attribute_ud_tables, build_variant_ud_tables, renumber_ud09, split_by_type
+from .sort_store import partition_sort_map
+
+
+def anti_join(left: pd.DataFrame, right: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
+    """Rows of ``left`` whose ``cols`` tuple (compared as text) never occurs in ``right``, in order."""
+    both = pd.concat([left[cols], right[cols]], ignore_index=True)
+    codes, n = KeyDeriver(both).group_codes(cols)
+    in_right = np.zeros(n, dtype=bool)
+    in_right[codes[len(left):]] = True
+    keep = ~in_right[codes[:len(left)]]
+    return left.loc[keep].reset_index(drop=True)
+
+
+def diff_ud11(prev_df: pd.DataFrame, curr_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Removed and added UD11 key tuples between two normalized sources (unique, first-seen order)."""
+    both = pd.concat([prev_df[UD11_COLS], curr_df[UD11_COLS]], ignore_index=True)
+    keys = KeyDeriver(both)
+    codes, n = keys.group_codes(UD11_COLS)
+    first = keys.unique_rows(UD11_COLS)
+
+    n_prev = len(prev_df)
+    in_curr = np.zeros(n, dtype=bool)
+    in_curr[codes[n_prev:]] = True
+    # a tuple present in prev is first seen in prev; anything first seen later is new
+    removed = first[(first < n_prev) & ~in_curr[codes[first]]]
+    added = first[first >= n_prev]
+    cols = {c: c for c in UD11_COLS}
+    return keys.frame(cols, removed), keys.frame(cols, added)
+
+
+def build_delta(
+    prev_df: pd.DataFrame,
+    curr_df: pd.DataFrame,
+    import_type: str,
+    ud09_sort_map: Dict[str, int] | None = None,
+) -> Dict[str, Dict[str, pd.DataFrame]]:
+    """DELETE and ADD table sets that move Epicor from the previous snapshot to the current one.
+
+    The builders run on the removed and added UD11 rows only. A derived
+    UD10/UD09/UD08 row is deleted only when no current row still maps to it,
+    and added only when the previous snapshot did not already produce it.
+    New UD09 values missing from ``ud09_sort_map`` are numbered after the
+    previous snapshot's, so their Number01 never repeats one already in Epicor.
+    A ``mixed`` pair is diffed per partition, so a row whose Key1 moves between
+    variant and attribute is deleted from one set and added to the other.
+    """
+    if import_type == "mixed":
+        prev_parts, curr_parts = split_by_type(prev_df), split_by_type(curr_df)
+        with ThreadPoolExecutor(max_workers=len(MIXED_PREFIXES)) as pool:
+            futures = {kind: pool.submit(build_delta, prev_parts[kind], curr_parts[kind], kind, partition_sort_map(ud09_sort_map, kind)) for kind in MIXED_PREFIXES}
+        merged: Dict[str, Dict[str, pd.DataFrame]] = {"delete": {}, "add": {}}
+        for kind, fut in futures.items():
+            for op, dfs in fut.result().items():
+                merged[op].update({f"{MIXED_PREFIXES[kind]}{name}": tbl for name, tbl in dfs.items()})
+        return merged
+    build = build_variant_ud_tables if import_type == "variant" else build_attribute_ud_tables
+    removed, added = diff_ud11(prev_df, curr_df)
+
+    del_dfs = build(removed)
+    add_dfs = build(added, ud09_sort_map)
+    for name in list(del_dfs):
+        if name == "UD11":
+            continue
+        if not del_dfs[name].empty:
+            # derived keys still referenced by the current snapshot must survive
+            remaining = _level_keys(curr_df, import_type, name)
+            del_dfs[name] = anti_join(del_dfs[name], remaining, UD11_COLS)
+        if not add_dfs[name].empty:
+            existing = _level_keys(prev_df, import_type, name)
+            add_dfs[name] = anti_join(add_dfs[name], existing, UD11_COLS)
+            if name == "UD09":
+                # unmapped new values count on from the previous snapshot's Number01s instead of from 1
+                previous = renumber_ud09(existing, import_type, ud09_sort_map)
+                top = int(previous["Number01"].max()) if len(previous) else 0
+                add_dfs[name] = renumber_ud09(add_dfs[name], import_type, ud09_sort_map, start=top)
+    return {"delete": del_dfs, "add": add_dfs}
+
+
+def _level_keys(df11: pd.DataFrame, import_type: str, table: str) -> pd.DataFrame:
+    # key columns of one derived table, projected straight from the source
+    keys = KeyDeriver(df11)
+    if import_type == "variant":
+        level = {
+            "UD10": {"Company": "Company", "Key1": "Key1", "Key2": "Key2", "Key3": "Key3", "Key4": "Key5"},
+            "UD09": {"Company": "Company", "Key1": "Key1", "Key2": "Key2", "Key3": "Key3"},
+            "UD08": {"Company": "Company", "Key1": "Key1", "Key2": "Key2"},
+        }[table]
+    else:
+        level = {
+            "UD10": {"Company": "Company", "Key1": "Key1", "Key2": "Key2", "Key3": "Key3"},
+            "UD09": {"Company": "Company", "Key1": "Key1", "Key2": "Key2"},
+        }[table]
+    out = keys.frame(level, keys.unique_rows(list(level.values())))
+    for c in UD11_COLS:
+        if c not in out.columns:
+            out[c] = ""
+    return out[UD11_COLS]
+
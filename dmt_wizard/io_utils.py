@@ -2,9 +2,15 @@ from __future__ import annotations
 
 import os
 import sys
-from typing import Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator, List, Tuple
 
-import pandas as pd
+# pandas (and the Arrow writer) load on first use, so the file pickers and New PDP Mode start fast
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
 
 
 def pick_excel_file(title: str = "Select source file") -> str:
@@ -47,16 +53,62 @@ def pick_output_folder(title: str = "Select output folder") -> str:
     return folder or ""
 
 
-def read_excel_normalized(path: str) -> pd.DataFrame:
+def list_sheets(path: str) -> List[str]:
+    """Sheet names of an Excel workbook in workbook order; empty for CSV."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return []
+    if ext == ".xls":
+        import pandas as pd
+
+        with pd.ExcelFile(path) as book:
+            return [str(name) for name in book.sheet_names]
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True)
+    try:
+        return list(wb.sheetnames)
+    finally:
+        wb.close()
+
+
+def table_of(name: str) -> str:
+    # "Variant_UD09" -> "UD09"; plain table names pass through
+    return name.rsplit("_", 1)[-1]
+
+
+def sheet_stem(stem: str, sheet: str | None) -> str:
+    # each sheet of a workbook builds as its own source: Book_Sheet1_OUTPUT/Book_Sheet1_UD11.csv
+    return stem if sheet is None else f"{stem}_{sanitize_filename(sheet)}"
+
+
+def read_excel_normalized(path: str, sheet: str | None = None) -> pd.DataFrame:
+    import pandas as pd
+
     ext = os.path.splitext(path)[1].lower()
     if ext == ".csv":
         df = pd.read_csv(path)
     else:
-        df = pd.read_excel(path)
-    cols = list(df.columns[:6])
-    if len(cols) < 6 and df.shape[1] >= 6:
-        cols = list(df.columns[:6])
-    if len(cols) != 6:
+        df = pd.read_excel(path, sheet_name=0 if sheet is None else sheet)
+    return normalize_frame(df)
+
+
+def read_buffer_normalized(data: bytes, sheet: str | None = None) -> pd.DataFrame:
+    """Same as ``read_excel_normalized`` for file contents held in memory; ``.xlsx`` is told apart by its zip signature."""
+    import io
+
+    import pandas as pd
+
+    if data[:4] == b"PK\x03\x04":
+        df = pd.read_excel(io.BytesIO(data), sheet_name=0 if sheet is None else sheet)
+    else:
+        df = pd.read_csv(io.BytesIO(data))
+    return normalize_frame(df)
+
+
+def normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """First six columns of a source, renamed to the UD11 schema; extra columns are dropped."""
+    if df.shape[1] < 6:
         raise ValueError("Expected at least 6 columns in the Excel file.")
 
     df = df.iloc[:, :6].copy()
@@ -64,16 +116,463 @@ def read_excel_normalized(path: str) -> pd.DataFrame:
     return df
 
 
+STREAM_CHUNK_ROWS = 100_000
+UD11_COLUMNS = ["Company", "Key1", "Key2", "Key3", "Key4", "Key5"]
+
+# Key1 families starting with this (any case, surrounding spaces ignored) are attributes
+ATTRIBUTE_KEY1_PREFIX = "attr"
+
+
+def attribute_rows(key1: pd.Series) -> np.ndarray:
+    """Boolean array marking attribute rows by their ``Key1``, one factorize over the column."""
+    import numpy as np
+    import pandas as pd
+
+    codes, uniques = pd.factorize(key1)
+    is_attr = pd.Index(uniques).astype(str).str.strip().str.lower().str.startswith(ATTRIBUTE_KEY1_PREFIX)
+    # missing Key1 (code -1) picks the trailing False
+    return np.append(np.asarray(is_attr, dtype=bool), False)[codes]
+
+
+def detect_type_from_df(df11: pd.DataFrame) -> str:
+    key1_series = df11["Key1"].dropna().astype(str).str.strip()
+    key1_series = key1_series[key1_series != ""]
+    if key1_series.empty:
+        return "variant"
+    attr = attribute_rows(key1_series)
+    if attr.all():
+        return "attribute"
+    # both kinds of Key1 family: each partition goes to its own builder
+    return "mixed" if attr.any() else "variant"
+
+
+ENGINE_ENV = "DMT_ENGINE"
+ENGINES = ("pandas", "arrow")
+
+# pandas.read_csv's default missing-value strings and bool spellings, so the Arrow reader sees the same cells
+CSV_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+CSV_TRUE_VALUES = ["True", "TRUE", "true"]
+CSV_FALSE_VALUES = ["False", "FALSE", "false"]
+
+
+def resolve_engine(engine: str | None = None) -> str:
+    engine = engine or os.environ.get(ENGINE_ENV, "pandas")
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}'. Expected one of: {', '.join(ENGINES)}.")
+    if engine == "arrow":
+        try:
+            import pyarrow.compute  # noqa: F401
+        except Exception:
+            raise ValueError("The arrow engine needs pyarrow.")
+    return engine
+
+
+def is_arrow_table(obj: object) -> bool:
+    # without pyarrow loaded nothing can be a pyarrow Table, so plain pandas runs never import it
+    pa = sys.modules.get("pyarrow")
+    return pa is not None and isinstance(obj, pa.Table)
+
+
+def _infer_csv_values(values, has_missing: bool):
+    """The Arrow type pandas.read_csv would infer for a column, given its distinct raw strings."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if not len(values):
+        # all missing: pandas reads a float column of NaN
+        return values.cast(pa.float64())
+    # pandas parses numbers with surrounding spaces and a leading "+", but not hex
+    trimmed = pc.utf8_trim_whitespace(values)
+    if pc.all(pc.match_substring_regex(trimmed, r"^[+-]?[0-9]+$")).as_py():
+        digits = pc.replace_substring_regex(trimmed, r"^\+", "")
+        for int_type in (pa.int64(), pa.uint64()):
+            try:
+                ints = pc.cast(digits, int_type)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                continue
+            # a missing cell turns an integer column into floats
+            return ints.cast(pa.float64()) if has_missing else ints
+    try:
+        return pc.cast(trimmed, pa.float64())
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        pass
+    if pc.all(pc.is_in(values, value_set=pa.array(CSV_TRUE_VALUES + CSV_FALSE_VALUES))).as_py():
+        return pc.is_in(values, value_set=pa.array(CSV_TRUE_VALUES))
+    return values
+
+
+def _csv_text_column(arr):
+    # type inference and formatting run on the distinct values only, then map back to the rows
+    import pyarrow.compute as pc
+
+    encoded = pc.dictionary_encode(arr)
+    typed = _infer_csv_values(encoded.dictionary, arr.null_count > 0)
+    if typed is encoded.dictionary:
+        return pc.fill_null(arr, "")
+    return pc.fill_null(text_column(typed).take(encoded.indices), "")
+
+
+def text_column(arr):
+    """Arrow string column with the text the pandas builders derive from a column (``str(value)``, missing -> "")."""
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    if isinstance(arr, pa.ChunkedArray):
+        arr = arr.combine_chunks()
+    if pa.types.is_string(arr.type) or pa.types.is_large_string(arr.type):
+        out = arr
+    elif pa.types.is_integer(arr.type):
+        out = pc.cast(arr, pa.string())
+    elif pa.types.is_boolean(arr.type):
+        out = pc.if_else(arr, "True", "False")
+    else:
+        # floats, dates, ...: format each distinct value the way Python does (1.0 -> "1.0")
+        encoded = pc.dictionary_encode(arr)
+        labels = encoded.dictionary.to_pandas().astype(object)
+        labels = pa.array(np.array([str(v) for v in labels], dtype=object), pa.string())
+        out = labels.take(encoded.indices)
+    return pc.fill_null(out.cast(pa.string()), "")
+
+
+def read_csv_arrow(path: str):
+    """First six columns of a CSV source as an Arrow table of text, matching ``read_excel_normalized``."""
+    import csv
+
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    with open(path, newline="", encoding="utf-8-sig") as fh:
+        header = next(csv.reader(fh), [])
+    if len(header) < 6:
+        raise ValueError("Expected at least 6 columns in the Excel file.")
+    # positional names: the header may repeat or leave out names, and only the position matters
+    names = [f"c{i}" for i in range(len(header))]
+    table = pacsv.read_csv(
+        path,
+        read_options=pacsv.ReadOptions(column_names=names, skip_rows=1),
+        parse_options=pacsv.ParseOptions(newlines_in_values=True),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=names[:6],
+            column_types={name: pa.string() for name in names[:6]},
+            null_values=CSV_NA_VALUES,
+            strings_can_be_null=True,
+        ),
+    )
+    return pa.table({col: _csv_text_column(table.column(i).combine_chunks()) for i, col in enumerate(UD11_COLUMNS)})
+
+
+def iter_source_chunks(path: str, chunksize: int = STREAM_CHUNK_ROWS, sheet: str | None = None) -> Iterator[pd.DataFrame]:
+    """Yield the first six columns of a source as normalized string chunks.
+
+    CSV uses the pandas chunked reader and ``.xlsx`` uses openpyxl's read-only row
+    iterator, so only one chunk is ever held in memory. Legacy ``.xls`` files have
+    no streaming reader and are loaded in one piece (still only six columns).
+    ``sheet`` picks a worksheet by name (default: the first one).
+
+    pandas types a column over all of its cells (one blank cell turns an integer
+    column into floats, ``1`` -> ``1.0``), so a streamed source takes two passes:
+    the first collects each column's distinct cells and types them with the same
+    pandas parser, the second maps every cell to that text. Once a column turns
+    out to be text its strings are kept as they are and only its other cells
+    (numbers, bools, dates) are still collected. The second pass re-reads a CSV
+    and replays an ``.xlsx`` from a local spool file, so openpyxl parses it once.
+    """
+    import pandas as pd
+
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".xls":
+        try:
+            df = pd.read_excel(path, sheet_name=0 if sheet is None else sheet, usecols=range(6))
+        except ValueError:
+            raise ValueError("Expected at least 6 columns in the Excel file.")
+        if df.shape[1] != 6:
+            raise ValueError("Expected at least 6 columns in the Excel file.")
+        df.columns = UD11_COLUMNS
+        # the whole sheet is in memory, so its columns already have their final types
+        text = pd.DataFrame({col: df[col].fillna("").astype(str).where(df[col].notna(), None) for col in UD11_COLUMNS}, dtype=object)
+        for start in range(0, len(text), chunksize):
+            yield text.iloc[start:start + chunksize]
+        return
+
+    csv_source = ext == ".csv"
+    parse = _parse_csv_cells if csv_source else _parse_excel_cells
+    # distinct cells per column in first-seen order; Excel cells are keyed by (type, value) so 1, 1.0 and True stay apart
+    seen: List[dict] = [{} for _ in UD11_COLUMNS]
+    is_text = [False] * len(UD11_COLUMNS)
+    missing = [False] * len(UD11_COLUMNS)
+    with _chunk_replay(path, ext, chunksize, sheet) as (first_pass, second_pass):
+        for raw in first_pass:
+            for i, col in enumerate(UD11_COLUMNS):
+                present = raw[col][raw[col].notna()]
+                missing[i] = missing[i] or len(present) < len(raw)
+                if is_text[i] and csv_source:
+                    continue
+                if csv_source:
+                    cells = dict.fromkeys(pd.unique(present))
+                    new = {k: k for k in cells if k not in seen[i]}
+                else:
+                    new = {}
+                    for value in present.tolist():
+                        if not (is_text[i] and isinstance(value, str)) and (type(value), value) not in seen[i]:
+                            new[(type(value), value)] = value
+                if new and not is_text[i] and parse(list(new.values())).dtype.kind == "O":
+                    # cells pandas cannot read as numbers, bools or dates make the whole column text
+                    is_text[i] = True
+                    seen[i] = {k: v for k, v in seen[i].items() if not isinstance(v, str)}
+                    new = {k: v for k, v in new.items() if not isinstance(v, str)}
+                seen[i].update(new)
+
+        text_of: List[dict] = []
+        for i in range(len(UD11_COLUMNS)):
+            keys, values = list(seen[i]), list(seen[i].values())
+            if is_text[i]:
+                # a trailing string keeps them in a text column, where pandas still reads some of them differently
+                typed = parse(values + ["text"])
+            elif values:
+                typed = parse(values + ([None] if missing[i] else []))
+            else:
+                text_of.append({})
+                continue
+            # the builders' str() of a column: fillna("").astype(str)
+            text_of.append(dict(zip(keys, typed.fillna("").astype(str).tolist())))
+
+        for raw in second_pass():
+            for col, text, mapping in zip(UD11_COLUMNS, is_text, text_of):
+                if csv_source:
+                    # CSV text is already the cell's text
+                    if not text:
+                        raw[col] = raw[col].map(mapping)
+                else:
+                    raw[col] = [
+                        None if v is None else v if text and isinstance(v, str) else mapping[(type(v), v)]
+                        for v in raw[col].tolist()
+                    ]
+            yield raw
+
+
+@contextmanager
+def _chunk_replay(path: str, ext: str, chunksize: int, sheet: str | None):
+    # (first pass, second pass factory) over the raw chunks: a CSV is simply read again,
+    # an .xlsx is pickled chunk by chunk to a temporary file while it is read
+    if ext == ".csv":
+        yield _raw_chunks(path, ext, chunksize, sheet), lambda: _raw_chunks(path, ext, chunksize, sheet)
+        return
+    import pickle
+    import tempfile
+
+    with tempfile.TemporaryFile() as spool:
+        def record():
+            for raw in _raw_chunks(path, ext, chunksize, sheet):
+                pickle.dump(raw, spool, protocol=pickle.HIGHEST_PROTOCOL)
+                yield raw
+
+        def replay():
+            spool.seek(0)
+            while True:
+                try:
+                    yield pickle.load(spool)
+                except EOFError:
+                    return
+
+        yield record(), replay
+
+
+def _parse_csv_cells(values: list) -> pd.Series:
+    # one column of raw CSV text through pandas.read_csv's type inference; None is a blank cell,
+    # and the filler column keeps it from reading as a blank line
+    import csv
+    import io
+
+    import pandas as pd
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for value in values:
+        writer.writerow(["" if value is None else value, ""])
+    buffer.seek(0)
+    return pd.read_csv(buffer, header=None, usecols=[0])[0]
+
+
+def _parse_excel_cells(values: list) -> pd.Series:
+    # one column of openpyxl cells through the parser pandas.read_excel uses (it passes blanks as "");
+    # the filler column keeps a blank cell from reading as a blank line
+    from pandas.io.parsers import TextParser
+
+    return TextParser([["" if value is None else value, ""] for value in values], header=None, usecols=[0]).read()[0]
+
+
+def _raw_chunks(path: str, ext: str, chunksize: int, sheet: str | None) -> Iterator[pd.DataFrame]:
+    # untyped cells: CSV text (missing as NaN) and openpyxl values (missing as None)
+    import pandas as pd
+
+    if ext == ".csv":
+        try:
+            reader = pd.read_csv(path, usecols=range(6), dtype=str, chunksize=chunksize)
+        except ValueError:
+            raise ValueError("Expected at least 6 columns in the Excel file.")
+        for chunk in reader:
+            chunk.columns = UD11_COLUMNS
+            yield chunk
+        return
+
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0] if sheet is None else wb[sheet]
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None or (ws.max_column or 6) < 6:
+            raise ValueError("Expected at least 6 columns in the Excel file.")
+        buf = []
+        blank = 0
+        for row in rows:
+            # like read_excel: blank rows between data rows are kept (cells in any column count), trailing ones are not
+            if all(v is None or v == "" for v in row):
+                blank += 1
+                continue
+            cells = [_excel_cell(v) for v in row[:6]]
+            for cells in [[None] * 6] * blank + [cells + [None] * (6 - len(cells))]:
+                buf.append(cells)
+                if len(buf) >= chunksize:
+                    yield pd.DataFrame(buf, columns=UD11_COLUMNS, dtype=object)
+                    buf = []
+            blank = 0
+        if buf:
+            yield pd.DataFrame(buf, columns=UD11_COLUMNS, dtype=object)
+    finally:
+        wb.close()
+
+
+def _excel_cell(value: object) -> object:
+    # as pandas.read_excel sees a cell: whole-number floats become ints, missing-value strings become missing
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value in CSV_NA_VALUES:
+        return None
+    return value
+
+
 def ensure_output_dir(base_dir: str, name: str) -> str:
     out_dir = os.path.join(base_dir, name)
     os.makedirs(out_dir, exist_ok=True)
     return out_dir
 
 
-def write_csv(df: pd.DataFrame, path: str) -> None:
+def write_csv(df: pd.DataFrame, path: str, backend: str | None = None) -> None:
+    from .csv_writer import resolve_backend, write_csv_arrow
+
+    # same bytes from either backend; "auto" takes the Arrow encoder when pyarrow and the dtypes allow
+    if is_arrow_table(df) or resolve_backend(df, backend) == "arrow":
+        write_csv_arrow(df, path)
+        return
     df.to_csv(path, index=False, encoding='utf-8-sig')
 
 
+def encode_csv(df: pd.DataFrame, backend: str | None = None) -> bytes:
+    """The exact bytes ``write_csv`` would put in a file, without the file."""
+    from .csv_writer import UTF8_BOM, iter_arrow_csv, resolve_backend
+
+    if is_arrow_table(df) or resolve_backend(df, backend) == "arrow":
+        return b"".join([UTF8_BOM, *iter_arrow_csv(df)])
+    return df.to_csv(index=False).encode("utf-8-sig")
+
+
+WRITER_POOL_SIZE = 4
+
+_writer_pool: ThreadPoolExecutor | None = None
+_writer_pool_lock = threading.Lock()
+
+
+def get_writer_pool() -> ThreadPoolExecutor:
+    """Shared, bounded pool for CSV writes so concurrent builds never exceed WRITER_POOL_SIZE open files."""
+    global _writer_pool
+    with _writer_pool_lock:
+        if _writer_pool is None:
+            _writer_pool = ThreadPoolExecutor(max_workers=WRITER_POOL_SIZE, thread_name_prefix="dmt-writer")
+        return _writer_pool
+
+
+def _forget_writer_pool() -> None:
+    # a forked worker (sheets, batch, watch) inherits the pool but not its threads; it starts its own
+    global _writer_pool, _writer_pool_lock
+    _writer_pool = None
+    _writer_pool_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_writer_pool)
+
+
+def append_csv(df: pd.DataFrame, path: str, header: bool) -> None:
+    from .csv_writer import resolve_backend, write_csv_arrow
+
+    # first chunk creates the file (with BOM), later chunks append rows only
+    if header:
+        write_csv(df, path)
+    elif resolve_backend(df) == "arrow":
+        write_csv_arrow(df, path, header=False, append=True)
+    else:
+        df.to_csv(path, mode="a", header=False, index=False, encoding='utf-8')
+
+
+DEFAULT_SHARD_ROWS = 50_000
+
+
+def shard_path(path: str, index: int) -> str:
+    # 1-based, zero-padded so shards sort in import order
+    root, ext = os.path.splitext(path)
+    return f"{root}_{index:04d}{ext}"
+
+
+def split_shards(df: pd.DataFrame, path: str, shard_rows: int | None) -> List[Tuple[str, pd.DataFrame]]:
+    """(path, rows) pairs for one table; tables that fit in one shard keep their plain name."""
+    if not shard_rows or len(df) <= shard_rows:
+        return [(path, df)]
+    if is_arrow_table(df):
+        return [(shard_path(path, i + 1), df.slice(start, shard_rows)) for i, start in enumerate(range(0, len(df), shard_rows))]
+    return [
+        (shard_path(path, i + 1), df.iloc[start:start + shard_rows])
+        for i, start in enumerate(range(0, len(df), shard_rows))
+    ]
+
+
+class ShardedAppender:
+    """Appends streamed chunks to ``path``, rolling over to a new shard every ``shard_rows`` rows."""
+
+    def __init__(self, path: str, shard_rows: int | None) -> None:
+        self.path = path
+        self.shard_rows = shard_rows
+        self.paths: List[str] = []
+        self._rows_in_shard = 0
+
+    def append(self, df: pd.DataFrame) -> None:
+        while len(df):
+            if not self.paths or (self.shard_rows and self._rows_in_shard >= self.shard_rows):
+                self.paths.append(shard_path(self.path, len(self.paths) + 1) if self.shard_rows else self.path)
+                self._rows_in_shard = 0
+            take = len(df) if not self.shard_rows else min(len(df), self.shard_rows - self._rows_in_shard)
+            append_csv(df.iloc[:take], self.paths[-1], header=self._rows_in_shard == 0)
+            self._rows_in_shard += take
+            df = df.iloc[take:]
+
+    def close(self, columns: List[str]) -> List[str]:
+        if not self.paths:
+            import pandas as pd
+
+            write_csv(pd.DataFrame(columns=columns), self.path)
+            return [self.path]
+        if len(self.paths) == 1 and self.paths[0] != self.path:
+            # same naming as the in-memory path: a single shard keeps the plain name
+            os.replace(self.paths[0], self.path)
+            self.paths = [self.path]
+        return self.paths
+
+
 def sanitize_filename(name: str) -> str:
     invalid_chars = '<>:"/\\|?*'
     sanitized = name
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Tuple
+
+
+def memory_mb() -> Tuple[float | None, float | None]:
+    """(current RSS, peak RSS) of this process in MB; None where the platform can't tell."""
+    try:
+        import psutil
+
+        info = psutil.Process().memory_info()
+        peak = getattr(info, "peak_wset", None)  # Windows only
+        return round(info.rss / 2**20, 1), round(peak / 2**20, 1) if peak else _ru_peak_mb()
+    except Exception:
+        pass
+    found: Dict[str, float] = {}
+    try:
+        # Linux: current and high-water RSS from one consistent snapshot
+        with open("/proc/self/status", "r") as fh:
+            for line in fh:
+                if line.startswith(("VmRSS:", "VmHWM:")):
+                    found[line[:5]] = round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return found.get("VmRSS"), found.get("VmHWM") or _ru_peak_mb()
+
+
+def _ru_peak_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+
+class RunReport:
+    """Wall time, rows, bytes and memory for each phase of a run, safe to share between threads."""
+
+    def __init__(self, **info) -> None:
+        self.info = info
+        self.phases: List[Dict] = []
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self.started_wall = time.time()
+        self._started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+    @contextmanager
+    def phase(self, name: str, run: str = "", **info) -> Iterator[Dict]:
+        """Time a block; the yielded dict takes ``rows``/``bytes`` (or anything else) to record."""
+        record: Dict = {"phase": name, "run": run, **info}
+        rss_before, peak_before = memory_mb()
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["start_s"] = round(started - self._started, 4)
+            record["seconds"] = round(time.perf_counter() - started, 4)
+            rss, peak = memory_mb()
+            record["rss_mb"] = rss
+            # the phase's own footprint; phases that overlap in threads share one process, so these are approximate
+            record["rss_delta_mb"] = round(rss - rss_before, 1) if rss is not None and rss_before is not None else None
+            record["peak_rise_mb"] = round(peak - peak_before, 1) if peak is not None and peak_before is not None else None
+            # the high-water mark of the whole process up to the end of this phase, not of the phase itself
+            record["process_peak_rss_mb"] = peak
+            with self._lock:
+                self.phases.append(record)
+
+    def merge(self, phases: List[Dict], started_wall: float) -> None:
+        """Add phases recorded by a report in another process (its ``started_wall``), on this report's clock."""
+        offset = started_wall - self.started_wall
+        with self._lock:
+            self.phases.extend({**p, "start_s": round(p["start_s"] + offset, 4)} for p in phases)
+
+    def totals(self) -> Dict:
+        with self._lock:
+            phases = list(self.phases)
+        peak = memory_mb()[1]
+        return {
+            "seconds": round(time.perf_counter() - self._started, 4),
+            # every phase that produced a file records its bytes
+            "rows_written": sum(p.get("rows", 0) for p in phases if "bytes" in p),
+            "bytes_written": sum(p["bytes"] for p in phases if "bytes" in p),
+            "peak_rss_mb": peak,
+        }
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            phases = sorted(self.phases, key=lambda p: p["start_s"])
+        return {"started_at": self._started_at, **self.info, "totals": self.totals(), "phases": phases}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2, default=str)
+
+    def write(self, path: str) -> str:
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            fh.write(self.to_json())
+        os.replace(tmp, path)
+        return path
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import os
-from typing import Iterable, Tuple, Set, List
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, Iterable, Tuple, Set, List
 
-import pandas as pd
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def build_playlist_name(operation: str, file_paths: List[str]) -> str:
@@ -17,6 +19,8 @@ def build_playlist_name(operation: str, file_paths: List[str]) -> str:
         return f"ADD_{stems[0]}"
     elif operation == "delete":
         return f"DEL_{stems[0]}"
+    elif operation == "delta":
+        return f"DELTA_{stems[0]}_{stems[1]}"
     else:
         return f"DEL_{stems[0]}_ADD_{stems[1]}"
 
@@ -24,14 +28,112 @@ def build_playlist_name(operation: str, file_paths: List[str]) -> str:
 def _table_from_path(path: str) -> str:
     name = os.path.basename(path)
     stem = os.path.splitext(name)[0]
-    if "_" in stem:
-        suffix = stem.rsplit("_", 1)[-1]
-    else:
-        suffix = stem
-    return suffix
+    parts = stem.split("_")
+    # sharded outputs end in a numeric shard index: <stem>_<Table>_0001
+    if len(parts) > 2 and parts[-1].isdigit():
+        return parts[-2]
+    return parts[-1]
 
 
-def build_playlist_df(entries: Iterable[Tuple[str, str]], include_tables: Set[str]) -> pd.DataFrame:
+UD_CHAIN = ["UD08", "UD09", "UD10", "UD11"]
+# a mixed source writes <stem>_Variant_<Table> and <stem>_Attribute_<Table>; each set is its own chain
+CHAIN_KINDS = {"Variant": "variant", "Attribute": "attribute"}
+
+
+def _group_from_path(path: str) -> Tuple[str, str]:
+    # tables only depend on each other within one output folder (one run); category files form their own chain
+    name = os.path.basename(path)
+    if "_Categories_" in name:
+        return os.path.dirname(path), "category"
+    parts = os.path.splitext(name)[0].split("_")
+    if len(parts) > 3 and parts[-1].isdigit():
+        parts = parts[:-1]
+    kind = CHAIN_KINDS.get(parts[-2], "data") if len(parts) > 2 else "data"
+    return os.path.dirname(path), kind
+
+
+def build_playlist_graph(
+    entries: Iterable[Tuple[str, str]], include_tables: Set[str]
+) -> Tuple[List[Tuple[str, str]], Dict[int, Set[int]]]:
+    """Entries that belong in the playlist and, per entry, the entries that must finish before it starts.
+
+    Adds run parents first (UD08 -> UD09 -> UD10 -> UD11), deletes run children
+    first, category assignments wait for their category and part, and every add
+    waits for all deletes of the same table. Skipped tables are bridged to the
+    next one present in the chain.
+    """
+    nodes: List[Tuple[str, str]] = []
+    for path, op in entries:
+        table = _table_from_path(path)
+        if table != "Part" and table not in include_tables:
+            continue
+        nodes.append((path, op))
+
+    index: Dict[Tuple[str, str, str, str], List[int]] = defaultdict(list)
+    deletes_by_table: Dict[str, List[int]] = defaultdict(list)
+    for i, (path, op) in enumerate(nodes):
+        folder, kind = _group_from_path(path)
+        table = _table_from_path(path)
+        index[(folder, kind, op, table)].append(i)
+        if op == "delete":
+            deletes_by_table[table].append(i)
+
+    def nearest(folder: str, kind: str, op: str, tables: List[str]) -> List[int]:
+        for table in tables:
+            found = index.get((folder, kind, op, table))
+            if found:
+                return found
+        return []
+
+    deps: Dict[int, Set[int]] = {i: set() for i in range(len(nodes))}
+    for i, (path, op) in enumerate(nodes):
+        folder, kind = _group_from_path(path)
+        table = _table_from_path(path)
+        if kind != "category" and table in UD_CHAIN:
+            pos = UD_CHAIN.index(table)
+            if op == "delete":
+                deps[i].update(nearest(folder, kind, op, UD_CHAIN[pos + 1:]))
+            else:
+                deps[i].update(nearest(folder, kind, op, UD_CHAIN[:pos][::-1]))
+        elif kind == "category" and table == "UD11" and op != "delete":
+            deps[i].update(index.get((folder, kind, op, "UD08"), []))
+            for part_kind in ("data", *CHAIN_KINDS.values()):
+                deps[i].update(index.get((folder, part_kind, op, "Part"), []))
+        elif kind == "category" and table == "UD08" and op == "delete":
+            deps[i].update(index.get((folder, kind, op, "UD11"), []))
+        if op != "delete":
+            deps[i].update(deletes_by_table.get(table, []))
+    return nodes, deps
+
+
+def schedule_playlist(deps: Dict[int, Set[int]]) -> List[List[int]]:
+    """Topological levels: every entry in a level only depends on entries in earlier levels."""
+    remaining = {i: set(d) for i, d in deps.items()}
+    levels: List[List[int]] = []
+    while remaining:
+        ready = sorted(i for i, d in remaining.items() if not d)
+        if not ready:
+            raise ValueError("Playlist dependencies contain a cycle.")
+        levels.append(ready)
+        for i in ready:
+            del remaining[i]
+        for d in remaining.values():
+            d.difference_update(ready)
+    return levels
+
+
+def build_playlist_columns(
+    entries: Iterable[Tuple[str, str]], include_tables: Set[str]
+) -> Tuple[Dict[str, list], Dict[str, List[str]]]:
+    """Playlist columns in scheduled order, plus Source -> Sources that must finish first."""
+    nodes, deps = build_playlist_graph(entries, include_tables)
+    has_dependents = {j for d in deps.values() for j in d}
+
+    order: List[int] = []
+    for level in schedule_playlist(deps):
+        # start the free-running imports of a level before the ones the next level has to wait for
+        order.extend(sorted(level, key=lambda i: i in has_dependents))
+
     imports = []
     sources = []
     adds = []
@@ -39,10 +141,9 @@ def build_playlist_df(entries: Iterable[Tuple[str, str]], include_tables: Set[st
     deletes = []
     waits = []
 
-    for path, op in entries:
+    for i in order:
+        path, op = nodes[i]
         table = _table_from_path(path)
-        if table != "Part" and table not in include_tables:
-            continue
 
         if op == "delete":
             add_flag = False
@@ -58,16 +159,26 @@ def build_playlist_df(entries: Iterable[Tuple[str, str]], include_tables: Set[st
         adds.append(add_flag)
         updates.append(update_flag)
         deletes.append(delete_flag)
-        waits.append(True)
+        # only a barrier when something later depends on this import
+        waits.append(i in has_dependents)
 
-    df = pd.DataFrame({
+    columns = {
         "Import": imports,
         "Source": sources,
         "Add": adds,
         "Update": updates,
         "Delete": deletes,
         "Wait": waits,
-    })
-    return df
+    }
+    dependencies = {nodes[i][0]: sorted(nodes[j][0] for j in deps[i]) for i in order}
+    return columns, dependencies
 
 
+def build_playlist_df(entries: Iterable[Tuple[str, str]], include_tables: Set[str]) -> pd.DataFrame:
+    import pandas as pd
+
+    columns, dependencies = build_playlist_columns(entries, include_tables)
+    df = pd.DataFrame(columns)
+    # Source -> Sources that must finish first, for callers that schedule imports themselves
+    df.attrs["dependencies"] = dependencies
+    return df
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import csv
+import io
+import os
+import re
+from typing import Dict, Iterable, List, Tuple
+
+# Pure-Python builders and writer for the handful of rows New PDP Mode produces,
+# so that mode starts without importing pandas. builders.py wraps these in
+# DataFrames, so both paths share one definition of every row.
+
+Rows = Tuple[List[str], List[list]]
+
+PDP_PART_BASE_COLS = [
+    "Company", "PartNum",
+    "Character05", "Character06", "Character08",
+    "Checkbox11", "Character10", "Character11", "Character12", "Character13",
+]
+PDP_PART_NEW_COLS = ["PartDescription", "ClassID", "ProdCode", "UserChar1"]
+CATEGORY_UD08_COLS = ["Company", "Key1", "Key2", "Key3", "Key4", "Key5", "Character01", "Character04"]
+CATEGORY_UD11_COLS = ["Company", "Key1", "Key2", "Key3", "Key4", "Key5"]
+
+
+def pdp_part_rows(company: str, part_id: str, is_new: bool, part_desc: str, prod_code: str, website: str) -> Rows:
+    row = [company or "SAINC", part_id, part_id, "", "", True, "", "", "show", website]
+    cols = list(PDP_PART_BASE_COLS)
+    if is_new:
+        cols += PDP_PART_NEW_COLS
+        row += [part_desc, "FG", prod_code, "Introduction"]
+    return cols, [row]
+
+
+# a category's parent path: "A-B-C" -> "A-B"; empty segments are ignored ("A--B-" -> "A") and single
+# segments have no parent. builders.category_parent_paths applies the same patterns to a whole column.
+CATEGORY_SEPARATOR_RUN = r"-+"
+CATEGORY_LAST_SEGMENT = r"-?[^-]*$"
+
+
+def category_parent_path(category: str) -> str:
+    normalized = re.sub(CATEGORY_SEPARATOR_RUN, "-", str(category)).strip("-")
+    return re.sub(CATEGORY_LAST_SEGMENT, "", normalized)
+
+
+def category_rows(company: str, website: str, categories: Iterable[str], part_nums: Iterable[str]) -> Dict[str, Rows]:
+    company = company or "SAINC"
+    cats = list(categories)
+    parts = list(part_nums)
+    ud08 = [[company, "Category", website, cat, category_parent_path(cat), "", "COPY NEEDED", "COPY NEEDED"] for cat in cats]
+    ud11 = [[company, "Category", website, cat, part, ""] for cat in cats for part in parts]
+    return {"UD08": (list(CATEGORY_UD08_COLS), ud08), "UD11": (list(CATEGORY_UD11_COLS), ud11)}
+
+
+def _cell(value) -> str:
+    return "" if value is None else str(value)
+
+
+def encode_rows_csv(columns: List[str], rows: Iterable[list]) -> bytes:
+    """Same bytes as ``DataFrame(rows, columns=columns).to_csv(index=False).encode('utf-8-sig')``."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator=os.linesep)
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_cell(v) for v in row])
+    return buffer.getvalue().encode("utf-8-sig")
+
+
+def write_rows_csv(columns: List[str], rows: Iterable[list], path: str) -> None:
+    """Same bytes as ``DataFrame(rows, columns=columns).to_csv(path, index=False, encoding='utf-8-sig')``."""
+    with open(path, "wb") as fh:
+        fh.write(encode_rows_csv(columns, rows))
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import logging
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 2
+MAX_UPLOAD_BYTES = 512 * 1024 * 1024
+OPTIONS_HEADER = "X-DMT-Options"
+
+log = logging.getLogger("dmt_wizard.serve")
+
+
+def _warm_worker() -> None:
+    # pandas, the builders and the playlist load once per worker, not once per request
+    import pandas  # noqa: F401
+
+    import dmt_wizard.api  # noqa: F401
+    import dmt_wizard.builders  # noqa: F401
+    import dmt_wizard.csv_writer  # noqa: F401
+    import dmt_wizard.playlist  # noqa: F401
+    import dmt_wizard.validation  # noqa: F401
+
+
+def build_zip(data: bytes, options: dict, name: str, sheet: str | None = None, dest: str = "") -> Tuple[bytes, str]:
+    """Build an uploaded source in a worker; returns (zip bytes, playlist name).
+
+    The archive holds ``<stem>_OUTPUT/`` and the playlist at its root, plus
+    ``<stem>_VALIDATION.csv`` when the source has issues. Playlist ``Source``
+    paths are relative to the archive root, or under ``dest`` when given.
+    """
+    from .api import build
+    from .io_utils import encode_csv
+
+    result = build(data, options, name=name, sheet=sheet)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for path, payload in result.csv_files(dest).items():
+            zf.writestr(os.path.relpath(path, dest or ".").replace(os.sep, "/"), payload)
+        if result.validation is not None and len(result.validation):
+            zf.writestr(f"{result.stem}_VALIDATION.csv", encode_csv(result.validation))
+    return buffer.getvalue(), result.playlist_name
+
+
+class BuildServer(ThreadingHTTPServer):
+    """Local HTTP build service on a pool of warm worker processes.
+
+    ``POST /build?name=<file name>`` with the source file as the request body
+    builds it and answers with a zip of the outputs and playlist. Options (the
+    fields of a batch manifest job) come as JSON in the ``options`` query
+    parameter or the ``X-DMT-Options`` header; ``sheet`` and ``dest`` are
+    optional. At most ``workers`` builds run at once and ``queue`` more wait;
+    anything beyond that is turned away with 503 so callers can retry.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], workers: int = DEFAULT_WORKERS, queue: int | None = None, max_upload: int = MAX_UPLOAD_BYTES) -> None:
+        super().__init__(address, BuildHandler)
+        self.workers = max(1, workers)
+        self.max_upload = max_upload
+        self.capacity = self.workers + (self.workers if queue is None else max(0, queue))
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._lock = threading.Lock()
+        self._pool: ProcessPoolExecutor | None = None
+        self.in_flight = 0
+
+    def get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+                # start every worker now so the first requests do not pay for the imports
+                for fut in [self._pool.submit(_warm_worker) for _ in range(self.workers)]:
+                    fut.result()
+            return self._pool
+
+    def run_build(self, *args) -> Tuple[bytes, str] | None:
+        """Run one build on the pool; None when the pool and its queue are full."""
+        if not self._slots.acquire(blocking=False):
+            return None
+        with self._lock:
+            self.in_flight += 1
+        try:
+            pool = self.get_pool()
+            try:
+                return pool.submit(build_zip, *args).result()
+            except BrokenProcessPool:
+                # a worker died (e.g. out of memory); the next request gets a fresh pool
+                with self._lock:
+                    if self._pool is pool:
+                        self._pool = None
+                raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+
+    def server_close(self) -> None:
+        super().server_close()
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+
+
+class BuildHandler(BaseHTTPRequestHandler):
+    server: BuildServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args) -> None:
+        log.info("%s %s", self.address_string(), format % args)
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: dict | None = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: dict, headers: dict | None = None) -> None:
+        self._send(status, json.dumps(payload).encode("utf-8"), "application/json", headers)
+
+    def do_GET(self) -> None:
+        if urlparse(self.path).path != "/health":
+            self._send_json(404, {"error": "Not found. Use POST /build or GET /health."})
+            return
+        self._send_json(200, {"status": "ok", "workers": self.server.workers, "capacity": self.server.capacity, "in_flight": self.server.in_flight})
+
+    def do_POST(self) -> None:
+        url = urlparse(self.path)
+        if url.path != "/build":
+            self._send_json(404, {"error": "Not found. Use POST /build or GET /health."})
+            return
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0:
+            self._send_json(400, {"error": "Send the source file as the request body."})
+            return
+        if length > self.server.max_upload:
+            # the body is never read, so the connection cannot carry another request
+            self._send_json(413, {"error": f"Upload is larger than {self.server.max_upload} bytes."}, {"Connection": "close"})
+            return
+        data = self.rfile.read(length)
+        try:
+            options = json.loads(self.headers.get(OPTIONS_HEADER) or query.get("options") or "{}")
+            if not isinstance(options, dict):
+                raise ValueError("options must be a JSON object of job fields.")
+        except ValueError as exc:
+            self._send_json(400, {"error": f"Invalid options: {exc}"})
+            return
+
+        try:
+            result = self.server.run_build(data, options, query.get("name", "source.xlsx"), query.get("sheet"), query.get("dest", ""))
+        except ValueError as exc:
+            # bad options or a source that failed validation in "stop" mode
+            payload = {"error": str(exc)}
+            issues = getattr(exc, "issues", None)
+            if issues is not None:
+                payload["issues"] = json.loads(issues.to_json(orient="records"))
+            self._send_json(422 if issues is not None else 400, payload)
+            return
+        except Exception as exc:
+            log.exception("Build failed")
+            self._send_json(500, {"error": f"{type(exc).__name__}: {exc}"})
+            return
+        if result is None:
+            self._send_json(503, {"error": "All build workers are busy; retry shortly."}, {"Retry-After": "1"})
+            return
+        body, playlist_name = result
+        self._send(200, body, "application/zip", {"Content-Disposition": f'attachment; filename="{playlist_name}.zip"'})
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve builds over local HTTP from warm worker processes.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="address to listen on (default: this machine only)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="warm build processes")
+    parser.add_argument("--queue", type=int, default=None, help="builds allowed to wait for a worker (default: one per worker)")
+    parser.add_argument("--max-upload-mb", type=int, default=MAX_UPLOAD_BYTES // 2**20)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    server = BuildServer((args.host, args.port), args.workers, args.queue, args.max_upload_mb * 2**20)
+    server.get_pool()
+    log.info("Serving builds on http://%s:%d (%d workers, %d queued)", args.host, args.port, server.workers, server.capacity - server.workers)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        log.info("Stopping server")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from typing import List
+
+from .sorting import sort_values
+
+
+HELP = (
+    "↑/↓ PgUp/PgDn Home/End move   Space pick up/drop row   <digits> Enter move row to position\n"
+    "n natural sort   u size sort (in/mm)   r reverse   Enter done   Esc cancel"
+)
+
+
+def edit_order(values: List[str], title: str = "UD09 sort order") -> List[str] | None:
+    """Single-screen editor for a value order; returns the values in the chosen order, or None if cancelled.
+
+    Only the rows that fit the terminal are rendered, and prompt_toolkit repaints
+    only the cells that changed, so each keystroke costs the same for 10 or 1,000 values.
+    """
+    from prompt_toolkit.application import Application
+    from prompt_toolkit.application.current import get_app
+    from prompt_toolkit.key_binding import KeyBindings
+    from prompt_toolkit.layout import HSplit, Layout, Window
+    from prompt_toolkit.layout.controls import FormattedTextControl
+
+    order = list(values)
+    state = {"cursor": 0, "top": 0, "grabbed": False, "digits": "", "message": ""}
+
+    def page() -> int:
+        return max(3, get_app().output.get_size().rows - 5)
+
+    def move_cursor(delta: int) -> None:
+        if not order:
+            return
+        old = state["cursor"]
+        new = min(max(old + delta, 0), len(order) - 1)
+        if state["grabbed"] and new != old:
+            # carry the picked-up row along
+            order.insert(new, order.pop(old))
+        state["cursor"] = new
+        height = page()
+        if new < state["top"]:
+            state["top"] = new
+        elif new >= state["top"] + height:
+            state["top"] = new - height + 1
+
+    def body():
+        height = page()
+        width = len(str(len(order)))
+        lines = []
+        for i in range(state["top"], min(state["top"] + height, len(order))):
+            style = ""
+            if i == state["cursor"]:
+                style = "reverse bold" if state["grabbed"] else "reverse"
+            lines.append((style, f" {i + 1:>{width}}  {order[i]}\n"))
+        return lines
+
+    def status():
+        pending = f"   move to: {state['digits']}" if state["digits"] else ""
+        return [("bold", f" {title} ({len(order)} values){pending}   {state['message']}\n"), ("", HELP)]
+
+    kb = KeyBindings()
+
+    @kb.add("up")
+    def _(event):
+        move_cursor(-1)
+
+    @kb.add("down")
+    def _(event):
+        move_cursor(1)
+
+    @kb.add("pageup")
+    def _(event):
+        move_cursor(-page())
+
+    @kb.add("pagedown")
+    def _(event):
+        move_cursor(page())
+
+    @kb.add("home")
+    def _(event):
+        move_cursor(-len(order))
+
+    @kb.add("end")
+    def _(event):
+        move_cursor(len(order))
+
+    @kb.add("space")
+    def _(event):
+        state["grabbed"] = not state["grabbed"]
+
+    for digit in "0123456789":
+        @kb.add(digit)
+        def _(event, digit=digit):
+            state["digits"] += digit
+
+    @kb.add("backspace")
+    def _(event):
+        state["digits"] = state["digits"][:-1]
+
+    def resort(mode: str | None) -> None:
+        current = order[state["cursor"]] if order else None
+        order[:] = order[::-1] if mode is None else sort_values(order, mode)
+        state["message"] = "reversed" if mode is None else f"{mode} sort applied"
+        if current is not None:
+            move_cursor(order.index(current) - state["cursor"])
+
+    @kb.add("n")
+    def _(event):
+        resort("natural")
+
+    @kb.add("u")
+    def _(event):
+        resort("numeric")
+
+    @kb.add("r")
+    def _(event):
+        resort(None)
+
+    @kb.add("enter")
+    def _(event):
+        if state["digits"]:
+            target = int(state["digits"]) - 1
+            state["digits"] = ""
+            state["grabbed"] = True
+            move_cursor(target - state["cursor"])
+            state["grabbed"] = False
+            return
+        event.app.exit(result=list(order))
+
+    @kb.add("escape", eager=True)
+    @kb.add("c-c")
+    def _(event):
+        event.app.exit(result=None)
+
+    layout = Layout(HSplit([
+        Window(FormattedTextControl(status), height=3),
+        Window(FormattedTextControl(body)),
+    ]))
+    return Application(layout=layout, key_bindings=kb, full_screen=True).run()
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterable, List, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+SORT_STORE_ENV = "DMT_SORT_STORE"
+DEFAULT_STORE_PATH = os.path.join(os.path.expanduser("~"), ".dmt_wizard", "ud09_sort.sqlite")
+
+# the UD09 record's own keys: variants sort Key3 under (Company, Key1, Key2),
+# attributes sort Key2 under (Company, Key1) and leave Key3 blank
+VALUE_COLS = {"variant": "Key3", "attribute": "Key2"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ud09_sort (
+    company  TEXT NOT NULL,
+    key1     TEXT NOT NULL,
+    key2     TEXT NOT NULL,
+    key3     TEXT NOT NULL,
+    number01 INTEGER NOT NULL,
+    updated  TEXT NOT NULL,
+    PRIMARY KEY (company, key1, key2, key3)
+) WITHOUT ROWID;
+"""
+
+SortKey = Tuple[str, str, str, str]
+
+
+def default_store_path() -> str:
+    return os.environ.get(SORT_STORE_ENV) or DEFAULT_STORE_PATH
+
+
+def ud09_keys(df11: pd.DataFrame, import_type: str) -> List[SortKey]:
+    """Unique UD09 records of a source as (Company, Key1, Key2, Key3), blanks dropped."""
+    if import_type == "mixed":
+        from .builders import split_by_type
+
+        parts = split_by_type(df11)
+        return ud09_keys(parts["variant"], "variant") + ud09_keys(parts["attribute"], "attribute")
+    value_col = VALUE_COLS[import_type]
+    cols = ["Company", "Key1", "Key2", "Key3"] if import_type == "variant" else ["Company", "Key1", "Key2"]
+    frame = df11[cols].fillna("").astype(str)
+    frame = frame[frame[value_col].str.strip() != ""].drop_duplicates()
+    if import_type != "variant":
+        frame = frame.assign(Key3="")
+    return list(frame[["Company", "Key1", "Key2", "Key3"]].itertuples(index=False, name=None))
+
+
+def value_of(key: SortKey, import_type: str) -> str:
+    return key[3] if import_type == "variant" else key[2]
+
+
+def partition_keys(keys: List[SortKey]) -> Dict[str, List[SortKey]]:
+    """The keys of a mixed source per partition; attribute records are the ones with a blank Key3."""
+    return {"variant": [key for key in keys if key[3]], "attribute": [key for key in keys if not key[3]]}
+
+
+def partition_sort_map(ud09_sort_map: Dict | None, kind: str) -> Dict[str, int] | None:
+    """The order for one partition of a mixed source.
+
+    A mixed source's map is keyed by partition (``{"variant": {...}, "attribute": {...}}``)
+    because the same text can be a variant Key3 and an attribute Key2; a flat
+    map applies to both partitions.
+    """
+    if ud09_sort_map and all(isinstance(order, dict) for order in ud09_sort_map.values()):
+        return ud09_sort_map.get(kind)
+    return ud09_sort_map
+
+
+class SortStore:
+    """SQLite store of UD09 ``Number01`` orders, keyed by the UD09 record (Company, Key1, Key2, Key3).
+
+    The primary key doubles as the Company/Key1/Key2 index, so a family's
+    values are one range scan. Safe to share between batch workers: writes
+    are short upserts and readers do not block them (WAL).
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = path or default_store_path()
+        folder = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(folder, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> SortStore:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def lookup(self, keys: Iterable[SortKey]) -> Dict[SortKey, int]:
+        conn = self._conn
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS wanted (company TEXT, key1 TEXT, key2 TEXT, key3 TEXT)")
+        conn.execute("DELETE FROM wanted")
+        conn.executemany("INSERT INTO wanted VALUES (?, ?, ?, ?)", keys)
+        rows = conn.execute(
+            "SELECT s.company, s.key1, s.key2, s.key3, s.number01 FROM wanted w "
+            "JOIN ud09_sort s ON s.company = w.company AND s.key1 = w.key1 AND s.key2 = w.key2 AND s.key3 = w.key3"
+        ).fetchall()
+        return {row[:4]: row[4] for row in rows}
+
+    def save(self, numbers: Dict[SortKey, int]) -> int:
+        stamp = datetime.now().isoformat(timespec="seconds")
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO ud09_sort VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (company, key1, key2, key3) DO UPDATE SET number01 = excluded.number01, updated = excluded.updated",
+                [(*key, int(number), stamp) for key, number in numbers.items()],
+            )
+        return len(numbers)
+
+
+def known_sort_map(keys: List[SortKey], import_type: str, path: str | None = None) -> Dict[str, int]:
+    """``ud09_sort_map`` entries for the values the store already has an order for (one map per partition for mixed)."""
+    if import_type == "mixed":
+        return {kind: known_sort_map(part, kind, path) for kind, part in partition_keys(keys).items()}
+    if not keys:
+        return {}
+    with SortStore(path) as store:
+        found = store.lookup(keys)
+    mapping: Dict[str, int] = {}
+    # a value shared by several families takes the order from the first one that has it
+    for key in keys:
+        value = value_of(key, import_type)
+        if value not in mapping and key in found:
+            mapping[value] = found[key]
+    return mapping
+
+
+def remember_sort_map(keys: List[SortKey], import_type: str, ud09_sort_map: Dict[str, int] | None, path: str | None = None) -> int:
+    """Store the order of every UD09 record whose value is in ``ud09_sort_map``."""
+    if import_type == "mixed":
+        return sum(remember_sort_map(part, kind, partition_sort_map(ud09_sort_map, kind), path) for kind, part in partition_keys(keys).items())
+    if not keys or not ud09_sort_map:
+        return 0
+    numbers = {key: ud09_sort_map[value_of(key, import_type)] for key in keys if value_of(key, import_type) in ud09_sort_map}
+    if not numbers:
+        return 0
+    with SortStore(path) as store:
+        return store.save(numbers)
+
+
+def stored_sort_map(df11: pd.DataFrame, import_type: str, ud09_sort_map: Dict[str, int] | None, path: str | None = None) -> Dict[str, int]:
+    """``ud09_sort_map`` on top of the orders the store already knows for this source; its own entries are saved back."""
+    keys = ud09_keys(df11, import_type)
+    known = known_sort_map(keys, import_type, path)
+    if import_type == "mixed":
+        mapping = {kind: {**order, **(partition_sort_map(ud09_sort_map, kind) or {})} for kind, order in known.items()}
+    else:
+        mapping = {**known, **(ud09_sort_map or {})}
+    remember_sort_map(keys, import_type, ud09_sort_map, path)
+    return mapping
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import csv
+import io
+import os
+import re
+from typing import Dict, Iterable, List, Tuple
+
+
+SORT_MODES = ("natural", "numeric")
+
+# 1-1/4, 1 1/4, 3/8, 0.5, .75, 12
+_NUMBER = re.compile(r"(\d+\s*[- ]\s*\d+/\d+|\d+/\d+|\d*\.\d+|\d+)")
+_MEASURE = re.compile(r"^\s*(\d+\s*[- ]\s*\d+/\d+|\d+/\d+|\d*\.\d+|\d+)\s*(\"|''|'|in\b|inch(?:es)?\b|ft\b|mm\b|cm\b|m\b)?", re.IGNORECASE)
+# everything in millimetres so 1/4" (6.35) sorts before 10mm and 1/2" (12.7) after it
+_UNIT_MM = {'"': 25.4, "''": 25.4, "in": 25.4, "inch": 25.4, "inches": 25.4, "'": 304.8, "ft": 304.8, "mm": 1.0, "cm": 10.0, "m": 1000.0}
+
+
+def parse_number(text: str) -> float:
+    """'3/8' -> 0.375, '1-1/4' -> 1.25, '2.5' -> 2.5."""
+    text = text.strip()
+    mixed = re.match(r"^(\d+)\s*[- ]\s*(\d+)/(\d+)$", text)
+    if mixed:
+        whole, num, den = (int(g) for g in mixed.groups())
+        return whole + (num / den if den else 0.0)
+    if "/" in text:
+        num, den = text.split("/", 1)
+        return int(num) / int(den) if int(den) else float(num)
+    return float(text)
+
+
+def natural_key(value: str) -> Tuple:
+    """Text compares case-insensitively, embedded numbers (fractions too) by value: 'Size 3/8' < 'Size 1/2' < 'Size 10'."""
+    parts = []
+    for i, token in enumerate(_NUMBER.split(str(value))):
+        if i % 2:
+            parts.append((0, parse_number(token), ""))
+        elif token.strip():
+            parts.append((1, 0.0, token.strip().casefold()))
+    return tuple(parts) + ((2, 0.0, str(value)),)
+
+
+def numeric_key(value: str) -> Tuple:
+    """Leading measurement by size (inches, feet, mm, cm, m all as mm); anything else after, naturally."""
+    match = _MEASURE.match(str(value))
+    if not match:
+        return (1, 0.0, natural_key(value))
+    amount = parse_number(match.group(1))
+    unit = (match.group(2) or "").lower()
+    return (0, amount * _UNIT_MM.get(unit, 1.0), natural_key(value))
+
+
+def sort_values(values: Iterable[str], mode: str = "natural") -> List[str]:
+    if mode not in SORT_MODES:
+        raise ValueError(f"Unknown sort mode '{mode}'. Expected one of: {', '.join(SORT_MODES)}.")
+    return sorted(values, key=numeric_key if mode == "numeric" else natural_key)
+
+
+def order_to_map(ordered: Iterable[str]) -> Dict[str, int]:
+    return {value: i + 1 for i, value in enumerate(ordered)}
+
+
+def _match_values(pairs: List[Tuple[str, int | None]], values: List[str]) -> Tuple[Dict[str, int], List[str]]:
+    exact = set(values)
+    loose = {v.strip().casefold(): v for v in values}
+    mapping: Dict[str, int] = {}
+    unknown: List[str] = []
+    position = 0
+    for raw, number in pairs:
+        value = raw if raw in exact else loose.get(raw.strip().casefold())
+        if value is None:
+            unknown.append(raw)
+            continue
+        position += 1
+        if value not in mapping:
+            mapping[value] = number if number is not None else position
+    return mapping, unknown
+
+
+def _split_pair(cells: List[str]) -> Tuple[str, int | None]:
+    # "value" alone is ordered by position; "value, 3" / "value<TAB>3" gives an explicit Number01
+    if len(cells) >= 2 and cells[-1].strip().isdigit():
+        return ",".join(cells[:-1]).strip(), int(cells[-1])
+    return ",".join(cells).strip(), None
+
+
+def parse_order_text(text: str, values: List[str]) -> Tuple[Dict[str, int], List[str]]:
+    """Sort map from pasted lines, plus the lines that matched no value.
+
+    One value per line in the wanted order, or two columns (value and
+    Number01) as pasted from Excel. Matching ignores case and surrounding
+    spaces; values that are not listed stay unmapped and are numbered after
+    the listed ones by the builders.
+    """
+    pairs = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        cells = line.split("\t") if "\t" in line else [line]
+        if len(cells) == 1 and "=" in line:
+            cells = line.rsplit("=", 1)
+        pairs.append(_split_pair(cells))
+    return _match_values(pairs, values)
+
+
+def read_order_file(path: str, values: List[str]) -> Tuple[Dict[str, int], List[str]]:
+    """Same as :func:`parse_order_text` for a .txt or .csv file (CSV may quote values with commas)."""
+    with open(path, "r", encoding="utf-8-sig", newline="") as fh:
+        text = fh.read()
+    if os.path.splitext(path)[1].lower() != ".csv":
+        return parse_order_text(text, values)
+    rows = [row for row in csv.reader(io.StringIO(text)) if any(c.strip() for c in row)]
+    if rows and len(rows[0]) >= 2 and not rows[0][-1].strip().isdigit() and rows[0][0] not in values:
+        rows = rows[1:]  # header row
+    return _match_values([_split_pair(row) for row in rows], values)
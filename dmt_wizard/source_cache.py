@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import os
+import threading
+from typing import Dict, Tuple
+
+import pandas as pd
+
+from .io_utils import UD11_COLUMNS, read_csv_arrow, read_excel_normalized, sanitize_filename, text_column
+
+
+SIDECAR_SUFFIX = ".dmtcache.feather"
+SIDECAR_VERSION = "1"
+
+CacheKey = Tuple[str, int, int]
+
+
+def source_key(path: str) -> CacheKey:
+    st = os.stat(path)
+    return os.path.abspath(path), st.st_size, st.st_mtime_ns
+
+
+def sidecar_path(path: str, sheet: str | None = None) -> str:
+    base_dir = os.path.dirname(os.path.abspath(path))
+    name = os.path.basename(path) if sheet is None else f"{os.path.basename(path)}.{sanitize_filename(sheet)}"
+    return os.path.join(base_dir, f".{name}{SIDECAR_SUFFIX}")
+
+
+class SourceCache:
+    """Parse-once cache of normalized source frames, keyed by path, size, mtime and sheet.
+
+    Frames are shared between callers and must not be mutated in place.
+    When ``sidecar`` is enabled and pyarrow is available, each parsed source is
+    also stored as a Feather file next to it so later sessions skip Excel parsing.
+    The cache is shared by threads: each source (and sheet) is parsed, and its
+    sidecar written, by one of them while the others wait for the result.
+    """
+
+    def __init__(self, sidecar: bool = True) -> None:
+        self.sidecar = sidecar
+        self._frames: Dict[Tuple[CacheKey, str | None], pd.DataFrame] = {}
+        self._lock = threading.Lock()
+        self._loading: Dict[Tuple[str, str | None], threading.Lock] = {}
+
+    def get(self, path: str, sheet: str | None = None) -> pd.DataFrame:
+        key = source_key(path)
+        with self._lock:
+            df = self._frames.get((key, sheet))
+            if df is not None:
+                return df
+            loading = self._loading.setdefault((key[0], sheet), threading.Lock())
+
+        with loading:
+            # another thread may have parsed it while this one waited
+            with self._lock:
+                df = self._frames.get((key, sheet))
+            if df is not None:
+                return df
+
+            df = self._read_sidecar(path, key, sheet) if self.sidecar else None
+            if df is None:
+                df = read_excel_normalized(path, sheet)
+                if self.sidecar:
+                    self._write_sidecar(path, key, df, sheet)
+
+            with self._lock:
+                # drop stale entries for the same file (edited since last read)
+                for old in [k for k in self._frames if k[0][0] == key[0] and k[0] != key]:
+                    del self._frames[old]
+                self._frames[(key, sheet)] = df
+        return df
+
+    def get_table(self, path: str, sheet: str | None = None):
+        """The source as an Arrow table of text columns (``engine="arrow"``), never as a pandas frame when avoidable.
+
+        CSV is parsed straight into Arrow. Excel still goes through the pandas
+        reader once, after which the Feather sidecar is read as Arrow directly.
+        """
+        import pyarrow as pa
+
+        if os.path.splitext(path)[1].lower() == ".csv":
+            return read_csv_arrow(path)
+        key = source_key(path)
+        with self._lock:
+            df = self._frames.get((key, sheet))
+        table = None
+        if df is None and self.sidecar:
+            table = self._read_sidecar_table(path, key, sheet)
+        if table is None:
+            table = pa.Table.from_pandas(_sidecar_frame(self.get(path, sheet)), preserve_index=False)
+        return pa.table({col: text_column(table.column(i)) for i, col in enumerate(UD11_COLUMNS)})
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frames.clear()
+
+    def _read_sidecar(self, path: str, key: CacheKey, sheet: str | None = None) -> pd.DataFrame | None:
+        table = self._read_sidecar_table(path, key, sheet)
+        return None if table is None else table.to_pandas()
+
+    def _read_sidecar_table(self, path: str, key: CacheKey, sheet: str | None = None):
+        side = sidecar_path(path, sheet)
+        if not os.path.exists(side):
+            return None
+        try:
+            import pyarrow.feather as feather
+
+            table = feather.read_table(side)
+        except Exception:
+            return None
+        meta = table.schema.metadata or {}
+        expected = {
+            b"dmt_version": SIDECAR_VERSION.encode(),
+            b"dmt_source_size": str(key[1]).encode(),
+            b"dmt_source_mtime_ns": str(key[2]).encode(),
+        }
+        if any(meta.get(k) != v for k, v in expected.items()):
+            return None
+        return table
+
+    def _write_sidecar(self, path: str, key: CacheKey, df: pd.DataFrame, sheet: str | None = None) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.feather as feather
+        except Exception:
+            return
+        side = sidecar_path(path, sheet)
+        # per process, so batch workers building the same source never share a temporary file
+        tmp = f"{side}.{os.getpid()}.tmp"
+        try:
+            table = pa.Table.from_pandas(_sidecar_frame(df), preserve_index=False)
+            meta = dict(table.schema.metadata or {})
+            meta.update({
+                b"dmt_version": SIDECAR_VERSION.encode(),
+                b"dmt_source_size": str(key[1]).encode(),
+                b"dmt_source_mtime_ns": str(key[2]).encode(),
+            })
+            feather.write_feather(table.replace_schema_metadata(meta), tmp)
+            os.replace(tmp, side)
+        except Exception:
+            # read-only share or unsupported column types: the in-memory cache still applies
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+
+def _sidecar_frame(df: pd.DataFrame) -> pd.DataFrame:
+    # Excel columns often mix numbers and text; store those as text (builders stringify them anyway)
+    out = df.copy()
+    for c in out.columns:
+        if out[c].dtype == object:
+            out[c] = out[c].map(lambda v: v if v is None or (isinstance(v, float) and v != v) else str(v))
+    return out
+
+
+_session_cache = SourceCache()
+
+
+def get_session_cache() -> SourceCache:
+    return _session_cache
+
+
+def read_source(path: str, sheet: str | None = None) -> pd.DataFrame:
+    return _session_cache.get(path, sheet)
+
+
+def read_source_table(path: str, sheet: str | None = None):
+    return _session_cache.get_table(path, sheet)
@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+from .io_utils import UD11_COLUMNS, attribute_rows, get_stem_and_dir, sheet_stem
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+VALIDATION_MODES = ("stop", "warn", "off")
+REPORT_SUFFIX = "_VALIDATION.csv"
+REPORT_COLUMNS = ["Row", "Rule", "Severity", "Column", "Value", "Message"]
+
+# Epicor UD table key fields: Company is nvarchar(8), Key1..Key5 nvarchar(50)
+KEY_MAX_LENGTH = {"Company": 8, "Key1": 50, "Key2": 50, "Key3": 50, "Key4": 50, "Key5": 50}
+# the keys the UD levels are built from; Key5 is only required on variant rows (attribute sources
+# leave it blank, and a mixed source tells its rows apart by Key1). A blank Key4 (part number)
+# still builds, without a Part row, so it is only a warning.
+REQUIRED_KEYS = {
+    "variant": ["Company", "Key1", "Key2", "Key3", "Key5"],
+    "attribute": ["Company", "Key1", "Key2", "Key3"],
+    "mixed": ["Company", "Key1", "Key2", "Key3", "Key5"],
+}
+# source rows are numbered as in Excel: row 1 is the header
+FIRST_DATA_ROW = 2
+
+RULES = {
+    "blank_key": "error",
+    "duplicate_ud11": "error",
+    "key_too_long": "error",
+    "mixed_company": "error",
+    "key5_collision": "error",
+    "padded_key": "warning",
+    "blank_part": "warning",
+}
+
+
+class ValidationError(ValueError):
+    """Raised when a source fails pre-flight validation in ``stop`` mode."""
+
+    def __init__(self, message: str, report_paths: List[str] | None = None, issues: pd.DataFrame | None = None) -> None:
+        super().__init__(message)
+        self.report_paths = report_paths or []
+        self.issues = issues
+
+    def __reduce__(self):
+        # keep the reports and issues when raised in a worker process
+        return type(self), (str(self), self.report_paths, self.issues)
+
+
+def _issues(rows, mask, rule: str, column: str, values, message, codes=None) -> pd.DataFrame | None:
+    """Report rows for ``mask``. ``values`` and ``message`` (unless one string for all) are per row,
+    or per distinct value when the row's ``codes`` are given."""
+    import numpy as np
+    import pandas as pd
+
+    idx = np.flatnonzero(mask)
+    if not len(idx):
+        return None
+    pick = idx if codes is None else codes[idx]
+    return pd.DataFrame({
+        "Row": rows[idx],
+        "Rule": rule,
+        "Severity": RULES[rule],
+        "Column": column,
+        "Value": values[pick],
+        "Message": message if isinstance(message, str) else message[pick],
+    }, columns=REPORT_COLUMNS)
+
+
+def _factorize_text(series: pd.Series):
+    """(codes, unique values as text); blanks/NaN share one code so every check runs on the uniques only."""
+    import numpy as np
+    import pandas as pd
+
+    codes, uniques = pd.factorize(series)
+    values = pd.Series(uniques).astype(str)
+    values = pd.concat([values, pd.Series([""], dtype=values.dtype)], ignore_index=True)
+    codes = np.where(codes < 0, len(values) - 1, codes)
+    return codes, values
+
+
+# combine per-column hashes into one row hash (FNV-style multiply/xor, wraps in uint64)
+_HASH_PRIME = 0x100000001B3
+
+
+class SourceValidator:
+    """Checks a source for the key problems that make a DMT import fail.
+
+    Each key column is factorized once and every string check runs on its
+    distinct values, then maps back to rows through the codes. Rules that
+    span the whole file keep compact state: a 64-bit hash and row number per
+    row for duplicates, Company counts, and the distinct (UD10 key, Key5)
+    pairs for collisions, so the same object validates a whole frame or a
+    stream of chunks.
+    """
+
+    def __init__(self, import_type: str) -> None:
+        self.import_type = import_type
+        self.rows = 0
+        self._found: List[pd.DataFrame] = []
+        self._hashes: list = []
+        self._row_numbers: list = []
+        self._companies: Dict[str, int] = {}
+        self._company_rows: List[pd.DataFrame] = []
+        # Key5: normalized hash -> {raw hash: raw value}, and per chunk the distinct
+        # (row, UD10 key hash, normalized hash, raw hash) tuples
+        self._key5_forms: Dict[int, Dict[int, str]] = {}
+        self._key5: list = []
+
+    def _add(self, found: pd.DataFrame | None) -> None:
+        if found is not None:
+            self._found.append(found)
+
+    def feed(self, df: pd.DataFrame) -> None:
+        import numpy as np
+        import pandas as pd
+
+        first = FIRST_DATA_ROW + self.rows
+        rows = np.arange(first, first + len(df), dtype=np.int64)
+        self.rows += len(df)
+
+        row_hash = np.zeros(len(df), dtype=np.uint64)
+        prime = np.uint64(_HASH_PRIME)
+        ud10_hash = None
+        if self.import_type == "mixed":
+            variant = ~attribute_rows(df["Key1"])
+        else:
+            variant = np.full(len(df), self.import_type == "variant")
+        for col in UD11_COLUMNS:
+            codes, values = _factorize_text(df[col])
+            clean = values.str.strip()
+            blank = (clean == "").to_numpy()
+            padded = (values != clean).to_numpy() & ~blank
+            lengths = values.str.len().to_numpy()
+            limit = KEY_MAX_LENGTH[col]
+            raw = values.to_numpy(dtype=object)
+
+            if col in REQUIRED_KEYS[self.import_type]:
+                missing = blank[codes] & variant if col == "Key5" else blank[codes]
+                self._add(_issues(rows, missing, "blank_key", col, raw, f"{col} is blank", codes))
+            elif col == "Key4" and blank.any():
+                self._add(_issues(rows, blank[codes], "blank_part", col, raw, "Key4 (part number) is blank", codes))
+            if padded.any():
+                self._add(_issues(rows, padded[codes], "padded_key", col, raw, f"{col} has leading or trailing spaces", codes))
+            if (lengths > limit).any():
+                message = np.array([f"{col} is {n} characters (limit {limit})" for n in lengths], dtype=object)
+                self._add(_issues(rows, (lengths > limit)[codes], "key_too_long", col, raw, message, codes))
+
+            # Epicor compares keys without case or surrounding spaces
+            norm_hash = pd.util.hash_array(clean.str.lower().to_numpy(dtype=object))
+            if col == "Key4":
+                ud10_hash = row_hash.copy()
+            row_hash = row_hash * prime ^ norm_hash[codes]
+
+            if col == "Company":
+                counts = np.bincount(codes, minlength=len(values))
+                for value, count in zip(clean, counts):
+                    if count:
+                        self._companies[value] = self._companies.get(value, 0) + int(count)
+                first_idx = pd.Series(codes).drop_duplicates().index.to_numpy()
+                present = codes[first_idx]
+                self._company_rows.append(pd.DataFrame({"Row": rows[first_idx], "Value": raw[present], "Company": clean.to_numpy()[present]}))
+            if col == "Key5" and variant.any():
+                # UD10 key after Key5 -> Key4: (Company, Key1, Key2, Key3, Key5)
+                ud10_hash = ud10_hash * prime ^ norm_hash[codes]
+                raw_hash = pd.util.hash_array(raw)
+                for n, h, value in zip(norm_hash.tolist(), raw_hash.tolist(), raw):
+                    if value.strip():
+                        self._key5_forms.setdefault(n, {})[h] = value
+                keep = ~pd.Series(ud10_hash * prime ^ raw_hash[codes]).duplicated().to_numpy() & variant
+                self._key5.append((rows[keep], ud10_hash[keep], norm_hash[codes[keep]], raw_hash[codes[keep]]))
+
+        self._hashes.append(row_hash)
+        self._row_numbers.append(rows)
+
+    def _duplicates(self) -> pd.DataFrame | None:
+        import numpy as np
+        import pandas as pd
+
+        if not self._hashes:
+            return None
+        hashes = np.concatenate(self._hashes)
+        rows = np.concatenate(self._row_numbers)
+        dup = pd.Series(hashes).duplicated().to_numpy()
+        if not dup.any():
+            return None
+        first_rows = pd.Series(rows[~dup], index=hashes[~dup])
+        message = np.empty(len(rows), dtype=object)
+        message[dup] = [f"same UD11 key as row {r}" for r in first_rows.reindex(hashes[dup]).to_numpy()]
+        return _issues(rows, dup, "duplicate_ud11", "Company..Key5", np.full(len(rows), "", dtype=object), message)
+
+    def _mixed_company(self) -> pd.DataFrame | None:
+        import pandas as pd
+
+        if len(self._companies) <= 1:
+            return None
+        main = max(self._companies, key=self._companies.get)
+        seen = pd.concat(self._company_rows, ignore_index=True).drop_duplicates("Value")
+        odd = (seen["Company"] != main).to_numpy()
+        message = "Company differs from '" + main + "' used by most rows (first row with this value)"
+        return _issues(seen["Row"].to_numpy(), odd, "mixed_company", "Company", seen["Value"].to_numpy(dtype=object), message)
+
+    def _key5_collisions(self) -> pd.DataFrame | None:
+        import numpy as np
+        import pandas as pd
+
+        # only values written more than one way (case, spaces) can collide
+        ambiguous = np.array([n for n, forms in self._key5_forms.items() if len(forms) > 1], dtype=np.uint64)
+        if not len(ambiguous):
+            return None
+        rows, ud10, norm, raw = (np.concatenate(parts) for parts in zip(*self._key5))
+        sel = np.isin(norm, ambiguous)
+        pairs = pd.DataFrame({"Row": rows[sel], "UD10": ud10[sel], "Raw": raw[sel]}).drop_duplicates(["UD10", "Raw"])
+        counts = pairs.groupby("UD10")["Raw"].transform("size")
+        clash = pairs[counts.to_numpy() > 1].sort_values("Row", kind="stable")
+        if clash.empty:
+            return None
+        values = {h: value for forms in self._key5_forms.values() for h, value in forms.items()}
+        clash = clash.assign(Value=clash["Raw"].map(values))
+        first = clash.groupby("UD10")["Value"].transform("first")
+        later = (clash["Value"] != first).to_numpy()
+        message = ("Key5 becomes the same UD10 Key4 as '" + first + "' (first row with this value)").to_numpy(dtype=object)
+        return _issues(clash["Row"].to_numpy(), later, "key5_collision", "Key5", clash["Value"].to_numpy(dtype=object), message)
+
+    def finish(self) -> pd.DataFrame:
+        """All issues, ordered by row."""
+        import pandas as pd
+
+        found = self._found + [f for f in (self._duplicates(), self._mixed_company(), self._key5_collisions()) if f is not None]
+        found = [f for f in found if len(f)]
+        if not found:
+            return pd.DataFrame(columns=REPORT_COLUMNS)
+        issues = pd.concat(found, ignore_index=True)
+        order = {rule: i for i, rule in enumerate(RULES)}
+        issues["_order"] = issues["Rule"].map(order)
+        return issues.sort_values(["Row", "_order"], kind="stable").drop(columns="_order").reset_index(drop=True)
+
+
+def validate_frame(df: pd.DataFrame, import_type: str) -> pd.DataFrame:
+    validator = SourceValidator(import_type)
+    validator.feed(df)
+    return validator.finish()
+
+
+def validate_source(path: str, import_type: str, stream: bool = False, sheet: str | None = None) -> pd.DataFrame:
+    from .io_utils import iter_source_chunks
+
+    validator = SourceValidator(import_type)
+    if stream:
+        for chunk in iter_source_chunks(path, sheet=sheet):
+            validator.feed(chunk)
+    else:
+        from .source_cache import read_source
+
+        validator.feed(read_source(path, sheet))
+    return validator.finish()
+
+
+def report_path_for_source(path: str, output_base: str | None = None, sheet: str | None = None) -> str:
+    stem, base_dir = get_stem_and_dir(path)
+    return os.path.join(output_base or base_dir, f"{sheet_stem(stem, sheet)}{REPORT_SUFFIX}")
+
+
+def source_label(path: str, sheet: str | None = None) -> str:
+    return path if sheet is None else f"{path} [{sheet}]"
+
+
+def summarize_issues(issues: pd.DataFrame) -> List[Tuple[str, str, int]]:
+    """(rule, severity, count) for each rule that fired, in rule order."""
+    counts = issues["Rule"].value_counts()
+    return [(rule, severity, int(counts[rule])) for rule, severity in RULES.items() if rule in counts]
+
+
+def check_sources(
+    files: List[str],
+    import_type: str,
+    mode: str = "stop",
+    stream: bool = False,
+    output_base: str | None = None,
+    sheets: List[str] | None = None,
+    workers: int | None = None,
+) -> Dict[str, Tuple[pd.DataFrame, str | None]]:
+    """Validate every source before anything is built.
+
+    With ``sheets``, each named sheet of the (single) workbook is its own
+    source; several sources are parsed and checked in parallel processes.
+    Writes ``<stem>_VALIDATION.csv`` for each source with issues and returns
+    ``{source label: (issues, report path or None)}``. In ``stop`` mode any
+    error raises :class:`ValidationError`; warnings never stop a run.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    from .io_utils import write_csv
+
+    if mode not in VALIDATION_MODES:
+        raise ValueError(f"Unknown validation mode '{mode}'. Expected one of: {', '.join(VALIDATION_MODES)}.")
+    results: Dict[str, Tuple[pd.DataFrame, str | None]] = {}
+    if mode == "off":
+        return results
+    sources = [(files[0], sheet) for sheet in sheets] if sheets else [(path, None) for path in files]
+    # separate files stay in this process, where the parsed frames are reused by the build
+    workers = min(len(sources), workers or os.cpu_count() or 1) if sheets else 1
+    if workers > 1:
+        # workers also leave a parsed sidecar per sheet behind, so the build reads them back quickly
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            found = list(pool.map(validate_source, *zip(*[(path, import_type, stream, sheet) for path, sheet in sources])))
+    else:
+        found = [validate_source(path, import_type, stream, sheet) for path, sheet in sources]
+    for (path, sheet), issues in zip(sources, found):
+        report = None
+        if len(issues):
+            report = report_path_for_source(path, output_base, sheet)
+            os.makedirs(os.path.dirname(report) or ".", exist_ok=True)
+            write_csv(issues, report)
+        results[source_label(path, sheet)] = (issues, report)
+
+    if mode == "stop":
+        failing = {path: issues for path, (issues, _report) in results.items() if (issues["Severity"] == "error").any()}
+        if failing:
+            parts = []
+            for path, issues in failing.items():
+                counts = ", ".join(f"{count} {rule}" for rule, severity, count in summarize_issues(issues) if severity == "error")
+                parts.append(f"{os.path.basename(path)}: {counts}")
+            reports = [results[path][1] for path in failing]
+            raise ValidationError(f"Validation failed ({'; '.join(parts)}). See {', '.join(reports)}.", reports)
+    return results
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from .batch import normalize_job, run_job
+
+
+SOURCE_EXTS = (".xlsx", ".xls", ".csv")
+SIDECAR_NAME = "dmt_watch.json"
+STATE_NAME = ".dmt_watch_state.json"
+LOG_NAME = "dmt_watch.log"
+QUARANTINE_DIR = "_quarantine"
+POLL_SECONDS = 2.0
+SETTLE_SECONDS = 5.0
+
+# options a sidecar may set besides the normal manifest job fields
+WATCH_KEYS = {"target", "quarantine"}
+
+log = logging.getLogger("dmt_wizard.watch")
+
+Signature = Tuple[int, int]
+
+
+def _warm_worker() -> None:
+    # pay the pandas/builder import once per worker, not once per dropped file
+    import dmt_wizard.app  # noqa: F401
+    import dmt_wizard.builders  # noqa: F401
+    import dmt_wizard.csv_writer  # noqa: F401
+    import dmt_wizard.source_cache  # noqa: F401
+
+
+def is_source_file(name: str) -> bool:
+    # skip Excel owner/lock files (~$Book.xlsx), hidden files and our own sidecars
+    if name.startswith(("~$", ".")):
+        return False
+    return name.lower().endswith(SOURCE_EXTS) and not name.endswith(("_PLAYLIST.csv", "_SUMMARY.csv", "_VALIDATION.csv"))
+
+
+class FolderWatcher:
+    """Polls a drop folder and builds every source file that has stopped changing.
+
+    A file is picked up once its size and mtime have been stable for ``settle``
+    seconds, so half-copied workbooks are never read. Options come from the
+    nearest ``dmt_watch.json`` at or above the file's folder (same fields as a
+    batch manifest job). Builds run on a warm process pool; failed sources are
+    moved to the quarantine folder with an ``.error.txt`` next to them.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        target: str | None = None,
+        workers: int = 2,
+        poll: float = POLL_SECONDS,
+        settle: float = SETTLE_SECONDS,
+    ) -> None:
+        self.root = os.path.abspath(root)
+        self.target = os.path.abspath(target or os.path.join(self.root, "_output"))
+        self.workers = max(1, workers)
+        self.poll = poll
+        self.settle = settle
+        self._seen: Dict[str, Tuple[Signature, float]] = {}  # path -> (signature, first seen with it)
+        self._built: Dict[str, Signature] = {}
+        self._running: Dict[Future, Tuple[str, Signature, dict]] = {}
+        self._configs: Dict[str, Tuple[float, dict]] = {}
+        self._bad_configs: Dict[str, Signature] = {}
+        self._pool: ProcessPoolExecutor | None = None
+        os.makedirs(self.target, exist_ok=True)
+        self._load_state()
+
+    def _state_path(self) -> str:
+        return os.path.join(self.target, STATE_NAME)
+
+    def _load_state(self) -> None:
+        try:
+            with open(self._state_path(), "r", encoding="utf-8") as fh:
+                self._built = {k: tuple(v) for k, v in json.load(fh).items()}
+        except (OSError, ValueError):
+            self._built = {}
+
+    def _save_state(self) -> None:
+        tmp = f"{self._state_path()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(self._built, fh, indent=1)
+        os.replace(tmp, self._state_path())
+
+    def _skip_dirs(self) -> set:
+        return {self.target, os.path.join(self.root, QUARANTINE_DIR)}
+
+    def scan(self) -> Dict[str, Signature]:
+        found: Dict[str, Signature] = {}
+        skip = self._skip_dirs()
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [
+                d for d in dirnames
+                if not d.startswith(".") and not d.endswith("_OUTPUT") and os.path.join(dirpath, d) not in skip
+            ]
+            for name in filenames:
+                if not is_source_file(name):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue  # removed between listing and stat
+                found[path] = (st.st_size, st.st_mtime_ns)
+        return found
+
+    def ready_files(self, now: float | None = None) -> List[Tuple[str, Signature]]:
+        """Files that are new or changed since their last build and have settled."""
+        now = time.monotonic() if now is None else now
+        found = self.scan()
+        in_flight = {path for path, _sig, _cfg in self._running.values()}
+        ready = []
+        for path, sig in found.items():
+            prev = self._seen.get(path)
+            if prev is None or prev[0] != sig:
+                # new or still being written: restart the settle clock
+                self._seen[path] = (sig, now)
+                continue
+            if sig[0] == 0 or now - prev[1] < self.settle:
+                continue
+            if self._built.get(path) == sig or path in in_flight:
+                continue
+            ready.append((path, sig))
+        for path in set(self._seen) - set(found):
+            del self._seen[path]
+        return ready
+
+    def config_for(self, path: str) -> Tuple[str | None, dict]:
+        folder = os.path.dirname(path)
+        while True:
+            sidecar = os.path.join(folder, SIDECAR_NAME)
+            if os.path.exists(sidecar):
+                mtime = os.path.getmtime(sidecar)
+                cached = self._configs.get(sidecar)
+                if cached is None or cached[0] != mtime:
+                    self._configs[sidecar] = (mtime, _load_sidecar(sidecar))
+                return sidecar, self._configs[sidecar][1]
+            if folder == self.root or os.path.dirname(folder) == folder:
+                return None, {}
+            folder = os.path.dirname(folder)
+
+    def job_for(self, path: str) -> dict:
+        sidecar, options = self.config_for(path)
+        job = {k: v for k, v in options.items() if k not in WATCH_KEYS}
+        job["files"] = [path]
+        job.pop("file", None)
+        rel_dir = os.path.relpath(os.path.dirname(path), self.root)
+        target = options.get("target")
+        if target:
+            base = os.path.dirname(sidecar)
+            target = os.path.normpath(target if os.path.isabs(target) else os.path.join(base, target))
+        else:
+            # mirror the drop folder's layout under the target
+            target = os.path.normpath(os.path.join(self.target, rel_dir))
+        os.makedirs(target, exist_ok=True)
+        job["output_dir"] = target
+        if job.get("operation", "add") not in ("add", "delete"):
+            raise ValueError(f"{SIDECAR_NAME}: the watcher builds one file at a time; use operation 'add' or 'delete'.")
+        return normalize_job(job, 0, os.path.dirname(path))
+
+    def quarantine_dir(self, path: str) -> str:
+        try:
+            _sidecar, options = self.config_for(path)
+        except Exception:
+            options = {}
+        folder = options.get("quarantine") or os.path.join(self.root, QUARANTINE_DIR)
+        return folder if os.path.isabs(folder) else os.path.join(self.root, folder)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+        return self._pool
+
+    def submit(self, path: str, sig: Signature) -> None:
+        try:
+            job = self.job_for(path)
+        except Exception as exc:
+            # a bad sidecar is not the source file's fault: log once per file version and leave it in place
+            if self._bad_configs.get(path) != sig:
+                log.error("Cannot build %s: %s", path, exc)
+                self._bad_configs[path] = sig
+            return
+        log.info("Building %s", path)
+        self._running[self._get_pool().submit(run_job, job)] = (path, sig, job)
+
+    def collect(self) -> List[dict]:
+        done = [fut for fut in self._running if fut.done()]
+        rows = []
+        for fut in done:
+            path, sig, job = self._running.pop(fut)
+            try:
+                row = fut.result()
+            except BrokenProcessPool as exc:
+                # a worker died (e.g. out of memory); start a fresh pool for the next files
+                self._pool = None
+                row = {"Job": job["name"], "Status": "failed", "Error": f"worker crashed: {exc}"}
+            except Exception as exc:
+                row = {"Job": job["name"], "Status": "failed", "Error": f"{type(exc).__name__}: {exc}"}
+            row["Source"] = path
+            if row["Status"] == "ok":
+                self._built[path] = sig
+                log.info("Built %s -> %s (%.1fs)", path, row.get("Playlist", ""), row.get("Seconds", 0.0))
+            else:
+                self._quarantine(path, row["Error"])
+            rows.append(row)
+        if done:
+            self._save_state()
+        return rows
+
+    def _quarantine(self, path: str, error: str) -> None:
+        dest_dir = os.path.normpath(os.path.join(self.quarantine_dir(path), os.path.relpath(os.path.dirname(path), self.root)))
+        os.makedirs(dest_dir, exist_ok=True)
+        dest = os.path.join(dest_dir, os.path.basename(path))
+        if os.path.exists(dest):
+            stem, ext = os.path.splitext(dest)
+            dest = f"{stem}_{datetime.now():%Y%m%d_%H%M%S}{ext}"
+        try:
+            shutil.move(path, dest)
+        except OSError as exc:
+            # still locked by the user who dropped it: remember it as failed so it is not retried until edited
+            log.error("Build failed for %s (%s); could not quarantine it: %s", path, error, exc)
+            self._built[path] = self._seen.get(path, ((0, 0), 0.0))[0]
+            return
+        with open(f"{dest}.error.txt", "w", encoding="utf-8") as fh:
+            fh.write(f"{datetime.now().isoformat(timespec='seconds')}\n{path}\n{error}\n")
+        self._built.pop(path, None)
+        log.error("Build failed for %s: %s (moved to %s)", path, error, dest)
+
+    def step(self) -> List[dict]:
+        rows = self.collect()
+        for path, sig in self.ready_files():
+            self.submit(path, sig)
+        return rows
+
+    def run(self, once: bool = False) -> int:
+        """Poll until interrupted; with ``once``, stop after the files present now are built."""
+        log.info("Watching %s -> %s (%d workers)", self.root, self.target, self.workers)
+        failed = 0
+        try:
+            self._get_pool()  # warm up before the first file arrives
+            deadline = time.monotonic() + self.settle + self.poll
+            while True:
+                rows = self.step()
+                failed += sum(1 for row in rows if row["Status"] != "ok")
+                if once and time.monotonic() > deadline and not self._running and not self.ready_files():
+                    break
+                time.sleep(self.poll)
+        except KeyboardInterrupt:
+            log.info("Stopping watcher")
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+            self.collect()
+        return 1 if failed else 0
+
+
+def _load_sidecar(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+    except ValueError as exc:
+        raise ValueError(f"{path}: invalid JSON ({exc}).")
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a JSON object of default job options.")
+    return data
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Watch a drop folder and build every source file saved to it.")
+    parser.add_argument("folder", help="folder to watch (subfolders included)")
+    parser.add_argument("--target", default=None, help="where outputs and playlists go (default: <folder>/_output)")
+    parser.add_argument("--workers", type=int, default=2, help="warm build processes")
+    parser.add_argument("--poll", type=float, default=POLL_SECONDS, help="seconds between folder scans")
+    parser.add_argument("--settle", type=float, default=SETTLE_SECONDS, help="seconds a file must stay unchanged before it is built")
+    parser.add_argument("--once", action="store_true", help="build what is there now, then exit")
+    args = parser.parse_args(argv)
+
+    watcher = FolderWatcher(args.folder, args.target, args.workers, args.poll, args.settle)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s",
+        handlers=[logging.StreamHandler(), logging.FileHandler(os.path.join(watcher.target, LOG_NAME), encoding="utf-8")],
+    )
+    return watcher.run(once=args.once)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
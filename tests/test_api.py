@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+
+import pandas as pd
+
+from dmt_wizard.api import build
+from dmt_wizard.app import run_operation
+
+COLS = ["Company", "Key1", "Key2", "Key3", "Key4", "Key5"]
+OPTIONS = {
+    "type": "mixed",
+    "part": {"parent": "PARENT", "is_new": True, "description": "desc"},
+    "categories": {"website": "SA", "list": ["A-B", "C"], "is_new": True},
+    "shard_rows": 2,
+}
+
+
+def test_build_matches_run_operation(tmp_path):
+    source = tmp_path / "Source.csv"
+    pd.DataFrame([
+        ["SAINC", "Variant", "Size", "Small", "P1", "PARENT"],
+        ["SAINC", "Variant", "Color", "Red, dark", "P2", "PARENT"],
+        ["SAINC", "Attr Tools", "Length", '6"', "", ""],
+        ["SAINC", "Variant", "Size", "Large", "P3", "PARENT"],
+    ], columns=COLS).to_csv(source, index=False)
+
+    result = build(source.read_bytes(), OPTIONS, name="Source.csv")
+    expected = result.csv_files(str(tmp_path / "api"))
+
+    run_operation(
+        "add", [str(source)], "mixed", result.include_tables, True, "PARENT", "SA", True, "desc", "",
+        None, {"website": "SA", "categories": ["A-B", "C"], "is_new": True},
+        output_base=str(tmp_path / "disk"), show_progress=False, shard_rows=2, bundle=False,
+    )
+    for path, data in expected.items():
+        disk = os.path.join(tmp_path / "disk", os.path.relpath(path, tmp_path / "api"))
+        with open(disk, "rb") as fh:
+            written = fh.read()
+        if disk.endswith("_PLAYLIST.csv"):
+            written = written.replace(str(tmp_path / "disk").encode(), str(tmp_path / "api").encode())
+        assert written == data, path
+
+
+def test_api_import_is_prompt_free():
+    code = "import sys, dmt_wizard.api; print(sorted(m for m in ('rich', 'InquirerPy', 'dmt_wizard.app') if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "[]"
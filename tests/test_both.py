@@ -0,0 +1,43 @@
+import os
+
+import pandas as pd
+
+from dmt_wizard.app import both_outputs_collide, run_operation
+
+COLS = ["Company", "Key1", "Key2", "Key3", "Key4", "Key5"]
+
+
+def write_source(path, rows):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pd.DataFrame(rows, columns=COLS).to_csv(path, index=False)
+    return str(path)
+
+
+def test_same_named_files_build_into_separate_folders(tmp_path):
+    old = write_source(tmp_path / "old" / "cat.csv", [["SAINC", "Variant", "Size", "S", "P1", "PARENT"]])
+    new = write_source(tmp_path / "new" / "cat.csv", [["SAINC", "Variant", "Size", "M", "P2", "PARENT"]])
+    out = tmp_path / "out"
+    assert both_outputs_collide([old, new], str(out))
+    assert not both_outputs_collide([old, new])
+
+    _dir, playlist = run_operation(
+        "both", [old, new], "variant", {"UD08", "UD09", "UD10", "UD11"}, False, "", "SA", False, "", "",
+        None, None, output_base=str(out), show_progress=False, bundle=False,
+    )
+    rows = pd.read_csv(playlist, encoding="utf-8-sig", keep_default_na=False)
+    assert len(rows) == 8 and rows["Source"].is_unique
+    for source, delete in zip(rows["Source"], rows["Delete"]):
+        prefix = "DEL_cat" if delete else "ADD_cat"
+        assert os.path.basename(os.path.dirname(source)) == f"{prefix}_OUTPUT"
+    ud11 = {bool(d): pd.read_csv(s, encoding="utf-8-sig")["Key3"].tolist() for s, d in zip(rows["Source"], rows["Delete"]) if s.endswith("_UD11.csv")}
+    assert ud11 == {True: ["S"], False: ["M"]}
+
+
+def test_distinct_names_keep_their_folders(tmp_path):
+    old = write_source(tmp_path / "old.csv", [["SAINC", "Variant", "Size", "S", "P1", "PARENT"]])
+    new = write_source(tmp_path / "new.csv", [["SAINC", "Variant", "Size", "M", "P2", "PARENT"]])
+    run_operation(
+        "both", [old, new], "variant", {"UD11"}, False, "", "SA", False, "", "",
+        None, None, show_progress=False, bundle=False,
+    )
+    assert sorted(p for p in os.listdir(tmp_path) if p.endswith("_OUTPUT")) == ["new_OUTPUT", "old_OUTPUT"]
@@ -0,0 +1,136 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from dmt_wizard import builders
+from dmt_wizard.app import run_operation
+from dmt_wizard.build_cache import BUILD_CACHE_ENV, write_if_changed
+
+COLS = ["Company", "Key1", "Key2", "Key3", "Key4", "Key5"]
+ROWS = [["SAINC", "Variant", "Size", "Small", "P1", "PARENT"], ["SAINC", "Variant", "Size", "Large", "P2", "PARENT"]]
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    calls = []
+    real = builders.build_ud_tables
+
+    def counted(*args, **kwargs):
+        calls.append(args[1])
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(builders, "build_ud_tables", counted)
+    monkeypatch.delenv(BUILD_CACHE_ENV, raising=False)
+    return calls
+
+
+def build(source, out, ud09_sort=None, stream=False, parent="PARENT"):
+    return run_operation(
+        "add", [source], "variant", {"UD08", "UD09", "UD10", "UD11"}, bool(parent), parent, "SA", False, "", "",
+        ud09_sort, None, stream=stream, output_base=str(out), show_progress=False, bundle=False,
+    )
+
+
+def stamps(folder):
+    found = {}
+    for name in sorted(os.listdir(folder)):
+        path = os.path.join(folder, name)
+        if os.path.isfile(path) and name.endswith(".csv"):
+            found[name] = os.stat(path).st_mtime_ns
+    return found
+
+
+def age(folder):
+    # push every output into the past so a rewrite shows up as a new mtime
+    for name in os.listdir(folder):
+        os.utime(os.path.join(folder, name), ns=(10**18, 10**18))
+
+
+def test_unchanged_rerun_skips_build_and_rewrites(tmp_path, builds):
+    source = tmp_path / "Src.csv"
+    pd.DataFrame(ROWS, columns=COLS).to_csv(source, index=False)
+    build(str(source), tmp_path / "out")
+    folder = tmp_path / "out" / "Src_OUTPUT"
+    age(folder)
+    age(tmp_path / "out")
+    before = {**stamps(folder), **stamps(tmp_path / "out")}
+
+    build(str(source), tmp_path / "out")
+    assert builds == ["variant"]
+    assert {**stamps(folder), **stamps(tmp_path / "out")} == before
+    manifest = json.loads((folder / "Src_MANIFEST.json").read_text())
+    assert set(manifest["groups"]) == {"ud", "part"}
+    assert not [name for name in os.listdir(folder) if name.endswith(".tmp")]
+
+
+def test_changed_options_rebuild_but_keep_same_bytes(tmp_path, builds):
+    source = tmp_path / "Src.csv"
+    pd.DataFrame(ROWS, columns=COLS).to_csv(source, index=False)
+    build(str(source), tmp_path / "out")
+    folder = tmp_path / "out" / "Src_OUTPUT"
+    age(folder)
+    before = stamps(folder)
+
+    # a new sort order rebuilds the UD group; only UD09 comes out different
+    build(str(source), tmp_path / "out", ud09_sort={"Large": 1, "Small": 2})
+    assert builds == ["variant", "variant"]
+    after = stamps(folder)
+    assert [name for name in before if after[name] != before[name]] == ["Src_UD09.csv"]
+
+
+def test_edited_source_or_output_is_rebuilt(tmp_path, builds):
+    source = tmp_path / "Src.csv"
+    pd.DataFrame(ROWS, columns=COLS).to_csv(source, index=False)
+    build(str(source), tmp_path / "out")
+    folder = tmp_path / "out" / "Src_OUTPUT"
+    good = (folder / "Src_UD10.csv").read_bytes()
+
+    (folder / "Src_UD10.csv").write_bytes(good.replace(b"Small", b"Smal"))
+    build(str(source), tmp_path / "out")
+    assert (folder / "Src_UD10.csv").read_bytes() == good
+    # a touched but identical file still counts as intact
+    os.utime(folder / "Src_UD10.csv", ns=(10**18, 10**18))
+    build(str(source), tmp_path / "out")
+    assert builds == ["variant", "variant"]
+
+    pd.DataFrame(ROWS + [["SAINC", "Variant", "Size", "Tiny", "P3", "PARENT"]], columns=COLS).to_csv(source, index=False)
+    build(str(source), tmp_path / "out")
+    assert builds == ["variant"] * 3
+    assert b"Tiny" in (folder / "Src_UD10.csv").read_bytes()
+
+
+def test_streamed_ud11_is_left_in_place(tmp_path, builds):
+    source = tmp_path / "Src.csv"
+    pd.DataFrame(ROWS, columns=COLS).to_csv(source, index=False)
+    build(str(source), tmp_path / "out", stream=True, parent="")
+    folder = tmp_path / "out" / "Src_OUTPUT"
+    age(folder)
+    before = stamps(folder)
+    build(str(source), tmp_path / "out", stream=True, parent="")
+    assert stamps(folder) == before
+    assert not [name for name in os.listdir(folder) if name.startswith(".")]
+
+
+def test_cache_off_always_rewrites(tmp_path, builds, monkeypatch):
+    monkeypatch.setenv(BUILD_CACHE_ENV, "off")
+    source = tmp_path / "Src.csv"
+    pd.DataFrame(ROWS, columns=COLS).to_csv(source, index=False)
+    build(str(source), tmp_path / "out")
+    folder = tmp_path / "out" / "Src_OUTPUT"
+    age(folder)
+    before = stamps(folder)
+    build(str(source), tmp_path / "out")
+    assert builds == ["variant", "variant"]
+    assert all(stamp != before[name] for name, stamp in stamps(folder).items())
+    assert not (folder / "Src_MANIFEST.json").exists()
+
+
+def test_write_if_changed(tmp_path):
+    path = str(tmp_path / "T.csv")
+    df = pd.DataFrame(ROWS, columns=COLS)
+    assert write_if_changed(df, path)
+    assert not write_if_changed(df, path)
+    assert write_if_changed(df.iloc[:1], path)
+    assert os.listdir(tmp_path) == ["T.csv"]
@@ -0,0 +1,179 @@
+import pandas as pd
+import pytest
+
+from dmt_wizard.builders import child_part_nums
+
+
+def source(rows):
+    return pd.DataFrame(rows, columns=["Company", "Key1", "Key2", "Key3", "Key4", "Key5"])
+
+
+def test_child_part_nums_without_blank_key4():
+    df = source([
+        ["SAINC", "Variant", "Size", "S", "P1", ""],
+        ["SAINC", "Variant", "Size", "M", "P2", ""],
+        ["SAINC", "Variant", "Color", "Red", "P1", ""],
+        ["SAINC", "Variant", "Color", "Blue", "P3", ""],
+    ])
+    assert list(child_part_nums(df)) == ["P1", "P2", "P3"]
+
+
+def test_child_part_nums_skips_blank_key4():
+    df = source([
+        ["SAINC", "Variant", "Size", "S", "", ""],
+        ["SAINC", "Variant", "Size", "M", "P2", ""],
+        ["SAINC", "Variant", "Color", "Red", "P1", ""],
+        ["SAINC", "Variant", "Color", "Blue", "P2", ""],
+    ])
+    assert list(child_part_nums(df)) == ["P2", "P1"]
+
+
+def test_category_tables_match_plain_rows():
+    from dmt_wizard.builders import build_category_tables
+    from dmt_wizard.records import category_rows
+
+    categories = ["A-B-C", "A", "A--B-", "-A", "A-", "Products-Hoses-Line 1"]
+    tables = build_category_tables("SAINC", "SA", categories, ["P1", "P2"])
+    for name, (columns, rows) in category_rows("SAINC", "SA", categories, ["P1", "P2"]).items():
+        assert list(tables[name].columns) == columns
+        assert tables[name].values.tolist() == rows
+    assert list(tables["UD08"]["Key4"]) == ["A-B", "", "A", "", "", "Products-Hoses"]
+
+
+def reference_levels(df, levels):
+    # the drop_duplicates form the builders replaced: text keys, first occurrence kept
+    text = df.fillna("").astype(str)
+    return {name: text[cols].drop_duplicates().reset_index(drop=True) for name, cols in levels.items()}
+
+
+MESSY = pd.DataFrame({
+    "Company": ["SAINC", "SAINC", None, "SAINC", "SAINC", "SAINC", "SAINC"],
+    "Key1": ["Variant", "Variant", "Variant", "Variant", "Variant", "Variant", "Variant"],
+    "Key2": ["Size", "Size", "Size", "Size", 1, "1", "Size"],
+    "Key3": ["S", "S", "M", None, "L", "L", ""],
+    "Key4": ["P1", "P2", "P3", "P4", "P5", "P6", "P7"],
+    "Key5": ["A", "A", "B", "", 2.5, "2.5", None],
+}, dtype=object)
+
+
+def test_variant_levels_match_drop_duplicates():
+    from dmt_wizard.builders import build_variant_ud_tables
+
+    tables = build_variant_ud_tables(MESSY)
+    expected = reference_levels(MESSY, {
+        "UD10": ["Company", "Key1", "Key2", "Key3", "Key5"],
+        "UD09": ["Company", "Key1", "Key2", "Key3"],
+        "UD08": ["Company", "Key1", "Key2"],
+    })
+    assert tables["UD10"][["Company", "Key1", "Key2", "Key3", "Key4"]].values.tolist() == expected["UD10"].values.tolist()
+    for name in ("UD09", "UD08"):
+        cols = list(expected[name].columns)
+        assert tables[name][cols].values.tolist() == expected[name].values.tolist()
+    assert tables["UD11"].values.tolist() == MESSY.fillna("").astype(str).values.tolist()
+    assert list(tables["UD09"]["Number01"]) == list(range(1, len(tables["UD09"]) + 1))
+
+
+def test_attribute_levels_match_drop_duplicates():
+    from dmt_wizard.builders import build_attribute_ud_tables
+
+    tables = build_attribute_ud_tables(MESSY, {"Size": 5})
+    expected = reference_levels(MESSY, {
+        "UD10": ["Company", "Key1", "Key2", "Key3"],
+        "UD09": ["Company", "Key1", "Key2"],
+    })
+    for name in ("UD10", "UD09"):
+        cols = list(expected[name].columns)
+        assert tables[name][cols].values.tolist() == expected[name].values.tolist()
+    # a blank Company is its own group, so "Size" appears under both companies
+    assert list(tables["UD09"]["Key2"]) == ["Size", "Size", "1"]
+    assert list(tables["UD09"]["Number01"]) == [5, 5, 6]
+
+
+@pytest.mark.parametrize("is_new", [False, True])
+def test_part_table_rows(is_new):
+    from dmt_wizard.builders import build_part_table
+
+    df = source([
+        ["SAINC", "Variant", "Size", "S", "P1", "PARENT"],
+        ["SAINC", "Variant", "Color", "Red", "P1", "PARENT"],
+        ["SAINC", "Variant", "Size", "M", "", "PARENT"],
+        ["SAINC", "Variant", "Size", "L", "P2", "PARENT"],
+    ])
+    part = build_part_table(df, "PARENT", "SA", is_new, "desc", "PC")
+    extra = ["desc", "FG", "PC", "Introduction"] if is_new else []
+    expected = [
+        ["SAINC", "P1", "P1", "", "", True, "Size", "PARENT", "show", "SA"] + extra,
+        ["SAINC", "P2", "P2", "", "", True, "Size", "PARENT", "show", "SA"] + extra,
+    ]
+    if is_new:
+        expected.insert(0, ["SAINC", "PARENT", "PARENT", "PARENT COPY NEEDED", "PARENT COPY NEEDED", True, "Size", "", "show", "SA"] + extra)
+    assert part.values.tolist() == expected
+    assert part["Checkbox11"].dtype == bool
+    assert len(part.columns) == 10 + len(extra)
+
+
+def test_part_table_of_empty_source():
+    from dmt_wizard.builders import build_part_table
+
+    part = build_part_table(source([]), "PARENT", "SA", True, "", "")
+    assert part.values.tolist() == [["SAINC", "PARENT", "PARENT", "PARENT COPY NEEDED", "PARENT COPY NEEDED", True, "", "", "show", "SA", "", "FG", "", "Introduction"]]
+    assert build_part_table(source([]), "PARENT", "SA", False, "", "").empty
+
+
+CATEGORY_EDGES = ["A-B-C", "A", "A--B-", "-A", "A-", "-", "", "--A--B--C--", "Products-Hoses-Line 1", "a b-c d", "Ünï-cødé", "1-2"]
+
+
+@pytest.mark.parametrize("dtype", [object, "str"])
+def test_category_parent_paths_match_scalar_rule(dtype):
+    from dmt_wizard.builders import category_parent_paths
+    from dmt_wizard.records import category_parent_path
+
+    paths = category_parent_paths(pd.Series(CATEGORY_EDGES, dtype=dtype))
+    assert list(paths) == [category_parent_path(c) for c in CATEGORY_EDGES]
+    assert list(paths[:5]) == ["A-B", "", "A", "", ""]
+
+
+# "Red" is a variant Key3 and an attribute Key2 at once
+MIXED = source([
+    ["SAINC", "Variant", "Color", "Red", "P1", "PARENT"],
+    ["SAINC", "Variant", "Color", "Blue", "P2", "PARENT"],
+    ["SAINC", "Attr Paint", "Red", "Matte", "", ""],
+    ["SAINC", "Attr Paint", "Green", "Gloss", "", ""],
+])
+MIXED_SORT = {"variant": {"Blue": 1, "Red": 2}, "attribute": {"Green": 1, "Red": 2}}
+
+
+def mixed_numbers(tables):
+    return {kind: dict(zip(tables[f"{kind}_UD09"][col], tables[f"{kind}_UD09"]["Number01"])) for kind, col in (("Variant", "Key3"), ("Attribute", "Key2"))}
+
+
+def test_mixed_partitions_keep_their_own_ud09_order():
+    from dmt_wizard.builders import StreamingTableBuilder, build_ud_tables, split_by_type
+    from dmt_wizard.sort_store import partition_sort_map
+
+    expected = {"Variant": {"Red": 2, "Blue": 1}, "Attribute": {"Red": 2, "Green": 1}}
+    tables, _part_src = build_ud_tables(MIXED, "mixed", MIXED_SORT)
+    assert mixed_numbers(tables) == expected
+
+    streamed = {}
+    for kind, part in split_by_type(MIXED).items():
+        builder = StreamingTableBuilder(kind, partition_sort_map(MIXED_SORT, kind))
+        builder.feed(part)
+        streamed[f"{kind.title()}_UD09"] = builder.finish()["UD09"]
+    assert mixed_numbers(streamed) == expected
+
+    # a flat map still orders both partitions
+    tables, _part_src = build_ud_tables(MIXED, "mixed", {"Red": 7})
+    assert mixed_numbers(tables) == {"Variant": {"Red": 7, "Blue": 8}, "Attribute": {"Red": 7, "Green": 8}}
+
+
+def test_mixed_partition_order_in_arrow_and_delta():
+    pa = pytest.importorskip("pyarrow")
+    from dmt_wizard.builders import build_ud_tables_arrow
+    from dmt_wizard.delta import build_delta
+
+    expected = {"Variant": {"Red": 2, "Blue": 1}, "Attribute": {"Red": 2, "Green": 1}}
+    tables = build_ud_tables_arrow(pa.Table.from_pandas(MIXED, preserve_index=False), "mixed", MIXED_SORT)
+    assert mixed_numbers({name: tbl.to_pandas() for name, tbl in tables.items()}) == expected
+    added = build_delta(MIXED.iloc[:0], MIXED, "mixed", MIXED_SORT)["add"]
+    assert mixed_numbers(added) == expected
@@ -0,0 +1,73 @@
+import csv
+import os
+import zipfile
+
+import pandas as pd
+
+from dmt_wizard.app import run_operation
+from dmt_wizard.bundle import extract_bundle
+
+COLS = ["Company", "Key1", "Key2", "Key3", "Key4", "Key5"]
+
+
+def make_source(folder):
+    path = os.path.join(folder, "Source.csv")
+    pd.DataFrame([
+        ["SAINC", "Variant", "Size", "Small", "P1", "PARENT"],
+        ["SAINC", "Variant", "Size", "Large", "P2", "PARENT"],
+        ["SAINC", "Variant", "Color", "Red, dark", "P1", "PARENT"],
+    ], columns=COLS).to_csv(path, index=False)
+    return path
+
+
+def build(source, out, **kwargs):
+    return run_operation(
+        "add", [source], "variant", {"UD08", "UD09", "UD10", "UD11"}, True, "PARENT", "SA", True, "desc", "PC",
+        None, {"website": "SA", "categories": ["A-B"], "is_new": True}, output_base=str(out), show_progress=False, **kwargs,
+    )
+
+
+def files(folder):
+    found = {}
+    for root, _dirs, names in os.walk(folder):
+        for name in names:
+            if not name.endswith(("_MANIFEST.json", "_REPORT.json", ".zip")):
+                path = os.path.join(root, name)
+                found[os.path.relpath(path, folder)] = path
+    return found
+
+
+def playlist_sources(path):
+    with open(path, encoding="utf-8-sig", newline="") as fh:
+        return [row["Source"] for row in csv.DictReader(fh)]
+
+
+def test_bundle_extracts_to_the_same_files(tmp_path, monkeypatch):
+    source = make_source(str(tmp_path))
+    _dir, playlist = build(source, tmp_path / "plain", bundle=False)
+    _dir, bundle = build(source, tmp_path / "zip", bundle=True)
+    assert os.listdir(tmp_path / "zip") == ["ADD_Source.zip"]
+    assert "ADD_Source_REPORT.json" in zipfile.ZipFile(bundle).namelist()
+
+    # a relative destination still gives absolute playlist paths
+    monkeypatch.chdir(tmp_path)
+    [extracted] = extract_bundle(bundle, "ext")
+    plain, ext = files(str(tmp_path / "plain")), files(str(tmp_path / "ext"))
+    assert sorted(plain) == sorted(ext)
+    for name, path in plain.items():
+        if not name.endswith("_PLAYLIST.csv"):
+            with open(path, "rb") as a, open(ext[name], "rb") as b:
+                assert a.read() == b.read(), name
+
+    sources = playlist_sources(extracted)
+    assert all(os.path.isabs(p) and os.path.exists(p) for p in sources)
+    assert [os.path.relpath(p, tmp_path / "ext") for p in sources] == [os.path.relpath(p, tmp_path / "plain") for p in playlist_sources(playlist)]
+
+
+def test_bundle_dest_writes_absolute_sources(tmp_path):
+    source = make_source(str(tmp_path))
+    _dir, bundle = build(source, tmp_path / "zip", bundle=True, bundle_dest="/mnt/dmt")
+    with zipfile.ZipFile(bundle) as zf:
+        zf.extract("ADD_Source_PLAYLIST.csv", tmp_path)
+    sources = playlist_sources(tmp_path / "ADD_Source_PLAYLIST.csv")
+    assert sources and all(p.startswith(os.path.join("/mnt/dmt", "Source_OUTPUT")) for p in sources)
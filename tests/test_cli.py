@@ -0,0 +1,22 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "DMT_Wizard.py")
+
+
+@pytest.mark.parametrize("command", ["batch", "watch", "serve", "extract"])
+def test_headless_commands_skip_the_wizard(command):
+    code = (
+        "import runpy, sys\n"
+        f"sys.argv = [{SCRIPT!r}, {command!r}, '--help']\n"
+        "try:\n"
+        f"    runpy.run_path({SCRIPT!r}, run_name='__main__')\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print(sorted(m for m in ('pandas', 'rich', 'InquirerPy', 'dmt_wizard.app') if m in sys.modules))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert out.strip().splitlines()[-1] == "[]"
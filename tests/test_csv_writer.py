@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from dmt_wizard.csv_writer import UTF8_BOM, arrow_supported, iter_arrow_csv, resolve_backend, write_csv_arrow
+from dmt_wizard.io_utils import write_csv
+
+
+def pandas_bytes(df, tmp_path, **kwargs):
+    path = tmp_path / "pandas.csv"
+    df.to_csv(path, index=False, encoding="utf-8-sig", **kwargs)
+    return path.read_bytes()
+
+
+def arrow_bytes(df, tmp_path):
+    path = tmp_path / "arrow.csv"
+    write_csv_arrow(df, str(path))
+    return path.read_bytes()
+
+
+FRAMES = {
+    "plain": pd.DataFrame({"Company": ["SAINC", "SAINC"], "Key1": ["Variant", "Attribute"], "Key2": ["Size", "Color"]}),
+    "quotes_and_commas": pd.DataFrame({"A": ['say "hi"', "a,b", '"', ",", "plain"], "B": ["x", "y", "z", "w", "v"]}),
+    "newlines": pd.DataFrame({"A": ["line1\nline2", "cr\rhere", "crlf\r\nboth", "tab\there"], "B": ["1", "2", "3", "4"]}),
+    "bools_and_ints": pd.DataFrame({"Flag": [True, False, True], "Num": [1, -20, 300], "Big": np.array([2**40, 0, 7], dtype=np.int64)}),
+    "missing_text": pd.DataFrame({"A": ["a", None, np.nan, ""], "B": pd.array(["x", None, "z", pd.NA], dtype="string")}),
+    "unicode": pd.DataFrame({"A": ["em — dash", "45°", "naïve"], "B": ["€", "日本", "ok"]}),
+    "empty": pd.DataFrame({"A": pd.Series([], dtype=str), "B": pd.Series([], dtype=str)}),
+    "quoted_header": pd.DataFrame({"Name, with comma": ["a"], 'Say "x"': ["b"]}),
+}
+
+
+@pytest.mark.parametrize("name", sorted(FRAMES))
+def test_arrow_writer_matches_to_csv(name, tmp_path):
+    df = FRAMES[name]
+    assert arrow_supported(df)
+    assert arrow_bytes(df, tmp_path) == pandas_bytes(df, tmp_path)
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 2, 3, 7, 100])
+def test_chunk_boundaries(chunk_rows, tmp_path):
+    df = pd.DataFrame({
+        "A": [f"row {i}" if i % 3 else f'q"{i},' for i in range(10)],
+        "B": [i % 2 == 0 for i in range(10)],
+        "C": list(range(10)),
+    })
+    data = UTF8_BOM + b"".join(bytes(block) for block in iter_arrow_csv(df, chunk_rows=chunk_rows))
+    assert data == pandas_bytes(df, tmp_path)
+
+
+def test_append_matches_to_csv_append(tmp_path):
+    first = FRAMES["quotes_and_commas"]
+    second = FRAMES["quotes_and_commas"].iloc[::-1]
+    arrow = tmp_path / "arrow.csv"
+    write_csv_arrow(first, str(arrow))
+    write_csv_arrow(second, str(arrow), header=False, append=True)
+    pandas = tmp_path / "pandas.csv"
+    first.to_csv(pandas, index=False, encoding="utf-8-sig")
+    second.to_csv(pandas, index=False, header=False, mode="a", encoding="utf-8")
+    assert arrow.read_bytes() == pandas.read_bytes()
+
+
+@pytest.mark.parametrize("df", [
+    pd.DataFrame({"A": [1.0, 2.5, np.nan], "B": ["x", "y", "z"]}),
+    pd.DataFrame({"A": [1, None, 3], "B": ["x", "y", "z"]}),
+    pd.DataFrame({"A": ["only one column"]}),
+])
+def test_unsupported_frames_fall_back_to_pandas(df, tmp_path):
+    assert not arrow_supported(df)
+    assert resolve_backend(df) == "pandas"
+    path = tmp_path / "out.csv"
+    write_csv(df, str(path))
+    assert path.read_bytes() == pandas_bytes(df, tmp_path)
+
+
+@pytest.mark.parametrize("backend", ["arrow", "pandas"])
+def test_write_csv_backends_agree(backend, tmp_path, monkeypatch):
+    monkeypatch.setenv("DMT_CSV_BACKEND", backend)
+    df = pd.concat([FRAMES["quotes_and_commas"], FRAMES["newlines"]], ignore_index=True)
+    path = tmp_path / "out.csv"
+    write_csv(df, str(path))
+    assert path.read_bytes() == pandas_bytes(df, tmp_path)
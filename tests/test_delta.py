@@ -0,0 +1,46 @@
+import pandas as pd
+
+from dmt_wizard.delta import build_delta
+
+COLS = ["Company", "Key1", "Key2", "Key3", "Key4", "Key5"]
+
+
+def source(rows):
+    return pd.DataFrame(rows, columns=COLS)
+
+
+PREV = source([
+    ["SAINC", "Variant", "Size", "Small", "P1", "PARENT"],
+    ["SAINC", "Variant", "Color", "Red", "P2", "PARENT"],
+    ["SAINC", "Variant", "Color", "Blue", "P3", "PARENT"],
+])
+
+
+def test_removal_only_delta_with_sort_map():
+    delta = build_delta(PREV, PREV.head(1), "variant", {"Size": 1, "Color": 2})
+    assert all(df.empty for df in delta["add"].values())
+    assert list(delta["delete"]["UD11"]["Key4"]) == ["P2", "P3"]
+    assert list(delta["delete"]["UD09"]["Key3"]) == ["Red", "Blue"]
+
+
+def test_added_number01_counts_on_from_previous_snapshot():
+    curr = pd.concat([PREV, source([
+        ["SAINC", "Variant", "Color", "Green", "P4", "PARENT"],
+        ["SAINC", "Variant", "Fit", "Slim", "P5", "PARENT"],
+    ])], ignore_index=True)
+    added = build_delta(PREV, curr, "variant")["add"]["UD09"]
+    assert list(added["Key3"]) == ["Green", "Slim"]
+    assert list(added["Number01"]) == [4, 5]
+
+    # mapped values keep their number; the rest follow the previous snapshot's highest
+    added = build_delta(PREV, curr, "variant", {"Red": 5, "Slim": 2})["add"]["UD09"]
+    assert list(added["Number01"]) == [8, 2]
+
+
+def test_attribute_delta_number01():
+    prev = source([["SAINC", "Attribute", "Fam1", "a", "", ""], ["SAINC", "Attribute", "Fam2", "b", "", ""]])
+    curr = pd.concat([prev, source([["SAINC", "Attribute", "Fam3", "c", "", ""]])], ignore_index=True)
+    added = build_delta(prev, curr, "attribute")["add"]["UD09"]
+    assert list(added["Key2"]) == ["Fam3"]
+    assert list(added["Number01"]) == [3]
+    assert all(df.empty for df in build_delta(curr, prev, "attribute", {"Fam1": 1})["add"].values())
@@ -0,0 +1,68 @@
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from dmt_wizard.app import run_operation
+
+COLS = ["Company", "Key1", "Key2", "Key3", "Key4", "Key5"]
+ROWS = [
+    ["SAINC", "Variant", "Size", "Small", "P1", "PARENT"],
+    ["SAINC", "Variant", "Color", "Red, dark", "P2", "PARENT"],
+    ["SAINC", "Attr Tools", "Length", '6"', "", ""],
+    ["SAINC", "Variant", "Size", "Large", "P3", "PARENT"],
+    ["SAINC", "Variant", "Size", "Small", "P4", ""],
+    ["SAINC", "Attr Tools", "Length", "NA", "", ""],
+    ["", "Variant", "Size", "1", "P5", "2.5"],
+]
+
+
+def outputs(root):
+    found = {}
+    for folder, _dirs, names in os.walk(root):
+        for name in names:
+            path = os.path.join(folder, name)
+            # run metadata, not build output
+            if name.endswith(("_REPORT.json", "_MANIFEST.json")):
+                continue
+            with open(path, "rb") as fh:
+                data = fh.read()
+            if name.endswith("_PLAYLIST.csv"):
+                data = data.replace(os.path.abspath(root).encode(), b"<root>")
+            found[os.path.relpath(path, root)] = data
+    return found
+
+
+def build(engine, files, operation, import_type, tmp_path, **kwargs):
+    out = tmp_path / engine
+    run_operation(
+        operation, files, import_type, {"UD08", "UD09", "UD10", "UD11"}, import_type != "attribute", "PARENT", "SA",
+        True, "desc", "", {"Small": 3}, {"website": "SA", "categories": ["A-B"], "is_new": True},
+        output_base=str(out), show_progress=False, engine=engine, bundle=False, **kwargs,
+    )
+    return outputs(out)
+
+
+@pytest.mark.parametrize("ext", [".csv", ".xlsx"])
+@pytest.mark.parametrize("import_type", ["variant", "mixed"])
+def test_arrow_engine_matches_pandas(ext, import_type, tmp_path):
+    source = str(tmp_path / f"Source{ext}")
+    df = pd.DataFrame(ROWS if import_type == "mixed" else [r for r in ROWS if r[1] == "Variant"], columns=COLS)
+    if ext == ".csv":
+        df.to_csv(source, index=False)
+    else:
+        df.to_excel(source, index=False)
+
+    arrow = build("arrow", [source], "add", import_type, tmp_path, shard_rows=2)
+    assert arrow and arrow == build("pandas", [source], "add", import_type, tmp_path, shard_rows=2)
+
+
+def test_arrow_engine_matches_pandas_for_both(tmp_path):
+    old, new = str(tmp_path / "Old.csv"), str(tmp_path / "New.csv")
+    pd.DataFrame(ROWS[:4], columns=COLS).to_csv(old, index=False)
+    pd.DataFrame(ROWS[2:], columns=COLS).to_csv(new, index=False)
+
+    arrow = build("arrow", [old, new], "both", "mixed", tmp_path)
+    assert arrow and arrow == build("pandas", [old, new], "both", "mixed", tmp_path)
@@ -0,0 +1,75 @@
+import pytest
+
+from dmt_wizard.playlist import build_playlist_columns, build_playlist_graph, schedule_playlist
+
+ALL = {"UD08", "UD09", "UD10", "UD11"}
+
+
+def add(*names, folder="out"):
+    return [(f"{folder}/{name}.csv", "add") for name in names]
+
+
+def delete(*names, folder="out"):
+    return [(f"{folder}/{name}.csv", "delete") for name in names]
+
+
+def plan(entries, tables=ALL):
+    columns, deps = build_playlist_columns(entries, tables)
+    names = [s.split("/")[-1][:-4] for s in columns["Source"]]
+    return names, dict(zip(names, columns["Wait"])), {k.split("/")[-1][:-4]: [d.split("/")[-1][:-4] for d in v] for k, v in deps.items()}
+
+
+def test_adds_run_parents_first_and_wait_only_when_needed():
+    names, wait, deps = plan(add("W_UD11", "W_UD10", "W_UD09", "W_UD08"))
+    assert names == ["W_UD08", "W_UD09", "W_UD10", "W_UD11"]
+    assert wait == {"W_UD08": True, "W_UD09": True, "W_UD10": True, "W_UD11": False}
+    assert deps["W_UD10"] == ["W_UD09"]
+
+
+def test_deletes_run_children_first():
+    names, wait, _deps = plan(delete("W_UD08", "W_UD09", "W_UD10", "W_UD11"))
+    assert names == ["W_UD11", "W_UD10", "W_UD09", "W_UD08"]
+    assert wait["W_UD08"] is False and wait["W_UD11"] is True
+
+
+def test_skipped_tables_are_bridged():
+    _names, _wait, deps = plan(add("W_UD08", "W_UD09", "W_UD10", "W_UD11"), {"UD08", "UD11"})
+    assert deps == {"W_UD08": [], "W_UD11": ["W_UD08"]}
+
+
+def test_shards_of_a_level_share_a_level():
+    entries = add("W_UD09", "W_UD10_0001", "W_UD10_0002", "W_UD11_0001", "W_UD11_0002")
+    nodes, deps = build_playlist_graph(entries, ALL)
+    levels = [[nodes[i][0].split("/")[-1][:-4] for i in level] for level in schedule_playlist(deps)]
+    assert levels == [["W_UD09"], ["W_UD10_0001", "W_UD10_0002"], ["W_UD11_0001", "W_UD11_0002"]]
+
+
+def test_mixed_sets_and_separate_folders_are_independent_chains():
+    entries = add("M_Variant_UD09", "M_Variant_UD10", "M_Attribute_UD09", "M_Attribute_UD10") + add("O_UD09", "O_UD10", folder="other")
+    nodes, deps = build_playlist_graph(entries, ALL)
+    levels = [sorted(nodes[i][0].split("/")[-1][:-4] for i in level) for level in schedule_playlist(deps)]
+    assert levels == [["M_Attribute_UD09", "M_Variant_UD09", "O_UD09"], ["M_Attribute_UD10", "M_Variant_UD10", "O_UD10"]]
+
+
+def test_adds_wait_for_deletes_of_the_same_table():
+    entries = delete("D_UD10", "D_UD09", folder="del") + add("A_UD09", "A_UD10", folder="add")
+    names, wait, deps = plan(entries)
+    assert deps["A_UD09"] == ["D_UD09"]
+    assert sorted(deps["A_UD10"]) == ["A_UD09", "D_UD10"]
+    assert names.index("D_UD09") < names.index("A_UD09") < names.index("A_UD10")
+    assert wait["D_UD10"] and wait["D_UD09"] and wait["A_UD09"] and not wait["A_UD10"]
+
+
+def test_category_assignments_wait_for_category_and_part():
+    entries = add("W_UD11", "W_Categories_UD11", "W_Part", "W_Categories_UD08")
+    names, wait, deps = plan(entries)
+    assert sorted(deps["W_Categories_UD11"]) == ["W_Categories_UD08", "W_Part"]
+    assert names[-1] == "W_Categories_UD11"
+    assert wait == {"W_UD11": False, "W_Part": True, "W_Categories_UD08": True, "W_Categories_UD11": False}
+    # free-running imports of a level start before the ones a later level waits for
+    assert names[0] == "W_UD11"
+
+
+def test_cycle_is_rejected():
+    with pytest.raises(ValueError, match="cycle"):
+        schedule_playlist({0: {1}, 1: {0}})
@@ -0,0 +1,96 @@
+import http.client
+import io
+import json
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from dmt_wizard import serve
+from dmt_wizard.serve import OPTIONS_HEADER, BuildServer
+
+COLS = ["Company", "Key1", "Key2", "Key3", "Key4", "Key5"]
+ROWS = [["SAINC", "Variant", "Size", "Small", "P1", "PARENT"], ["SAINC", "Variant", "Size", "Large", "P2", "PARENT"]]
+
+
+@pytest.fixture
+def server():
+    # builds run on a thread instead of warm processes so the test can hold one open
+    srv = BuildServer(("127.0.0.1", 0), workers=1, queue=0, max_upload=4096)
+    srv._pool = ThreadPoolExecutor(1)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def request(srv, method, path, body=None, headers=None):
+    conn = http.client.HTTPConnection(*srv.server_address, timeout=30)
+    try:
+        conn.request(method, path, body=body, headers=headers or {})
+        response = conn.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        conn.close()
+
+
+def source_bytes(rows=ROWS):
+    return pd.DataFrame(rows, columns=COLS).to_csv(index=False).encode("utf-8")
+
+
+def test_build_returns_a_zip(server):
+    status, headers, body = request(server, "POST", "/build?name=Src.csv", source_bytes(), {OPTIONS_HEADER: json.dumps({"type": "variant"})})
+    assert status == 200
+    assert headers["Content-Disposition"] == 'attachment; filename="ADD_Src.zip"'
+    names = zipfile.ZipFile(io.BytesIO(body)).namelist()
+    assert "ADD_Src_PLAYLIST.csv" in names
+    assert "Src_OUTPUT/Src_UD09.csv" in names
+
+
+def test_upload_above_the_limit_is_refused(server):
+    status, headers, body = request(server, "POST", "/build?name=Big.csv", b"x" * 4097)
+    assert status == 413
+    assert headers["Connection"] == "close"
+    assert "4096 bytes" in json.loads(body)["error"]
+    # the refused upload never reaches a worker
+    assert server.in_flight == 0
+
+
+def test_full_pool_answers_503_until_a_slot_frees(server, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+
+    def held(*args):
+        started.set()
+        release.wait(30)
+        return b"zip", "ADD_Held"
+
+    monkeypatch.setattr(serve, "build_zip", held)
+    first = {}
+    worker = threading.Thread(target=lambda: first.update(reply=request(server, "POST", "/build?name=A.csv", source_bytes())))
+    worker.start()
+    assert started.wait(30)
+
+    status, headers, body = request(server, "GET", "/health")
+    assert json.loads(body)["in_flight"] == 1
+    status, headers, body = request(server, "POST", "/build?name=B.csv", source_bytes())
+    assert status == 503
+    assert headers["Retry-After"] == "1"
+    assert "busy" in json.loads(body)["error"]
+
+    release.set()
+    worker.join(30)
+    assert first["reply"][0] == 200 and first["reply"][2] == b"zip"
+    # the slot is back once the held build finishes
+    assert request(server, "POST", "/build?name=C.csv", source_bytes())[0] == 200
+
+
+@pytest.mark.parametrize("path, body, headers, status", [
+    ("/build?name=Src.csv", b"", {}, 400),
+    ("/build?name=Src.csv", b"a", {OPTIONS_HEADER: "[1]"}, 400),
+    ("/other", b"a", {}, 404),
+])
+def test_bad_requests(server, path, body, headers, status):
+    assert request(server, "POST", path, body, headers)[0] == status
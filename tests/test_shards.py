@@ -0,0 +1,89 @@
+import os
+
+import pandas as pd
+import pytest
+
+from dmt_wizard.app import run_operation
+from dmt_wizard.io_utils import ShardedAppender, split_shards
+from dmt_wizard.playlist import _table_from_path
+
+COLS = ["Company", "Key1", "Key2", "Key3", "Key4", "Key5"]
+
+
+def rows(n, start=0):
+    return pd.DataFrame([["SAINC", "Variant", "Size", str(i), f"P{i}", "PARENT"] for i in range(start, start + n)], columns=COLS)
+
+
+@pytest.mark.parametrize("n, shard_rows, expected", [
+    (5, None, [("T_UD11.csv", 5)]),
+    (5, 5, [("T_UD11.csv", 5)]),
+    (5, 2, [("T_UD11_0001.csv", 2), ("T_UD11_0002.csv", 2), ("T_UD11_0003.csv", 1)]),
+    (4, 2, [("T_UD11_0001.csv", 2), ("T_UD11_0002.csv", 2)]),
+])
+def test_split_shards(n, shard_rows, expected):
+    df = rows(n)
+    shards = split_shards(df, "T_UD11.csv", shard_rows)
+    assert [(path, len(part)) for path, part in shards] == expected
+    assert pd.concat([part for _path, part in shards]).equals(df)
+
+
+def test_split_shards_arrow():
+    pa = pytest.importorskip("pyarrow")
+    table = pa.Table.from_pandas(rows(5), preserve_index=False)
+    shards = split_shards(table, "T_UD11.csv", 2)
+    assert [(path, part.num_rows) for path, part in shards] == [("T_UD11_0001.csv", 2), ("T_UD11_0002.csv", 2), ("T_UD11_0003.csv", 1)]
+    assert pa.concat_tables([part for _path, part in shards]).equals(table)
+
+
+def test_sharded_appender_rolls_over_mid_chunk(tmp_path):
+    out = ShardedAppender(str(tmp_path / "T_UD11.csv"), 3)
+    for start, n in ((0, 2), (2, 5), (7, 1)):
+        out.append(rows(n, start))
+    paths = out.close(COLS)
+    assert [os.path.basename(p) for p in paths] == ["T_UD11_0001.csv", "T_UD11_0002.csv", "T_UD11_0003.csv"]
+    frames = [pd.read_csv(p, dtype=str, keep_default_na=False) for p in paths]
+    assert [len(f) for f in frames] == [3, 3, 2]
+    assert pd.concat(frames, ignore_index=True).equals(rows(8))
+
+
+def test_sharded_appender_single_shard_and_empty(tmp_path):
+    out = ShardedAppender(str(tmp_path / "A_UD11.csv"), 10)
+    out.append(rows(4))
+    assert out.close(COLS) == [str(tmp_path / "A_UD11.csv")]
+    assert not os.path.exists(tmp_path / "A_UD11_0001.csv")
+
+    empty = ShardedAppender(str(tmp_path / "B_UD11.csv"), 10)
+    assert empty.close(COLS) == [str(tmp_path / "B_UD11.csv")]
+    assert pd.read_csv(tmp_path / "B_UD11.csv").columns.tolist() == COLS
+
+
+@pytest.mark.parametrize("path, table", [
+    ("out/Widgets_UD11.csv", "UD11"),
+    ("out/Widgets_UD11_0002.csv", "UD11"),
+    ("out/Widgets_Variant_UD09_0001.csv", "UD09"),
+    ("out/Widgets_Categories_UD08_0010.csv", "UD08"),
+    # a stem ending in digits is not a shard index
+    ("out/Parts_2024_UD10.csv", "UD10"),
+    ("out/Parts_2024_UD10_0001.csv", "UD10"),
+    ("out/Widgets_Part.csv", "Part"),
+])
+def test_table_from_path_strips_shard_suffix(path, table):
+    assert _table_from_path(path) == table
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_sharded_build_lists_every_shard_in_order(stream, tmp_path):
+    source = str(tmp_path / "Parts_2024.csv")
+    rows(5).to_csv(source, index=False)
+    _folder, playlist = run_operation(
+        "add", [source], "variant", {"UD08", "UD09", "UD10", "UD11"}, False, "", "SA", False, "", "",
+        None, None, stream=stream, output_base=str(tmp_path / "out"), show_progress=False, bundle=False, shard_rows=2,
+    )
+    df = pd.read_csv(playlist)
+    ud11 = [os.path.basename(s) for s in df.loc[df["Import"] == "UD11", "Source"]]
+    assert ud11 == ["Parts_2024_UD11_0001.csv", "Parts_2024_UD11_0002.csv", "Parts_2024_UD11_0003.csv"]
+    ud09 = [os.path.basename(s) for s in df.loc[df["Import"] == "UD09", "Source"]]
+    assert ud09 == ["Parts_2024_UD09_0001.csv", "Parts_2024_UD09_0002.csv", "Parts_2024_UD09_0003.csv"]
+    # one UD08 row fits in a single shard
+    assert [os.path.basename(s) for s in df.loc[df["Import"] == "UD08", "Source"]] == ["Parts_2024_UD08.csv"]
+    assert all(os.path.exists(s) for s in df["Source"])
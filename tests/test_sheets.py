@@ -0,0 +1,80 @@
+import os
+
+import pandas as pd
+import pytest
+
+from dmt_wizard.app import run_operation
+from dmt_wizard.batch import normalize_job, run_job
+
+COLS = ["Company", "Key1", "Key2", "Key3", "Key4", "Key5"]
+SHEETS = {
+    "Sizes": [["SAINC", "Variant", "Size", "Small", "P1", "PARENT"], ["SAINC", "Variant", "Size", "Large", "P2", "PARENT"]],
+    "Colors": [["SAINC", "Variant", "Color", "Red", "P3", "PARENT"]],
+    "Tools": [["SAINC", "Attr Tools", "Length", "6in", "", ""], ["SAINC", "Attr Tools", "Length", "8in", "", ""]],
+}
+
+
+def write_book(path, sheets):
+    with pd.ExcelWriter(path) as writer:
+        for name, rows in sheets.items():
+            pd.DataFrame(rows, columns=COLS).to_excel(writer, sheet_name=name, index=False)
+    return str(path)
+
+
+def outputs(root):
+    found = {}
+    for folder, _dirs, names in os.walk(root):
+        for name in names:
+            if name.endswith("_UD08.csv") or name.endswith(("_UD09.csv", "_UD10.csv", "_UD11.csv")):
+                with open(os.path.join(folder, name), "rb") as fh:
+                    found[os.path.relpath(os.path.join(folder, name), root)] = fh.read()
+    return found
+
+
+def build(files, tmp_path, out, import_type="variant", **kwargs):
+    return run_operation(
+        "add", files, import_type, {"UD08", "UD09", "UD10", "UD11"}, False, "", "SA", False, "", "",
+        None, None, output_base=str(tmp_path / out), show_progress=False, bundle=False, **kwargs,
+    )
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_each_sheet_builds_like_its_own_workbook(workers, tmp_path):
+    variant = {name: rows for name, rows in SHEETS.items() if name != "Tools"}
+    book = write_book(tmp_path / "Book.xlsx", variant)
+    _folder, playlist = build([book], tmp_path, "sheets", sheets=list(variant), workers=workers)
+
+    # the same rows as separate workbooks named like the sheet outputs
+    single = tmp_path / "single"
+    single.mkdir()
+    for name, rows in variant.items():
+        build([write_book(single / f"Book_{name}.xlsx", {"Sheet1": rows})], tmp_path, "separate")
+
+    built = outputs(tmp_path / "sheets")
+    assert sorted(built) == sorted(os.path.join(f"Book_{s}_OUTPUT", f"Book_{s}_{t}.csv") for s in variant for t in ("UD08", "UD09", "UD10", "UD11"))
+    assert built == outputs(tmp_path / "separate")
+
+    sources = pd.read_csv(playlist)["Source"].tolist()
+    assert os.path.basename(playlist) == "ADD_Book_PLAYLIST.csv"
+    assert {os.path.basename(os.path.dirname(s)) for s in sources} == {"Book_Sizes_OUTPUT", "Book_Colors_OUTPUT"}
+
+
+def test_sheets_need_add_or_delete(tmp_path):
+    book = write_book(tmp_path / "Book.xlsx", SHEETS)
+    with pytest.raises(ValueError, match="Add or Delete"):
+        run_operation(
+            "both", [book, book], "variant", {"UD11"}, False, "", "SA", False, "", "",
+            None, None, output_base=str(tmp_path / "out"), show_progress=False, bundle=False, sheets=["Sizes"],
+        )
+
+
+def test_batch_detects_type_over_every_sheet(tmp_path):
+    write_book(tmp_path / "Book.xlsx", SHEETS)
+    job = normalize_job({"file": "Book.xlsx", "sheets": "all", "output_dir": "out"}, 0, str(tmp_path))
+    row = run_job(job)
+    assert row["Status"] == "ok" and row["Type"] == "mixed"
+    built = outputs(tmp_path / "out")
+    # the attribute sheet goes through the attribute builder, the variant sheets through the variant one
+    assert os.path.join("Book_Tools_OUTPUT", "Book_Tools_Attribute_UD09.csv") in built
+    assert os.path.join("Book_Sizes_OUTPUT", "Book_Sizes_Variant_UD08.csv") in built
+    assert not any(name.startswith("Book_Tools_OUTPUT") and "Variant" in name for name in built)
@@ -0,0 +1,104 @@
+import os
+
+import pandas as pd
+import pytest
+
+from dmt_wizard.batch import normalize_job, run_job
+from dmt_wizard.sort_store import (
+    SORT_STORE_ENV,
+    SortStore,
+    default_store_path,
+    known_sort_map,
+    remember_sort_map,
+    stored_sort_map,
+    ud09_keys,
+)
+
+COLS = ["Company", "Key1", "Key2", "Key3", "Key4", "Key5"]
+# "Red" is a variant Key3 and an attribute Key2 at once
+MIXED = pd.DataFrame([
+    ["SAINC", "Variant", "Color", "Red", "P1", "PARENT"],
+    ["SAINC", "Variant", "Color", "Blue", "P2", "PARENT"],
+    ["SAINC", "Attr Paint", "Red", "Matte", "", ""],
+    ["SAINC", "Attr Paint", "Green", "Gloss", "", ""],
+], columns=COLS)
+
+
+def test_mixed_orders_round_trip_per_partition(tmp_path):
+    store = str(tmp_path / "sort.sqlite")
+    order = {"variant": {"Blue": 1, "Red": 2}, "attribute": {"Green": 1, "Red": 2}}
+    assert stored_sort_map(MIXED, "mixed", order, store) == order
+    assert known_sort_map(ud09_keys(MIXED, "mixed"), "mixed", store) == order
+    # later entries win per partition and leave the other partition's order alone
+    assert stored_sort_map(MIXED, "mixed", {"variant": {"Red": 1, "Blue": 2}}, store) == {"variant": {"Red": 1, "Blue": 2}, "attribute": {"Green": 1, "Red": 2}}
+
+
+def test_batch_job_takes_a_per_partition_order(tmp_path):
+    job = normalize_job({"file": "Mixed.csv", "type": "mixed", "ud09_sort": {"variant": {"Red": "2"}, "attribute": {"Red": 1}}}, 0, str(tmp_path))
+    assert job["ud09_sort"] == {"variant": {"Red": 2}, "attribute": {"Red": 1}}
+    assert normalize_job({"file": "Mixed.csv", "ud09_sort": {"Red": 3}}, 0, str(tmp_path))["ud09_sort"] == {"Red": 3}
+    with pytest.raises(ValueError, match="partitions"):
+        normalize_job({"file": "Mixed.csv", "ud09_sort": {"colour": {"Red": 1}}}, 0, str(tmp_path))
+
+
+VARIANT = pd.DataFrame([
+    ["SAINC", "Variant", "Size", "Small", "P1", "PARENT"],
+    ["SAINC", "Variant", "Size", "Large", "P2", "PARENT"],
+    ["SAINC", "Variant", "Size", "Small", "P3", "OTHER"],
+    ["SAINC", "Variant", "Width", "Small", "P4", "PARENT"],
+    ["SAINC", "Variant", "Size", " ", "P5", "PARENT"],
+], columns=COLS)
+
+
+def test_ud09_keys_are_unique_records_without_blanks():
+    assert ud09_keys(VARIANT, "variant") == [
+        ("SAINC", "Variant", "Size", "Small"),
+        ("SAINC", "Variant", "Size", "Large"),
+        ("SAINC", "Variant", "Width", "Small"),
+    ]
+    attribute = VARIANT.assign(Key1="Attr Tools")
+    assert ud09_keys(attribute, "attribute") == [("SAINC", "Attr Tools", "Size", ""), ("SAINC", "Attr Tools", "Width", "")]
+
+
+def test_orders_round_trip_per_record(tmp_path):
+    store = str(tmp_path / "sort.sqlite")
+    keys = ud09_keys(VARIANT, "variant")
+    assert known_sort_map(keys, "variant", store) == {}
+    assert remember_sort_map(keys, "variant", {"Large": 1, "Small": 2, "Unused": 3}, store) == 3
+    assert known_sort_map(keys, "variant", store) == {"Large": 1, "Small": 2}
+
+    # another family only gets orders saved for its own records
+    other = [("SAINC", "Variant", "Color", "Small"), ("SAINC", "Variant", "Width", "Small")]
+    assert known_sort_map(other, "variant", store) == {"Small": 2}
+    assert known_sort_map(other[:1], "variant", store) == {}
+
+    with SortStore(store) as opened:
+        assert opened.lookup([("SAINC", "Variant", "Size", "Large")]) == {("SAINC", "Variant", "Size", "Large"): 1}
+
+
+def test_explicit_entries_win_and_are_saved(tmp_path):
+    store = str(tmp_path / "sort.sqlite")
+    assert stored_sort_map(VARIANT, "variant", {"Small": 1, "Large": 2}, store) == {"Small": 1, "Large": 2}
+    assert stored_sort_map(VARIANT, "variant", {"Large": 5}, store) == {"Small": 1, "Large": 5}
+    assert stored_sort_map(VARIANT, "variant", None, store) == {"Small": 1, "Large": 5}
+
+
+def test_store_path_from_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv(SORT_STORE_ENV, str(tmp_path / "shared" / "sort.sqlite"))
+    assert default_store_path() == str(tmp_path / "shared" / "sort.sqlite")
+    stored_sort_map(VARIANT, "variant", {"Small": 3}, None)
+    assert os.path.exists(tmp_path / "shared" / "sort.sqlite")
+    assert known_sort_map(ud09_keys(VARIANT, "variant"), "variant") == {"Small": 3}
+
+
+def test_batch_job_reads_orders_from_the_add_side(tmp_path):
+    store = str(tmp_path / "sort.sqlite")
+    stored_sort_map(VARIANT, "variant", {"Small": 2, "Large": 1}, store)
+    old, new = tmp_path / "Old.csv", tmp_path / "New.csv"
+    VARIANT.iloc[:0].to_csv(old, index=False)
+    VARIANT.iloc[:4].to_csv(new, index=False)
+    job = normalize_job({"files": [str(old), str(new)], "operation": "both", "type": "variant", "sort_store": store}, 0, str(tmp_path))
+    row = run_job(job)
+    assert row["Status"] == "ok"
+    ud09 = pd.read_csv(tmp_path / "New_OUTPUT" / "New_UD09.csv", keep_default_na=False)
+    assert dict(zip(ud09["Key2"] + "/" + ud09["Key3"], ud09["Number01"])) == {"Size/Small": 2, "Size/Large": 1, "Width/Small": 2}
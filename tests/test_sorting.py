@@ -0,0 +1,82 @@
+import pytest
+
+from dmt_wizard.sorting import order_to_map, parse_number, parse_order_text, read_order_file, sort_values
+
+VALUES = ["Size 10", "size 2", "Size 1/2", "Size 3/8", "Blue"]
+SIZES = ['1"', "10mm", '1/4"', '3/8"', "1-1/4\"", "2 ft", "Large"]
+
+
+@pytest.mark.parametrize("text, number", [("3/8", 0.375), ("1-1/4", 1.25), ("1 1/4", 1.25), ("2.5", 2.5), (".75", 0.75), ("12", 12.0)])
+def test_parse_number(text, number):
+    assert parse_number(text) == number
+
+
+def test_natural_sort_compares_numbers_by_value_and_ignores_case():
+    assert sort_values(VALUES) == ["Blue", "Size 3/8", "Size 1/2", "size 2", "Size 10"]
+
+
+def test_numeric_sort_converts_units():
+    # 1/4" = 6.35mm, 3/8" = 9.5mm, then 10mm before 1" (25.4mm); text without a size goes last
+    assert sort_values(SIZES, "numeric") == ['1/4"', '3/8"', "10mm", '1"', '1-1/4"', "2 ft", "Large"]
+
+
+def test_unknown_sort_mode():
+    with pytest.raises(ValueError, match="Unknown sort mode"):
+        sort_values(VALUES, "random")
+
+
+def test_pasted_order_by_position_and_by_number():
+    values = ["Red", "Blue", "Green", "Dark, Grey"]
+    mapping, unknown = parse_order_text("  blue\n\nRED\nPurple\nred\n", values)
+    # matching ignores case and spaces; repeats keep their first place
+    assert mapping == {"Blue": 1, "Red": 2}
+    assert unknown == ["Purple"]
+
+    mapping, unknown = parse_order_text("Green\t5\nDark, Grey\t2\nBlue=7\n", values)
+    assert mapping == {"Green": 5, "Dark, Grey": 2, "Blue": 7} and unknown == []
+
+
+def test_order_files(tmp_path):
+    values = ["Red", "Blue", "Dark, Grey"]
+    csv_path = tmp_path / "order.csv"
+    csv_path.write_text('Value,Number01\n"Dark, Grey",3\nred,1\n', encoding="utf-8-sig")
+    assert read_order_file(str(csv_path), values) == ({"Dark, Grey": 3, "Red": 1}, [])
+
+    txt_path = tmp_path / "order.txt"
+    txt_path.write_text("Blue\nRed\n")
+    assert read_order_file(str(txt_path), values) == ({"Blue": 1, "Red": 2}, [])
+
+
+def test_order_to_map():
+    assert order_to_map(["b", "a"]) == {"b": 1, "a": 2}
+
+
+def run_editor(values, keys):
+    pytest.importorskip("prompt_toolkit")
+    from prompt_toolkit.application import create_app_session
+    from prompt_toolkit.input import create_pipe_input
+    from prompt_toolkit.output import DummyOutput
+
+    from dmt_wizard.sort_editor import edit_order
+
+    with create_pipe_input() as inp:
+        inp.send_text(keys)
+        with create_app_session(input=inp, output=DummyOutput()):
+            return edit_order(values)
+
+
+DOWN = "\x1b[B"
+
+
+def test_editor_moves_a_picked_up_row():
+    assert run_editor(["a", "b", "c", "d"], f" {DOWN}{DOWN} \r") == ["b", "c", "a", "d"]
+
+
+def test_editor_sorts_and_moves_to_a_position():
+    # the cursor follows its row through the sort; "4" Enter then moves that row to position 4
+    assert run_editor(["10mm", '1/4"', '1"', '3/8"'], "u4\r\r") == ['1/4"', '3/8"', '1"', "10mm"]
+    assert run_editor(["a", "b"], "r\r") == ["b", "a"]
+
+
+def test_editor_cancel():
+    assert run_editor(["a", "b"], "\x1b") is None
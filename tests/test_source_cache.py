@@ -0,0 +1,78 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from dmt_wizard import source_cache
+from dmt_wizard.source_cache import SourceCache, sidecar_path
+
+COLS = ["Company", "Key1", "Key2", "Key3", "Key4", "Key5"]
+
+
+def write_source(path, n=3):
+    pd.DataFrame([["SAINC", "Variant", "Size", str(i), f"P{i}", ""] for i in range(n)], columns=COLS).to_csv(path, index=False)
+    return str(path)
+
+
+def counting_reader(monkeypatch, delay=0.05):
+    calls = []
+    lock = threading.Lock()
+    real = source_cache.read_excel_normalized
+
+    def read(path, sheet=None):
+        with lock:
+            calls.append(os.path.basename(path))
+        # slow enough for the other threads to arrive while this one parses
+        time.sleep(delay)
+        return real(path, sheet)
+
+    monkeypatch.setattr(source_cache, "read_excel_normalized", read)
+    return calls
+
+
+def test_concurrent_gets_parse_each_source_once(tmp_path, monkeypatch):
+    calls = counting_reader(monkeypatch)
+    paths = [write_source(tmp_path / f"s{i}.csv") for i in range(3)]
+    cache = SourceCache()
+    with ThreadPoolExecutor(max_workers=12) as pool:
+        frames = list(pool.map(cache.get, paths * 8))
+    assert sorted(calls) == ["s0.csv", "s1.csv", "s2.csv"]
+    for path, df in zip(paths * 8, frames):
+        assert df is cache.get(path)
+    assert all(os.path.exists(sidecar_path(path)) for path in paths)
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_concurrent_gets_evict_edited_sources(tmp_path, monkeypatch):
+    counting_reader(monkeypatch, delay=0.001)
+    cache = SourceCache(sidecar=False)
+    paths = [write_source(tmp_path / f"s{i}.csv") for i in range(4)]
+    errors = []
+
+    def reader(path):
+        try:
+            for _ in range(20):
+                cache.get(path)
+        except Exception as exc:
+            errors.append(exc)
+
+    def editor():
+        for n in range(4, 14):
+            for path in paths:
+                # replaced whole, so a reader never sees half a file
+                write_source(f"{path}.new", n)
+                os.utime(f"{path}.new", ns=(n * 10**9, n * 10**9))
+                os.replace(f"{path}.new", path)
+
+    threads = [threading.Thread(target=reader, args=(p,)) for p in paths * 3] + [threading.Thread(target=editor)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    for path in paths:
+        assert len(cache.get(path)) == 13
+    # only the current version of each file stays cached
+    assert len(cache._frames) == len(paths)
@@ -0,0 +1,127 @@
+import os
+
+import pandas as pd
+import pytest
+
+from dmt_wizard.io_utils import iter_source_chunks
+from dmt_wizard.validation import SourceValidator, ValidationError, check_sources, validate_frame
+
+COLS = ["Company", "Key1", "Key2", "Key3", "Key4", "Key5"]
+CLEAN = [
+    ["SAINC", "Variant", "Size", "Small", "P1", "PARENT"],
+    ["SAINC", "Variant", "Size", "Large", "P2", "PARENT"],
+    ["SAINC", "Variant", "Color", "Red", "P3", "PARENT"],
+]
+
+
+def frame(rows):
+    return pd.DataFrame(rows, columns=COLS)
+
+
+def found(issues, rule):
+    """(Row, Column) of each issue raised by ``rule``."""
+    hits = issues[issues["Rule"] == rule]
+    return list(zip(hits["Row"].tolist(), hits["Column"].tolist()))
+
+
+def test_clean_source_has_no_issues():
+    assert validate_frame(frame(CLEAN), "variant").empty
+
+
+@pytest.mark.parametrize("column", ["Company", "Key1", "Key2", "Key3", "Key5"])
+def test_blank_key(column):
+    rows = [list(r) for r in CLEAN]
+    rows[1][COLS.index(column)] = "  "
+    issues = validate_frame(frame(rows), "variant")
+    # Excel numbering: the header is row 1
+    assert found(issues, "blank_key") == [(3, column)]
+    assert set(issues.loc[issues["Rule"] == "blank_key", "Severity"]) == {"error"}
+
+
+def test_blank_key5_allowed_on_attribute_rows():
+    rows = CLEAN + [["SAINC", "Attr Tools", "Length", "6in", "P4", ""]]
+    assert validate_frame(frame(rows), "mixed").empty
+    assert found(validate_frame(frame(rows[3:]), "attribute"), "blank_key") == []
+    assert found(validate_frame(frame(rows[3:]), "variant"), "blank_key") == [(2, "Key5")]
+
+
+@pytest.mark.parametrize("import_type", ["variant", "attribute", "mixed"])
+def test_blank_key4_is_a_warning(import_type, tmp_path):
+    rows = [list(r) for r in CLEAN]
+    rows[0][4] = ""
+    issues = validate_frame(frame(rows), import_type)
+    assert found(issues, "blank_part") == [(2, "Key4")]
+    assert set(issues["Severity"]) == {"warning"}
+
+    path = str(tmp_path / "Source.csv")
+    frame(rows).to_csv(path, index=False)
+    # a blank part number still builds, so stop mode lets it through
+    results = check_sources([path], import_type, mode="stop")
+    assert os.path.exists(results[path][1])
+
+
+def test_duplicate_ud11_ignores_case_and_spaces():
+    rows = CLEAN + [["sainc", " Variant", "SIZE", "small ", "p1", "Parent"]]
+    issues = validate_frame(frame(rows), "variant")
+    assert found(issues, "duplicate_ud11") == [(5, "Company..Key5")]
+    assert issues.loc[issues["Rule"] == "duplicate_ud11", "Message"].tolist() == ["same UD11 key as row 2"]
+
+
+def test_key_too_long():
+    rows = CLEAN + [["SAINC_LONG", "Variant", "Size", "X" * 51, "P4", "PARENT"]]
+    issues = validate_frame(frame(rows), "variant")
+    assert found(issues, "key_too_long") == [(5, "Company"), (5, "Key3")]
+    assert "51 characters (limit 50)" in issues.loc[issues["Column"] == "Key3", "Message"].iloc[0]
+
+
+def test_mixed_company_flags_the_minority():
+    rows = CLEAN + [["OTHER", "Variant", "Size", "Tiny", "P4", "PARENT"], ["OTHER", "Variant", "Size", "Huge", "P5", "PARENT"]]
+    issues = validate_frame(frame(rows), "variant")
+    # the first row of each odd value only
+    assert found(issues, "mixed_company") == [(5, "Company")]
+    assert "'SAINC'" in issues.loc[issues["Rule"] == "mixed_company", "Message"].iloc[0]
+
+
+def test_key5_collision():
+    rows = CLEAN + [["SAINC", "Variant", "Size", "Small", "P4", "parent"]]
+    issues = validate_frame(frame(rows), "variant")
+    assert found(issues, "key5_collision") == [(5, "Key5")]
+    # the same Key5 under another UD10 key is not a collision
+    rows[3][3] = "Tiny"
+    assert found(validate_frame(frame(rows), "variant"), "key5_collision") == []
+
+
+def test_padded_key_is_a_warning():
+    rows = [list(r) for r in CLEAN]
+    rows[2][2] = "Color "
+    issues = validate_frame(frame(rows), "variant")
+    assert found(issues, "padded_key") == [(4, "Key2")]
+    assert issues["Severity"].tolist() == ["warning"]
+
+
+def test_chunked_feed_matches_whole_frame(tmp_path):
+    rows = CLEAN + [
+        ["sainc", "Variant", "Size", "small", "P1", "PARENT"],
+        ["SAINC", "Variant", "Size", "Small", "P5", "parent"],
+        ["OTHER", "Variant", "", "Tiny ", "", "PARENT"],
+    ]
+    path = str(tmp_path / "Source.csv")
+    frame(rows).to_csv(path, index=False)
+    validator = SourceValidator("variant")
+    for chunk in iter_source_chunks(path, 2):
+        validator.feed(chunk)
+    streamed = validator.finish()
+    assert set(streamed["Rule"]) == {"blank_key", "duplicate_ud11", "mixed_company", "key5_collision", "padded_key", "blank_part"}
+    pd.testing.assert_frame_equal(streamed, validate_frame(frame(rows), "variant"))
+
+
+def test_stop_mode_raises_and_writes_report(tmp_path):
+    path = str(tmp_path / "Source.csv")
+    frame(CLEAN + [CLEAN[0]]).to_csv(path, index=False)
+    with pytest.raises(ValidationError) as raised:
+        check_sources([path], "variant", mode="stop")
+    assert "1 duplicate_ud11" in str(raised.value)
+    report = pd.read_csv(raised.value.report_paths[0])
+    assert report["Rule"].tolist() == ["duplicate_ud11"]
+    # warn mode reports the same and carries on
+    assert len(check_sources([path], "variant", mode="warn")[path][0]) == 1
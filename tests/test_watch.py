@@ -0,0 +1,94 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import pandas as pd
+
+from dmt_wizard.watch import QUARANTINE_DIR, FolderWatcher
+
+COLS = ["Company", "Key1", "Key2", "Key3", "Key4", "Key5"]
+ROWS = [["SAINC", "Variant", "Size", "Small", "P1", "PARENT"], ["SAINC", "Variant", "Size", "Large", "P2", "PARENT"]]
+
+
+def write_source(path, rows=ROWS):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pd.DataFrame(rows, columns=COLS).to_csv(path, index=False)
+    return str(path)
+
+
+def names(ready):
+    return sorted(os.path.basename(path) for path, _sig in ready)
+
+
+def test_files_are_ready_once_settled(tmp_path):
+    drop = tmp_path / "drop"
+    write_source(drop / "A.csv")
+    (drop / "~$A.xlsx").write_text("lock")
+    (drop / "Empty.csv").write_text("")
+    watcher = FolderWatcher(str(drop), str(tmp_path / "out"), settle=5)
+
+    assert watcher.ready_files(now=100) == []
+    assert watcher.ready_files(now=104) == []
+    # lock files and empty files are never picked up
+    assert names(watcher.ready_files(now=105)) == ["A.csv"]
+
+    # a file that changes restarts its settle clock
+    write_source(drop / "A.csv", ROWS * 2)
+    assert watcher.ready_files(now=106) == []
+    assert watcher.ready_files(now=110) == []
+    assert names(watcher.ready_files(now=111)) == ["A.csv"]
+
+
+def test_outputs_and_quarantine_are_not_scanned(tmp_path):
+    drop = tmp_path / "drop"
+    write_source(drop / "A.csv")
+    write_source(drop / "_output" / "Old.csv")
+    write_source(drop / QUARANTINE_DIR / "Bad.csv")
+    write_source(drop / "A_OUTPUT" / "A_UD11.csv")
+    watcher = FolderWatcher(str(drop), settle=0)
+    assert [os.path.basename(p) for p in watcher.scan()] == ["A.csv"]
+
+
+def build_all(watcher):
+    # builds run on a thread here so the test sees them finish
+    watcher._pool = ThreadPoolExecutor(max_workers=1)
+    for now in (0, 1):
+        for path, sig in watcher.ready_files(now=now):
+            watcher.submit(path, sig)
+    wait(list(watcher._running))
+    watcher._pool.shutdown()
+    return watcher.collect()
+
+
+def test_failed_build_is_quarantined_and_good_build_remembered(tmp_path):
+    drop = tmp_path / "drop"
+    (drop / "sub").mkdir(parents=True)
+    (drop / "dmt_watch.json").write_text(json.dumps({"type": "variant", "validation": "stop"}))
+    good = write_source(drop / "Good.csv")
+    bad = write_source(drop / "sub" / "Bad.csv", ROWS + ROWS[:1])
+    watcher = FolderWatcher(str(drop), str(tmp_path / "out"), settle=1)
+
+    rows = {os.path.basename(row["Source"]): row for row in build_all(watcher)}
+    assert rows["Good.csv"]["Status"] == "ok" and rows["Bad.csv"]["Status"] == "failed"
+
+    # the failed source moves out of the drop folder, keeping its subfolder, with the error next to it
+    moved = drop / QUARANTINE_DIR / "sub" / "Bad.csv"
+    assert not os.path.exists(bad) and moved.exists()
+    assert "duplicate_ud11" in (drop / QUARANTINE_DIR / "sub" / "Bad.csv.error.txt").read_text()
+
+    # the good one is remembered across restarts and not built again until it changes
+    assert os.path.exists(good)
+    restarted = FolderWatcher(str(drop), str(tmp_path / "out"), settle=1)
+    assert restarted.ready_files(now=0) == [] and restarted.ready_files(now=1) == []
+    write_source(drop / "Good.csv", ROWS[:1])
+    restarted.ready_files(now=2)
+    assert names(restarted.ready_files(now=3)) == ["Good.csv"]
+
+
+def test_bad_sidecar_leaves_source_in_place(tmp_path):
+    drop = tmp_path / "drop"
+    source = write_source(drop / "A.csv")
+    (drop / "dmt_watch.json").write_text("{not json")
+    watcher = FolderWatcher(str(drop), str(tmp_path / "out"), settle=0)
+    assert build_all(watcher) == []
+    assert os.path.exists(source) and not watcher._running